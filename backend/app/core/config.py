@@ -13,10 +13,94 @@ class Settings:
     
     ALGORITHM: str = "HS256" # Algoritmo de encriptación estándar
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 # El token durará 30 minutos
+
+    # --- REFRESH TOKENS (sesión deslizante) ---
+    # Cada uso del refresh token lo rota y renueva su vida útil (ventana deslizante),
+    # pero la sesión completa nunca supera REFRESH_SESSION_MAX_DAYS desde el login.
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_SESSION_MAX_DAYS: int = 30
     
+    # --- POOL DE CONEXIONES A POSTGRES (por motor y por proceso) ---
+    # Se pueden ajustar por variables de entorno sin tocar el código
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5)) # Conexiones permanentes
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10)) # Conexiones extra en picos
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30)) # Segundos esperando una conexión libre antes de fallar
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true" # Detecta conexiones muertas antes de usarlas
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # Segundos de vida máxima de una conexión
+
+    # --- RÉPLICA DE LECTURA ---
+    # URL de la réplica (por defecto la misma base que el primario, útil en local)
+    REPLICA_DATABASE_URL: str | None = os.getenv("REPLICA_DATABASE_URL")
+    # Un usuario que escribió hace menos de N segundos lee del primario
+    # (la réplica puede no tener todavía sus cambios)
+    REPLICA_STALENESS_SECONDS: int = int(os.getenv("REPLICA_STALENESS_SECONDS", 5))
+
+    # --- RESUMEN DIARIO PARA REPORTES ---
+    # Pagos y estadísticas de asistencia leen del resumen cuando el rango tiene
+    # al menos REPORT_ROLLUP_MIN_DAYS días (rangos cortos van a los datos crudos).
+    # Tras activarlo en una base existente: python -m scripts.rebuild_rollup
+    REPORT_ROLLUP_ENABLED: bool = os.getenv("REPORT_ROLLUP_ENABLED", "true").lower() == "true"
+    REPORT_ROLLUP_MIN_DAYS: int = int(os.getenv("REPORT_ROLLUP_MIN_DAYS", 7))
+
+    # --- PARTICIONES MENSUALES (ver app/db/partitions.py) ---
+    # Meses por delante que crea python -m scripts.ensure_partitions
+    PARTITION_PREMAKE_MONTHS: int = int(os.getenv("PARTITION_PREMAKE_MONTHS", 3))
+
+    # --- PLANTILLAS DE ESCALA ---
+    # Máximo de días que materializa una sola llamada a /schedule-templates/{id}/generate
+    SCHEDULE_GENERATE_MAX_DAYS: int = int(os.getenv("SCHEDULE_GENERATE_MAX_DAYS", 92))
+
+    # --- CACHÉ DE REPORTES (Redis) ---
+    # Cada escritura sube la versión de datos del tenant; las entradas viejas
+    # dejan de usarse al instante y Redis las borra al vencer el TTL.
+    REPORT_CACHE_ENABLED: bool = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+    REPORT_CACHE_TTL_SECONDS: int = int(os.getenv("REPORT_CACHE_TTL_SECONDS", 300))
+    REPORT_CACHE_MAX_BYTES: int = int(os.getenv("REPORT_CACHE_MAX_BYTES", 512 * 1024)) # Por entrada
+
+    # --- POOL DE HASHING (Argon2) ---
+    # Procesos dedicados a hashear/verificar contraseñas y cuántas operaciones
+    # pueden estar en curso o en cola antes de responder 503.
+    HASHING_WORKERS: int = os.cpu_count() or 1
+    HASHING_MAX_PENDING: int = (os.cpu_count() or 1) * 4
+    HASHING_RETRY_AFTER_SECONDS: int = 2
+    # Operaciones de lote (importaciones) en curso a la vez: dejan procesos libres para los logins
+    HASHING_BATCH_SLOTS: int = max(1, (os.cpu_count() or 1) // 2)
+
+    # --- MÉTRICAS (GET /metrics, formato Prometheus) ---
+    # Si se define, el scraper debe enviar "Authorization: Bearer <token>".
+    # Con varios workers definir también PROMETHEUS_MULTIPROC_DIR (ver app/core/metrics.py)
+    METRICS_TOKEN: str | None = os.getenv("METRICS_TOKEN")
+
+    # --- CONSULTAS LENTAS (ver app/db/slow_queries.py) ---
+    # Opt-in: las sentencias que superan el umbral se registran con su plan
+    # en un archivo rotativo y en GET /admin/slow-queries.
+    SLOW_QUERY_ENABLED: bool = os.getenv("SLOW_QUERY_ENABLED", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 500))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", 5))
+    # EXPLAIN: como mucho uno por consulta distinta cada N segundos y M por minuto en total
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", 600))
+    SLOW_QUERY_EXPLAIN_PER_MINUTE: int = int(os.getenv("SLOW_QUERY_EXPLAIN_PER_MINUTE", 10))
+    # EXPLAIN ANALYZE vuelve a ejecutar el SELECT: le ponemos un tope
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000))
+
     # --- CONFIGURACIÓN REDIS ---
     REDIS_HOST: str = "localhost" # Porque estás corriendo Docker en tu máquina
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    # Timeouts cortos: si Redis se cuelga no queremos colgar el login con él
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 0.5
+
+    # --- LÍMITE DE INTENTOS DE LOGIN (ventana deslizante) ---
+    LOGIN_WINDOW_SECONDS: int = 300
+    LOGIN_MAX_ATTEMPTS: int = 5 # Por usuario
+    LOGIN_IP_MAX_ATTEMPTS: int = 50 # Por IP (varios usuarios detrás de la misma red)
+    # Proxies inversos (IPs o redes, separadas por coma) cuyo X-Forwarded-For se acepta como IP del cliente
+    TRUSTED_PROXIES: list = [item.strip() for item in os.getenv("TRUSTED_PROXIES", "").split(",") if item.strip()]
+    # Circuit breaker: tras N fallos seguidos de Redis usamos el limitador en memoria
+    RATE_LIMIT_BREAKER_FAILURES: int = 3
+    RATE_LIMIT_BREAKER_COOLDOWN_SECONDS: int = 30
 
 settings = Settings()
\ No newline at end of file
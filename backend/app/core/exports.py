@@ -0,0 +1,48 @@
+"""
+Serialización en streaming (CSV / NDJSON) para exportar reportes grandes.
+
+Reciben un iterador asíncrono de lotes de filas (dicts) y producen bloques de
+texto listos para un StreamingResponse. Solo se mantiene en memoria un lote.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+async def encode_csv(batches, fieldnames: list[str]):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Cabecera sola cuando no hubo filas
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+async def encode_ndjson(batches):
+    async for rows in batches:
+        yield "".join(json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in rows)
+
+
+def encode(batches, fmt: str, fieldnames: list[str]):
+    if fmt == "csv":
+        return encode_csv(batches, fieldnames)
+    if fmt == "ndjson":
+        return encode_ndjson(batches)
+    raise ValueError(f"Formato não suportado: {fmt}")
@@ -0,0 +1,140 @@
+"""
+Pool de procesos dedicado al hashing de contraseñas (Argon2).
+
+Argon2 consume CPU y memoria a propósito. Si se ejecuta directamente en los
+handlers, una ráfaga de logins ocupa todo el threadpool de FastAPI y el resto
+de endpoints queda esperando. Aquí lo mandamos a procesos aparte con una cola
+acotada: si está llena, fallamos rápido con HashingBusyError (503 + Retry-After).
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+
+# Límites (en segundos) del histograma de latencia
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class HashingBusyError(Exception):
+    """La cola de hashing está llena; el cliente debe reintentar más tarde."""
+
+    def __init__(self, retry_after: int = settings.HASHING_RETRY_AFTER_SECONDS):
+        super().__init__("Pool de hashing saturado")
+        self.retry_after = retry_after
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.HASHING_MAX_PENDING)
+# Cupo propio de los lotes: nunca ocupan más de HASHING_BATCH_SLOTS procesos ni
+# encolan por delante de los logins más que eso
+_batch_slots = threading.BoundedSemaphore(max(1, min(settings.HASHING_BATCH_SLOTS, settings.HASHING_WORKERS)))
+
+_stats_lock = threading.Lock()
+_stats = {
+    "pending": 0,
+    "completed": 0,
+    "rejected": 0,
+    "latency_sum": 0.0,
+    "latency_max": 0.0,
+    "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # "spawn" evita heredar locks de los hilos del servidor al hacer fork
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.HASHING_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _record_latency(elapsed: float):
+    with _stats_lock:
+        _stats["completed"] += 1
+        _stats["latency_sum"] += elapsed
+        _stats["latency_max"] = max(_stats["latency_max"], elapsed)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                _stats["latency_buckets"][i] += 1
+                break
+        else:
+            _stats["latency_buckets"][-1] += 1
+
+
+def run(fn, *args):
+    """
+    Ejecuta fn(*args) en el pool y espera el resultado.
+    fn debe ser una función a nivel de módulo (se serializa hacia otro proceso).
+    """
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise HashingBusyError()
+
+    with _stats_lock:
+        _stats["pending"] += 1
+    started = time.perf_counter()
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _slots.release()
+        with _stats_lock:
+            _stats["pending"] -= 1
+        _record_latency(time.perf_counter() - started)
+
+
+def run_many(fn, args_list: list) -> list:
+    """
+    Ejecuta fn(*args) para cada tupla de args_list (importaciones masivas).
+    No usa la cola acotada de los endpoints interactivos (el lote espera en vez
+    de recibir 503), pero tiene su propio cupo: como mucho HASHING_BATCH_SLOTS
+    operaciones en curso, así los logins siempre encuentran procesos libres.
+    """
+    if not args_list:
+        return []
+    started = time.perf_counter()
+    futures = []
+    try:
+        for args in args_list:
+            _batch_slots.acquire()
+            future = _get_executor().submit(fn, *args)
+            future.add_done_callback(lambda _: _batch_slots.release())
+            futures.append(future)
+        results = [future.result() for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
+    elapsed = time.perf_counter() - started
+    # Registramos la latencia promedio por operación del lote
+    for _ in args_list:
+        _record_latency(elapsed / len(args_list))
+    return results
+
+
+def get_stats() -> dict:
+    """Foto de las métricas del pool (profundidad de cola y latencias)."""
+    with _stats_lock:
+        completed = _stats["completed"]
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), _stats["latency_buckets"]):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "workers": settings.HASHING_WORKERS,
+            "max_pending": settings.HASHING_MAX_PENDING,
+            "pending": _stats["pending"],
+            "completed": completed,
+            "rejected": _stats["rejected"],
+            "latency_avg_seconds": round(_stats["latency_sum"] / completed, 4) if completed else 0.0,
+            "latency_max_seconds": round(_stats["latency_max"], 4),
+            "latency_buckets": buckets,
+        }
@@ -0,0 +1,186 @@
+"""
+Métricas de la aplicación en formato Prometheus (GET /metrics).
+
+- HTTP: latencia y cantidad de respuestas por ruta (la plantilla de la ruta,
+  p. ej. "/daily-requests/{request_id}", nunca la URL con ids), método y estado.
+- SQL: cantidad de consultas y tiempo en la base por petición (así se ve un N+1)
+  y latencia de cada consulta por motor.
+- Redis: latencia y errores por comando.
+
+Con varios workers (gunicorn/uvicorn --workers) cada proceso tiene sus propios
+contadores: hay que definir PROMETHEUS_MULTIPROC_DIR (un directorio vacío al
+arrancar) antes de levantar la aplicación, y /metrics suma los de todos los
+procesos. Sin esa variable se exponen solo los del proceso que atiende.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+
+# Peticiones sin ruta (404) van todas a la misma etiqueta: las URLs no
+# deben crear series nuevas
+UNMATCHED_ROUTE = "unmatched"
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+DB_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Respuestas HTTP por ruta, método y estado", ["method", "route", "status"]
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", ["method", "route"]
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Peticiones HTTP en curso", multiprocess_mode="livesum"
+)
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Consultas SQL emitidas por petición", ["method", "route"], buckets=QUERY_BUCKETS
+)
+HTTP_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Tiempo en la base por petición", ["method", "route"], buckets=DB_SECONDS_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Latencia de cada consulta SQL", ["engine"], buckets=DB_SECONDS_BUCKETS
+)
+REDIS_DURATION = Histogram(
+    "redis_command_duration_seconds", "Latencia de los comandos Redis", ["command"], buckets=REDIS_BUCKETS
+)
+REDIS_ERRORS = Counter(
+    "redis_command_errors_total", "Comandos Redis que fallaron", ["command"]
+)
+
+
+class RequestStats:
+    """
+    Acumulado de la petición en curso (lo llenan los eventos del motor).
+    También guarda el scope ASGI y el tenant del usuario para saber de dónde
+    viene una consulta (ver app/db/slow_queries.py).
+    """
+    __slots__ = ("queries", "db_seconds", "scope", "tenant_id")
+
+    def __init__(self, scope=None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+        self.tenant_id = None
+
+    @property
+    def route(self) -> str:
+        return _route_label(self.scope or {})
+
+
+# Los endpoints "def" corren en el threadpool con una copia del contexto:
+# comparten este mismo objeto, así que sus consultas también se suman
+_current_request: ContextVar[RequestStats | None] = ContextVar("metrics_request", default=None)
+
+
+def current_request() -> RequestStats | None:
+    return _current_request.get()
+
+
+def set_request_tenant(tenant_id) -> None:
+    """Anota el tenant del usuario autenticado en la petición en curso."""
+    stats = _current_request.get()
+    if stats is not None:
+        stats.tenant_id = tenant_id
+
+
+def record_query(engine_name: str, elapsed: float) -> None:
+    DB_QUERY_DURATION.labels(engine_name).observe(elapsed)
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_queries(engine, name: str):
+    """Mide cada consulta del motor (sync; para async pasar engine.sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        record_query(name, time.perf_counter() - conn.info["metrics_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # La consulta falló: no hubo after_cursor_execute, la contamos igual
+        conn = exception_context.connection
+        started = conn.info.get("metrics_started") if conn is not None else None
+        if started:
+            record_query(name, time.perf_counter() - started.pop())
+
+    return engine
+
+
+def observe_redis(command: str, elapsed: float, failed: bool = False) -> None:
+    REDIS_DURATION.labels(command).observe(elapsed)
+    if failed:
+        REDIS_ERRORS.labels(command).inc()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI (no BaseHTTPMiddleware): mide hasta que se envía el último
+    fragmento del cuerpo, así las respuestas en streaming cuentan completas.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current_request.set(stats)
+        status_code = 500  # Si la aplicación lanza una excepción, el servidor responde 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec()
+            _current_request.reset(token)
+            method, route = scope["method"], stats.route
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_DURATION.labels(method, route).observe(elapsed)
+            HTTP_DB_QUERIES.labels(method, route).observe(stats.queries)
+            HTTP_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+
+
+def render() -> tuple[bytes, str]:
+    """Cuerpo y content-type de /metrics (sumando todos los workers si corresponde)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Para el hook child_exit de gunicorn: descarta los gauges del worker que terminó."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
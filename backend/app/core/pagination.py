@@ -0,0 +1,87 @@
+"""
+Paginación por cursor (keyset).
+
+En vez de OFFSET (que recorre y descarta todas las filas anteriores), el cursor
+guarda los valores de orden de la última fila entregada y la siguiente página
+empieza justo después de ella. Así cada página cuesta lo mismo y no se "corre"
+cuando se insertan filas nuevas.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, literal
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("Valor de cursor desconocido")
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    """Convierte los valores de orden de la última fila en un cursor opaco."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _matches_column(value, column) -> bool:
+    if value is None:
+        return column.nullable
+    # Tipo exacto: bool es subclase de int y datetime de date
+    return type(value) is column.type.python_type
+
+
+def decode_cursor(cursor: str, order: list) -> list:
+    """
+    Inverso de encode_cursor. order es el mismo de keyset_condition: cada valor
+    debe ser del tipo de su columna (fecha para request_date, entero para id...).
+    Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(values, list) or len(values) != len(order):
+        raise ValueError("Cursor inválido")
+    values = [_decode_value(v) for v in values]
+    if not all(_matches_column(value, column) for (column, _), value in zip(order, values)):
+        raise ValueError("Cursor inválido")
+    return values
+
+
+def keyset_condition(order: list, values: list):
+    """
+    Condición "fila posterior al cursor" para un orden de varias columnas.
+
+    order: lista de (columna, descendente) en el mismo orden del ORDER BY.
+    Para (a desc, b asc) genera: a < :a OR (a = :a AND b > :b)
+    """
+    # literal(): los booleanos también deben ir como parámetros (True/False solo admiten "=" en SQLAlchemy)
+    params = [literal(value, type_=column.type) for (column, _), value in zip(order, values)]
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal_prefix = [col == params[j] for j, (col, _) in enumerate(order[:i])]
+        after = column < params[i] if descending else column > params[i]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def next_cursor(items: list, limit: int, key) -> str | None:
+    """Cursor de la página siguiente, o None si esta fue la última."""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(key(items[-1]))
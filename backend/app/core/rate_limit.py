@@ -0,0 +1,234 @@
+"""
+Limitador de intentos con ventana deslizante.
+
+Camino normal: un único script Lua atómico en Redis por intento (un solo viaje
+de red), que limpia la ventana, comprueba todos los límites y registra el intento.
+Si Redis falla o tarda, un circuit breaker conmuta a un limitador en memoria
+(por proceso) para que el login siga funcionando con un costo acotado.
+"""
+import ipaddress
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import NamedTuple
+from uuid import uuid4
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+# KEYS = llaves a limitar; ARGV[1] = ahora (ms), ARGV[2] = ventana (ms),
+# ARGV[3] = miembro único del intento, ARGV[4..] = límite de cada llave.
+# Devuelve {0, conteos...} si se permite, o {i, conteo} si la llave i está bloqueada.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local counts = {}
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= tonumber(ARGV[3 + i]) then
+        return {i, count}
+    end
+    counts[i] = count
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+    counts[i] = counts[i] + 1
+end
+return {0, unpack(counts)}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    counts: dict  # llave -> intentos dentro de la ventana
+    blocked_key: str | None = None
+    attempt_id: str | None = None  # Para descontar el intento con forget()
+
+
+class CircuitBreaker:
+    """Abre el circuito tras `failure_threshold` fallos seguidos y lo reintenta tras `cooldown` segundos."""
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            # Semi-abierto: dejamos pasar una prueba cuando termina el enfriamiento
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+
+class LocalSlidingWindow:
+    """
+    Ventana deslizante en memoria. Las llaves quedan en orden de último intento;
+    pasadas `max_keys` se descartan las que ya salieron de la ventana, nunca una
+    con intentos vigentes (si no, llenar la tabla con llaves nuevas reiniciaría
+    el contador de la cuenta atacada).
+    """
+
+    def __init__(self, window_seconds: float, max_keys: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> deque:
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = deque()
+            self._hits[key] = hits
+        while hits and hits[0][0] <= now - self.window_seconds:
+            hits.popleft()
+        return hits
+
+    def _evict_expired(self, now: float):
+        while len(self._hits) > self.max_keys:
+            hits = next(iter(self._hits.values()))
+            if hits and hits[-1][0] > now - self.window_seconds:
+                break  # La más antigua sigue en la ventana: todas las demás también
+            self._hits.popitem(last=False)
+
+    def hit(self, limits: dict) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            windows = {key: self._prune(key, now) for key in limits}
+            try:
+                for key, limit in limits.items():
+                    if len(windows[key]) >= limit:
+                        return RateLimitResult(False, {key: len(windows[key])}, key)
+                attempt_id = uuid4().hex
+                for key, hits in windows.items():
+                    hits.append((now, attempt_id))
+                    self._hits.move_to_end(key)
+                return RateLimitResult(True, {key: len(hits) for key, hits in windows.items()}, attempt_id=attempt_id)
+            finally:
+                self._evict_expired(now)
+
+    def reset(self, key: str):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def forget(self, key: str, attempt_id: str):
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits:
+                self._hits[key] = deque(hit for hit in hits if hit[1] != attempt_id)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Limitador por varias llaves a la vez (ej: usuario e IP) sobre Redis,
+    con respaldo en memoria cuando Redis no responde.
+    """
+
+    def __init__(self, window_seconds: int, client_factory=get_redis_client, breaker: CircuitBreaker | None = None):
+        self.window_seconds = window_seconds
+        self.client_factory = client_factory
+        self.breaker = breaker or CircuitBreaker(
+            settings.RATE_LIMIT_BREAKER_FAILURES,
+            settings.RATE_LIMIT_BREAKER_COOLDOWN_SECONDS,
+        )
+        self.local = LocalSlidingWindow(window_seconds)
+
+    def hit(self, limits: dict) -> RateLimitResult:
+        """Registra un intento contra todas las llaves; no lo registra si alguna está bloqueada."""
+        if self.breaker.allow_request():
+            try:
+                result = self._redis_hit(limits)
+                self.breaker.record_success()
+                return result
+            except RedisError:
+                self.breaker.record_failure()
+        return self.local.hit(limits)
+
+    def reset(self, key: str):
+        """Limpia el contador de una llave (ej: tras un login exitoso)."""
+        self.local.reset(key)
+        if self.breaker.allow_request():
+            try:
+                self.client_factory().delete(key)
+                self.breaker.record_success()
+            except RedisError:
+                self.breaker.record_failure()
+
+    def forget(self, key: str, attempt_id: str | None):
+        """Descuenta un intento ya registrado de una llave (ej: el de la IP si el login salió bien)."""
+        if not attempt_id:
+            return
+        self.local.forget(key, attempt_id)
+        if self.breaker.allow_request():
+            try:
+                self.client_factory().zrem(key, attempt_id)
+                self.breaker.record_success()
+            except RedisError:
+                self.breaker.record_failure()
+
+    def _redis_hit(self, limits: dict) -> RateLimitResult:
+        keys = list(limits)
+        client = self.client_factory()
+        script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        now_ms = int(time.time() * 1000)
+        attempt_id = f"{now_ms}-{uuid4().hex}"
+        args = [now_ms, self.window_seconds * 1000, attempt_id] + [limits[k] for k in keys]
+        result = script(keys=keys, args=args)
+
+        blocked_index = int(result[0])
+        if blocked_index:
+            key = keys[blocked_index - 1]
+            return RateLimitResult(False, {key: int(result[1])}, key)
+        return RateLimitResult(True, {key: int(count) for key, count in zip(keys, result[1:])}, attempt_id=attempt_id)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in ipaddress.ip_network(network, strict=False) for network in settings.TRUSTED_PROXIES)
+
+
+def client_ip(request) -> str:
+    """
+    IP del cliente para el límite por IP. Detrás del proxy inverso request.client
+    es el proxy: si es de confianza (TRUSTED_PROXIES) se toma de X-Forwarded-For
+    la última dirección que no sea otro proxy de confianza.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    forwarded = [item.strip() for item in request.headers.get("x-forwarded-for", "").split(",") if item.strip()]
+    for address in reversed(forwarded):
+        if not _is_trusted_proxy(address):
+            return address
+    return forwarded[0] if forwarded else peer
+
+
+# Limitador compartido por el endpoint de login
+login_limiter = SlidingWindowRateLimiter(window_seconds=settings.LOGIN_WINDOW_SECONDS)
@@ -1,4 +1,7 @@
+import time
 import redis
+import redis.asyncio as aioredis
+from app.core import metrics
 from app.core.config import settings
 
 # Creamos el pool de conexiones (es más eficiente que abrir y cerrar a cada rato)
@@ -6,9 +9,83 @@ redis_pool = redis.ConnectionPool(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     db=settings.REDIS_DB,
-    decode_responses=True # Importante: Para recibir strings en vez de bytes
+    decode_responses=True, # Importante: Para recibir strings en vez de bytes
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
 )
 
+# --- Clientes con medición de latencia (ver app/core/metrics.py) ---
+# Los comandos sueltos (y los scripts Lua, que van por EVALSHA) pasan por
+# execute_command; un pipeline se mide entero como "PIPELINE".
+
+class TimedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return super().execute(raise_on_error)
+        except redis.RedisError:
+            failed = True
+            raise
+        finally:
+            metrics.observe_redis("PIPELINE", time.perf_counter() - started, failed)
+
+class TimedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return super().execute_command(*args, **options)
+        except redis.RedisError:
+            failed = True
+            raise
+        finally:
+            metrics.observe_redis(str(args[0]).upper(), time.perf_counter() - started, failed)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
 def get_redis_client():
     """Retorna una instancia de cliente Redis"""
-    return redis.Redis(connection_pool=redis_pool)
\ No newline at end of file
+    return TimedRedis(connection_pool=redis_pool)
+
+# Pool equivalente para código async (endpoints "async def" y middlewares)
+async_redis_pool = aioredis.ConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+)
+
+class AsyncTimedPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await super().execute(raise_on_error)
+        except redis.RedisError:
+            failed = True
+            raise
+        finally:
+            metrics.observe_redis("PIPELINE", time.perf_counter() - started, failed)
+
+class AsyncTimedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await super().execute_command(*args, **options)
+        except redis.RedisError:
+            failed = True
+            raise
+        finally:
+            metrics.observe_redis(str(args[0]).upper(), time.perf_counter() - started, failed)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return AsyncTimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+def get_async_redis_client():
+    """Retorna una instancia de cliente Redis asíncrono"""
+    return AsyncTimedRedis(connection_pool=async_redis_pool)
@@ -0,0 +1,123 @@
+"""
+Refresh tokens rotativos guardados en Redis.
+
+- El cliente recibe un token opaco; en Redis solo guardamos su hash SHA-256.
+- Cada token pertenece a una "familia" (una sesión de login). Al usarlo se rota:
+  se marca como usado y se emite uno nuevo de la misma familia.
+- Si un token ya usado se presenta otra vez (posible robo), se revoca la familia entera.
+"""
+import hashlib
+import secrets
+import time
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+TOKEN_KEY_PREFIX = "refresh_token:"
+FAMILY_REVOKED_PREFIX = "refresh_family_revoked:"
+
+# Valida y marca el token como usado en un solo viaje a Redis (atómico).
+# KEYS[1] = llave del token, ARGV[1] = prefijo de familias revocadas, ARGV[2] = TTL de la revocación
+ROTATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {'missing'}
+end
+local family = redis.call('HGET', KEYS[1], 'family')
+if redis.call('EXISTS', ARGV[1] .. family) == 1 then
+    return {'revoked'}
+end
+if redis.call('HINCRBY', KEYS[1], 'used', 1) > 1 then
+    redis.call('SET', ARGV[1] .. family, 1, 'EX', ARGV[2])
+    return {'reused'}
+end
+return {'ok', family,
+        redis.call('HGET', KEYS[1], 'sub'),
+        redis.call('HGET', KEYS[1], 'tenant_uuid'),
+        redis.call('HGET', KEYS[1], 'session_started_at')}
+"""
+
+
+class RefreshTokenError(Exception):
+    """El refresh token es inválido, expiró, fue revocado o reutilizado."""
+
+
+def _token_key(token: str) -> str:
+    return TOKEN_KEY_PREFIX + hashlib.sha256(token.encode()).hexdigest()
+
+
+def _session_max_seconds() -> int:
+    return settings.REFRESH_SESSION_MAX_DAYS * 24 * 3600
+
+
+def issue_refresh_token(sub: str, tenant_uuid: str | None = None, family_id: str | None = None, session_started_at: int | None = None) -> str:
+    """
+    Emite un refresh token nuevo. Sin family_id se abre una sesión nueva (login);
+    con family_id se continúa una sesión existente (rotación).
+    """
+    now = int(time.time())
+    family_id = family_id or uuid4().hex
+    session_started_at = session_started_at or now
+
+    # Ventana deslizante, limitada por la vida máxima de la sesión
+    remaining_session = session_started_at + _session_max_seconds() - now
+    ttl = min(settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600, remaining_session)
+    if ttl <= 0:
+        raise RefreshTokenError("Sessão expirada, faça login novamente")
+
+    token = secrets.token_urlsafe(48)
+    key = _token_key(token)
+
+    r = get_redis_client()
+    pipe = r.pipeline(transaction=False)
+    pipe.hset(key, mapping={
+        "sub": sub,
+        "family": family_id,
+        "tenant_uuid": tenant_uuid or "",
+        "session_started_at": session_started_at,
+        "used": 0,
+    })
+    pipe.expire(key, ttl)
+    pipe.execute()
+    return token
+
+
+def rotate_refresh_token(token: str) -> tuple[str, dict]:
+    """
+    Consume un refresh token y devuelve (nuevo_token, datos_de_sesion).
+    Lanza RefreshTokenError si no es válido; si detecta reutilización revoca toda la familia.
+    """
+    r = get_redis_client()
+    rotate = r.register_script(ROTATE_SCRIPT)
+    result = rotate(keys=[_token_key(token)], args=[FAMILY_REVOKED_PREFIX, _session_max_seconds()])
+
+    outcome = result[0]
+    if outcome == "missing":
+        raise RefreshTokenError("Refresh token inválido ou expirado")
+    if outcome == "revoked":
+        raise RefreshTokenError("Sessão revogada, faça login novamente")
+    if outcome == "reused":
+        raise RefreshTokenError("Refresh token reutilizado. Sessão revogada por segurança")
+
+    _, family_id, sub, tenant_uuid, session_started_at = result
+    session = {
+        "sub": sub,
+        "family": family_id,
+        "tenant_uuid": tenant_uuid or None,
+        "session_started_at": int(session_started_at),
+    }
+    new_token = issue_refresh_token(
+        sub=sub,
+        tenant_uuid=session["tenant_uuid"],
+        family_id=family_id,
+        session_started_at=session["session_started_at"],
+    )
+    return new_token, session
+
+
+def revoke_refresh_token(token: str) -> None:
+    """Revoca la familia (sesión) a la que pertenece el token. Usado en el logout."""
+    r = get_redis_client()
+    family_id = r.hget(_token_key(token), "family")
+    if family_id:
+        r.set(FAMILY_REVOKED_PREFIX + family_id, 1, ex=_session_max_seconds())
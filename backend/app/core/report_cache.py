@@ -0,0 +1,147 @@
+"""
+Caché de reportes en Redis con invalidación por versión de tenant.
+
+Clave: report_cache:<tenant>:v<versión>:<reporte>:<hash de los parámetros>.
+Las escrituras no borran claves (nada de SCAN): solo incrementan
+report_version:<tenant>, así las lecturas siguientes arman claves nuevas y las
+viejas vencen solas por TTL.
+
+La réplica puede ir atrasada: durante REPLICA_STALENESS_SECONDS después de una
+escritura (report_bumped:<tenant>) lo calculado en la réplica se devuelve pero no
+se guarda, porque quedaría bajo la versión nueva con datos de antes de escribir.
+
+Si Redis falla, el reporte se calcula igual contra la base (la caché es opcional).
+"""
+import functools
+import hashlib
+import json
+import threading
+from datetime import date, datetime
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client, get_async_redis_client
+
+VERSION_PREFIX = "report_version:"
+BUMPED_PREFIX = "report_bumped:"
+CACHE_PREFIX = "report_cache:"
+# Scope de las lecturas sin tenant (ven todos los datos)
+ALL_TENANTS = "all"
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "too_large": 0, "replica_skips": 0, "errors": 0}
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _tenant_scope(tenant_id) -> str:
+    return str(tenant_id) if tenant_id else ALL_TENANTS
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def cache_key(report: str, version, start_date, end_date, company_id=None, user_id=None, role=None, tenant_id=None) -> str:
+    # El usuario solo cambia el resultado para "contratado" (ve únicamente lo suyo)
+    scope = f"user:{user_id}" if role == "contratado" and user_id else "all"
+    params = json.dumps([str(start_date), str(end_date), company_id, scope])
+    digest = hashlib.sha1(params.encode()).hexdigest()[:20]
+    return f"{CACHE_PREFIX}{_tenant_scope(tenant_id)}:v{version or 0}:{report}:{digest}"
+
+
+def bump_version(tenant_id=None) -> None:
+    """
+    Invalida los reportes del tenant (y los de las lecturas sin tenant, que
+    también incluyen sus datos). Se llama después de cada commit de escritura.
+    """
+    if not settings.REPORT_CACHE_ENABLED:
+        return
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for scope in ([str(tenant_id)] if tenant_id else []) + [ALL_TENANTS]:
+            pipe.incr(f"{VERSION_PREFIX}{scope}")
+            pipe.set(f"{BUMPED_PREFIX}{scope}", 1, ex=settings.REPLICA_STALENESS_SECONDS)
+        pipe.execute()
+    except redis.RedisError:
+        # Sin Redis tampoco se pudo guardar nada nuevo; lo viejo vence por TTL
+        _count("errors")
+
+
+async def cached(report: str, loader, from_replica: bool = False, **params):
+    """
+    Devuelve el reporte desde la caché o lo calcula con loader() y lo guarda.
+    from_replica: loader() lee de la réplica (no se guarda justo después de una escritura).
+    params: start_date, end_date, company_id, user_id, role, tenant_id.
+    """
+    if not settings.REPORT_CACHE_ENABLED:
+        return await loader()
+
+    client = get_async_redis_client()
+    scope = _tenant_scope(params.get("tenant_id"))
+    try:
+        version, recently_bumped = await client.mget(f"{VERSION_PREFIX}{scope}", f"{BUMPED_PREFIX}{scope}")
+        key = cache_key(report, version, **params)
+        payload = await client.get(key)
+    except redis.RedisError:
+        _count("errors")
+        return await loader()
+
+    if payload is not None:
+        _count("hits")
+        return json.loads(payload)
+
+    _count("misses")
+    result = await loader()
+    if from_replica and recently_bumped is not None:
+        _count("replica_skips")
+        return result
+    payload = json.dumps(result, default=_json_default, separators=(",", ":"))
+    if len(payload) > settings.REPORT_CACHE_MAX_BYTES:
+        _count("too_large")
+        return result
+    try:
+        await client.set(key, payload, ex=settings.REPORT_CACHE_TTL_SECONDS)
+        _count("stores")
+    except redis.RedisError:
+        _count("errors")
+    return result
+
+
+def _reads_replica(db) -> bool:
+    # Import tardío: los motores se crean al importar async_database
+    from app.db.async_database import async_engine, async_replica_engine
+    return async_replica_engine is not async_engine and db.bind is async_replica_engine
+
+
+def cached_report(report: str):
+    """
+    Decorador para las funciones async de reportes con firma
+    (db, start_date, end_date, company_id, user_id, role, tenant_id).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(db, start_date, end_date, company_id=None, user_id=None, role=None, tenant_id=None):
+            params = dict(start_date=start_date, end_date=end_date, company_id=company_id,
+                          user_id=user_id, role=role, tenant_id=tenant_id)
+            return await cached(report, lambda: fn(db, **params), from_replica=_reads_replica(db), **params)
+        return wrapper
+    return decorator
+
+
+def get_stats() -> dict:
+    """Contadores de la caché (de este proceso)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["enabled"] = settings.REPORT_CACHE_ENABLED
+    stats["ttl_seconds"] = settings.REPORT_CACHE_TTL_SECONDS
+    stats["max_bytes"] = settings.REPORT_CACHE_MAX_BYTES
+    return stats
@@ -2,19 +2,37 @@ from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 import jwt # Importamos PyJWT
 from app.core.config import settings # Importamos nuestra config
+from app.core import hashing_pool
 
 # CAMBIO: Cambiamos "bcrypt" por "argon2" en la lista de schemes.
 # Argon2 gestiona memoria y CPU para evitar ataques de fuerza bruta por GPU.
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
-def get_password_hash(password: str) -> str:
-    """Transforma texto plano a hash seguro usando Argon2"""
+# Estas dos corren dentro de los procesos del pool de hashing
+def _hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica si el texto plano coincide con el hash guardado"""
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def get_password_hash(password: str) -> str:
+    """
+    Transforma texto plano a hash seguro usando Argon2.
+    Se ejecuta en el pool de hashing; lanza HashingBusyError si está saturado.
+    """
+    return hashing_pool.run(_hash_password, password)
+
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    """Hashea muchas contraseñas en paralelo (importaciones masivas)"""
+    return hashing_pool.run_many(_hash_password, [(password,) for password in passwords])
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica si el texto plano coincide con el hash guardado.
+    Se ejecuta en el pool de hashing; lanza HashingBusyError si está saturado.
+    """
+    return hashing_pool.run(_verify_password, plain_password, hashed_password)
+
 # --- CREAR TOKEN ---
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """
@@ -0,0 +1,100 @@
+"""
+Serialización rápida para respuestas que arma la propia aplicación.
+
+Por defecto FastAPI valida cada respuesta contra su response_model: con objetos
+ORM (from_attributes) eso recorre todo el grafo y vuelve a validar, por ejemplo,
+el EmailStr de cada empleado anidado, aunque los datos salen de nuestra base.
+
+- dump_orm(obj, Modelo): arma el dict siguiendo los campos del modelo Pydantic,
+  sin validar (los datos son "de confianza").
+- TrustedJSONResponse: serializa con orjson (si está instalado) y produce el
+  mismo JSON que Pydantic (fechas ISO 8601, UTC como "Z").
+
+Usar solo con datos propios: lo que venga del cliente se sigue validando.
+"""
+import json
+import typing
+from datetime import date, datetime, time
+from enum import Enum
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él usamos json de la biblioteca estándar
+    orjson = None
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # Pydantic escribe UTC como "Z"
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class TrustedJSONResponse(JSONResponse):
+    """JSONResponse sin validación ni jsonable_encoder: el contenido ya es JSON-serializable."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# --- dict a partir de objetos ORM ---
+
+_plans: dict = {}
+
+
+def _nested_model(annotation):
+    """(modelo anidado, es_lista) si el campo es un modelo o lista de modelos; si no (None, False)."""
+    origin = typing.get_origin(annotation)
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if origin in (list, typing.List) and args:
+        nested, _ = _nested_model(args[0])
+        return nested, True
+    if origin is typing.Union and len(args) == 1:
+        return _nested_model(args[0])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _plan(model: type[BaseModel]):
+    plan = _plans.get(model)
+    if plan is None:
+        plan = []
+        for name, info in model.model_fields.items():
+            nested, is_list = _nested_model(info.annotation)
+            default = None if info.is_required() else info.get_default(call_default_factory=True)
+            plan.append((name, nested, is_list, default))
+        _plans[model] = plan
+    return plan
+
+
+def dump_orm(obj, model: type[BaseModel]) -> dict:
+    """Dict con los campos de `model` leídos de `obj` (objeto ORM o similar), sin validar."""
+    data = {}
+    for name, nested, is_list, default in _plan(model):
+        value = getattr(obj, name, default)
+        if nested is not None and value is not None:
+            value = [dump_orm(item, nested) for item in value] if is_list else dump_orm(value, nested)
+        data[name] = value
+    return data
+
+
+def dump_orm_list(items, model: type[BaseModel]) -> list:
+    return [dump_orm(item, model) for item in items]
@@ -0,0 +1,24 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Company
+from app.db import companies_crud
+
+# Versiones asíncronas de las lecturas de companies_crud (para endpoints "async def")
+
+async def get_company(db: AsyncSession, company_id: int, tenant_id: int = None):
+    query = select(Company).where(Company.id == company_id)
+    if tenant_id:
+        query = query.where(Company.tenant_id == tenant_id)
+    result = await db.scalars(query.limit(1))
+    return result.first()
+
+async def get_company_by_tax_id(db: AsyncSession, tax_id: str, tenant_id: int = None):
+    query = select(Company).where(Company.tax_id == tax_id)
+    if tenant_id:
+        query = query.where(Company.tenant_id == tenant_id)
+    result = await db.scalars(query.limit(1))
+    return result.first()
+
+async def get_companies(db: AsyncSession, skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
+    result = await db.scalars(companies_crud.build_companies_query(skip, limit, tenant_id, cursor))
+    return result.all()
@@ -0,0 +1,60 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.db.database import (
+    SQLALCHEMY_DATABASE_URL, SQLALCHEMY_REPLICA_DATABASE_URL, HAS_REPLICA, POOL_OPTIONS, engine, replica_engine,
+)
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class, instrument_engine
+from app.core.metrics import instrument_queries
+from app.db import slow_queries
+
+# Misma base de datos que el motor síncrono, pero con el driver asyncpg.
+# asyncpg no entiende el parámetro "options" de la URL, así que el search_path
+# se envía como configuración del servidor al abrir cada conexión.
+DB_SEARCH_PATH = "auth,business,public"
+
+def _to_asyncpg_url(url: str):
+    return make_url(url).set(drivername="postgresql+asyncpg").difference_update_query(["options"])
+
+ASYNC_SQLALCHEMY_DATABASE_URL = _to_asyncpg_url(SQLALCHEMY_DATABASE_URL)
+ASYNC_SQLALCHEMY_REPLICA_DATABASE_URL = _to_asyncpg_url(SQLALCHEMY_REPLICA_DATABASE_URL)
+
+# Creamos el motor asíncrono (cada petición espera a Postgres sin ocupar un hilo)
+async_pool_metrics = PoolMetrics("async")
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    connect_args={"server_settings": {"search_path": DB_SEARCH_PATH}},
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+    **POOL_OPTIONS,
+)
+instrument_engine(async_engine.sync_engine, async_pool_metrics)
+instrument_queries(async_engine.sync_engine, "async")
+# El EXPLAIN de las consultas lentas corre en un hilo: usa el motor síncrono de la misma base
+slow_queries.install(async_engine.sync_engine, "async", explain_engine=engine)
+
+# expire_on_commit=False: tras el commit los objetos se siguen pudiendo serializar
+# sin volver a consultar la base (en async no hay carga perezosa implícita)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Motor y sesiones asíncronas de la réplica (solo lectura); sin réplica, los del primario
+if HAS_REPLICA:
+    async_replica_pool_metrics = PoolMetrics("async_replica")
+    async_replica_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_REPLICA_DATABASE_URL,
+        connect_args={"server_settings": {"search_path": DB_SEARCH_PATH}},
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_replica_pool_metrics),
+        **POOL_OPTIONS,
+    )
+    instrument_engine(async_replica_engine.sync_engine, async_replica_pool_metrics)
+    instrument_queries(async_replica_engine.sync_engine, "async_replica")
+    slow_queries.install(async_replica_engine.sync_engine, "async_replica", explain_engine=replica_engine)
+
+    AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+else:
+    async_replica_engine = async_engine
+    AsyncReplicaSessionLocal = AsyncSessionLocal
+
+# Dependencia para los endpoints "async def"
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,73 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.models import DailyRequest, WorkShift, ShiftAssignment
+from app.db import requests_crud
+from app.core.report_cache import cached_report
+
+# Filas por lote al exportar en streaming (cursor del lado del servidor)
+STREAM_BATCH_SIZE = 1000
+
+# Versiones asíncronas de las lecturas de requests_crud.
+# Las consultas se arman con los mismos "build_*" del módulo síncrono.
+# En async no hay carga perezosa: todo lo que se serializa debe cargarse aquí.
+
+def _request_graph_options():
+    return selectinload(DailyRequest.shifts)\
+        .selectinload(WorkShift.assignments)\
+        .selectinload(ShiftAssignment.employee)
+
+async def get_daily_request(db: AsyncSession, request_id: int, tenant_id: int = None):
+    query = select(DailyRequest).options(_request_graph_options()).where(DailyRequest.id == request_id)
+    if tenant_id:
+        query = query.where(DailyRequest.tenant_id == tenant_id)
+    result = await db.scalars(query)
+    return result.first()
+
+async def get_daily_requests(db: AsyncSession, skip: int = 0, limit: int = 100, company_id: int = None, start_date=None, end_date=None, user_id: int = None, role: str = None, tenant_id: int = None, cursor: str = None):
+    query = requests_crud.build_daily_requests_query(skip, limit, company_id, start_date, end_date, user_id, role, tenant_id, cursor)
+    result = await db.scalars(query.options(_request_graph_options()))
+    return result.all()
+
+@cached_report("payments")
+async def get_payments_report(db: AsyncSession, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = requests_crud.build_payments_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    result = await db.execute(query)
+    return requests_crud.format_payments_report(result.all())
+
+@cached_report("attendance_report")
+async def get_attendance_report(db: AsyncSession, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = requests_crud.build_attendance_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    result = await db.execute(query)
+    return requests_crud.format_attendance_report(result.all())
+
+async def stream_attendance_report(session_factory, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None, batch_size: int = STREAM_BATCH_SIZE):
+    """
+    Igual que get_attendance_report, pero entrega las filas por lotes usando un
+    cursor del lado del servidor: la memoria no depende del tamaño del rango.
+    Abre su propia sesión porque se consume mientras se envía la respuesta,
+    cuando la sesión de la petición ya puede estar cerrada.
+    """
+    query = requests_crud.build_attendance_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield [requests_crud.format_attendance_report_row(r) for r in partition]
+
+@cached_report("dashboard_stats")
+async def get_dashboard_stats(db: AsyncSession, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = requests_crud.build_dashboard_stats_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    result = await db.execute(query)
+    return requests_crud.format_dashboard_stats(result.all())
+
+@cached_report("attendance_stats")
+async def get_attendance_stats(db: AsyncSession, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = requests_crud.build_attendance_stats_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    result = await db.execute(query)
+    return requests_crud.format_attendance_stats(result.all())
+
+@cached_report("dashboard_overview")
+async def get_dashboard_overview(db: AsyncSession, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = requests_crud.build_dashboard_overview_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    result = await db.execute(query)
+    return requests_crud.format_dashboard_overview(result.all())
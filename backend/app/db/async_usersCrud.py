@@ -0,0 +1,35 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import User
+from app.db import usersCrud
+
+# Versiones asíncronas de las lecturas de usersCrud (para endpoints "async def")
+
+async def get_user_by_email(db: AsyncSession, email: str, tenant_id: int = None):
+    """Busca si un email ya existe (global o por tenant)"""
+    query = select(User).where(User.email == email)
+    if tenant_id:
+        query = query.where(User.tenant_id == tenant_id)
+    result = await db.scalars(query.limit(1))
+    return result.first()
+
+async def get_user_by_cpf(db: AsyncSession, cpf: str, tenant_id: int = None):
+    """Busca si un CPF ya existe (global o por tenant)"""
+    query = select(User).where(User.cpf == cpf)
+    if tenant_id:
+        query = query.where(User.tenant_id == tenant_id)
+    result = await db.scalars(query.limit(1))
+    return result.first()
+
+async def get_user_by_code(db: AsyncSession, code: str, tenant_id: int = None):
+    """Busca si un code ya existe (global o por tenant)"""
+    query = select(User).where(User.code == code)
+    if tenant_id:
+        query = query.where(User.tenant_id == tenant_id)
+    result = await db.scalars(query.limit(1))
+    return result.first()
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
+    """Misma lista y orden que usersCrud.get_users"""
+    result = await db.scalars(usersCrud.build_users_query(skip, limit, tenant_id, cursor))
+    return result.all()
@@ -0,0 +1,261 @@
+"""
+Importación masiva de usuarios y empresas desde CSV, JSON o NDJSON.
+
+Por cada bloque de filas:
+1. Valida cada fila con el mismo esquema de los endpoints (UserCreate / CompanyCreate).
+2. Comprueba duplicados dentro del archivo y contra la base con UNA consulta por
+   llave (email, cpf, code / tax_id) para todo el bloque.
+3. Hashea las contraseñas del bloque en paralelo (pool de hashing).
+4. Inserta el bloque con un INSERT multi-fila y hace commit.
+Devuelve un reporte con los errores por número de fila (también las líneas
+ilegibles). Un archivo que no se puede leer entero se rechaza antes de insertar.
+"""
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hashes
+from app.models.models import User, Company
+from app.schemas.schemas import UserCreate
+from app.schemas.company_schemas import CompanyCreate
+
+CHUNK_SIZE = 500
+
+SUPPORTED_FORMATS = ("csv", "json", "ndjson")
+
+
+def detect_format(filename: str | None, default: str = "csv") -> str:
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == "jsonl":
+        return "ndjson"
+    return extension if extension in SUPPORTED_FORMATS else default
+
+
+class RowError:
+    """Línea que no se pudo leer (JSON o CSV mal formado): se reporta como error de esa fila."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def iter_rows(binary_file, fmt: str):
+    """
+    Lee filas (dicts) de un archivo binario sin cargarlo entero en memoria
+    (salvo JSON, que es un único arreglo). Una línea ilegible de NDJSON o CSV
+    sale como RowError y la lectura sigue; un UTF-8 inválido o un JSON roto
+    lanzan ValueError.
+    """
+    text_file = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text_file)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    row = RowError(f"CSV inválido: {e}")
+                yield row
+        elif fmt == "ndjson":
+            for line in text_file:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield RowError(f"JSON inválido: {e.msg}")
+        elif fmt == "json":
+            data = json.load(text_file)
+            if not isinstance(data, list):
+                raise ValueError("O JSON deve ser uma lista de objetos")
+            yield from data
+        else:
+            raise ValueError(f"Formato não suportado: {fmt}")
+    finally:
+        # Sin detach, cerrar el wrapper cerraría también el archivo subido
+        text_file.detach()
+
+
+def read_rows(binary_file, fmt: str):
+    """
+    Recorre el archivo una vez sin tocar la base para que los errores que lo
+    invalidan entero (UTF-8, JSON roto) salgan como ValueError antes del primer
+    commit, y devuelve un iterador nuevo desde el principio.
+    """
+    for _ in iter_rows(binary_file, fmt):
+        pass
+    binary_file.seek(0)
+    return iter_rows(binary_file, fmt)
+
+
+def _clean(row) -> dict:
+    """Las celdas vacías del CSV se tratan como "no informado" (aplica el default del esquema)."""
+    if not isinstance(row, dict):
+        return {}
+    return {key.strip(): value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _validation_messages(error: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for number, row in enumerate(rows, start=1):
+        chunk.append((number, row))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _existing_values(db: Session, column, values: set, tenant_id: int | None) -> set:
+    """Una sola consulta por llave para todo el bloque."""
+    if not values:
+        return set()
+    query = select(column).where(column.in_(values))
+    if tenant_id:
+        query = query.where(column.class_.tenant_id == tenant_id)
+    return set(db.scalars(query).all())
+
+
+def _insert_chunk(db: Session, model, records: list[tuple[int, dict]], errors: list) -> int:
+    """
+    Inserta el bloque en un solo INSERT multi-fila. Si choca con una restricción
+    (ej: alguien creó el mismo email entretanto), reintenta fila a fila para
+    reportar exactamente cuáles fallaron.
+    """
+    if not records:
+        return 0
+    try:
+        db.execute(insert(model), [values for _, values in records])
+        db.commit()
+        return len(records)
+    except IntegrityError:
+        db.rollback()
+
+    created = 0
+    for number, values in records:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model), [values])
+            created += 1
+        except IntegrityError:
+            errors.append({"row": number, "errors": ["Registro duplicado"]})
+    db.commit()
+    return created
+
+
+def import_users(db: Session, rows, tenant_id: int = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    report = {"total": 0, "created": 0, "errors": []}
+    seen = {"email": set(), "cpf": set(), "code": set()}
+
+    for chunk in _chunks(rows, chunk_size):
+        report["total"] += len(chunk)
+
+        # 1. Validación por fila
+        valid = []
+        for number, row in chunk:
+            if isinstance(row, RowError):
+                report["errors"].append({"row": number, "errors": [row.message]})
+                continue
+            try:
+                valid.append((number, UserCreate(**_clean(row))))
+            except ValidationError as e:
+                report["errors"].append({"row": number, "errors": _validation_messages(e)})
+            except TypeError:
+                report["errors"].append({"row": number, "errors": ["Linha inválida"]})
+
+        # 2. Duplicados (una consulta por llave para todo el bloque)
+        existing = {
+            "email": _existing_values(db, User.email, {u.email for _, u in valid}, tenant_id),
+            "cpf": _existing_values(db, User.cpf, {u.cpf for _, u in valid}, tenant_id),
+            "code": _existing_values(db, User.code, {u.code for _, u in valid if u.code}, tenant_id),
+        }
+        messages = {
+            "email": "O e-mail já está cadastrado",
+            "cpf": "O CPF já está cadastrado",
+            "code": "O código já está cadastrado",
+        }
+        accepted = []
+        for number, user in valid:
+            row_errors = []
+            for key in ("email", "cpf", "code"):
+                value = getattr(user, key)
+                if value and (value in existing[key] or value in seen[key]):
+                    row_errors.append(messages[key])
+            if row_errors:
+                report["errors"].append({"row": number, "errors": row_errors})
+                continue
+            for key in ("email", "cpf", "code"):
+                if getattr(user, key):
+                    seen[key].add(getattr(user, key))
+            accepted.append((number, user))
+
+        # 3. Hash en paralelo
+        hashes = get_password_hashes([user.password for _, user in accepted])
+
+        # 4. INSERT multi-fila
+        records = [
+            (number, {
+                "email": user.email,
+                "hashed_password": hashed_password,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "cpf": user.cpf,
+                "role": user.role.value if user.role else "contratado",
+                "code": user.code or None,
+                "pix": user.pix or None,
+                "tenant_id": tenant_id,
+            })
+            for (number, user), hashed_password in zip(accepted, hashes)
+        ]
+        report["created"] += _insert_chunk(db, User, records, report["errors"])
+
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
+
+
+def import_companies(db: Session, rows, user_id: int, tenant_id: int = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    report = {"total": 0, "created": 0, "errors": []}
+    seen_tax_ids = set()
+
+    for chunk in _chunks(rows, chunk_size):
+        report["total"] += len(chunk)
+
+        valid = []
+        for number, row in chunk:
+            if isinstance(row, RowError):
+                report["errors"].append({"row": number, "errors": [row.message]})
+                continue
+            try:
+                valid.append((number, CompanyCreate(**_clean(row))))
+            except ValidationError as e:
+                report["errors"].append({"row": number, "errors": _validation_messages(e)})
+            except TypeError:
+                report["errors"].append({"row": number, "errors": ["Linha inválida"]})
+
+        existing = _existing_values(db, Company.tax_id, {c.tax_id for _, c in valid}, tenant_id)
+        records = []
+        for number, company in valid:
+            if company.tax_id in existing or company.tax_id in seen_tax_ids:
+                report["errors"].append({"row": number, "errors": ["Empresa com este ID Fiscal já existe."]})
+                continue
+            seen_tax_ids.add(company.tax_id)
+            records.append((number, {
+                **company.model_dump(),
+                "tenant_id": tenant_id,
+                "created_by": user_id,
+                "updated_by": user_id,
+            }))
+
+        report["created"] += _insert_chunk(db, Company, records, report["errors"])
+
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
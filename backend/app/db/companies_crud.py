@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from app.models.models import Company
 from app.schemas.company_schemas import CompanyCreate, CompanyUpdate
+from app.core.pagination import decode_cursor, keyset_condition
 
 def get_company(db: Session, company_id: int, tenant_id: int = None):
     query = db.query(Company).filter(Company.id == company_id)
@@ -14,11 +16,24 @@ def get_company_by_tax_id(db: Session, tax_id: str, tenant_id: int = None):
         query = query.filter(Company.tenant_id == tenant_id)
     return query.first()
 
-def get_companies(db: Session, skip: int = 0, limit: int = 100, tenant_id: int = None):
-    query = db.query(Company)
+# Orden del listado de empresas: (columna, descendente). También es la llave del cursor.
+COMPANIES_ORDER = [(Company.name, False), (Company.id, False)]
+
+def company_cursor_key(company):
+    return [company.name, company.id]
+
+def build_companies_query(skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
+    query = select(Company)
     if tenant_id:
-        query = query.filter(Company.tenant_id == tenant_id)
-    return query.order_by(Company.name.asc()).offset(skip).limit(limit).all()
+        query = query.where(Company.tenant_id == tenant_id)
+    if cursor:
+        query = query.where(keyset_condition(COMPANIES_ORDER, decode_cursor(cursor, COMPANIES_ORDER)))
+    else:
+        query = query.offset(skip)
+    return query.order_by(Company.name.asc(), Company.id.asc()).limit(limit)
+
+def get_companies(db: Session, skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
+    return db.scalars(build_companies_query(skip, limit, tenant_id, cursor)).all()
 
 def create_company(db: Session, company: CompanyCreate, user_id: int, tenant_id: int = None):
     db_company = Company(
@@ -0,0 +1,113 @@
+"""
+Particiones mensuales de business.daily_requests, work_shifts y shift_assignments.
+
+Las tres tablas están particionadas por RANGE (request_date), un mes por
+partición (ej: daily_requests_p2025_06). Turnos y asignaciones llevan la fecha
+de su solicitud para que la llave de partición esté en cada tabla: así un
+reporte de junio solo lee las particiones de junio.
+
+No hay partición DEFAULT: una fila sin partición falla. Por eso:
+- ensure_upcoming(): crea los meses siguientes (scripts/ensure_partitions.py, por cron).
+- ensure_for_date(): la llama requests_crud antes de insertar una solicitud,
+  por si la fecha cae fuera de lo ya creado (ej: una carga histórica).
+"""
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+SCHEMA = "business"
+# Orden de creación (y de llaves foráneas): solicitud -> turno -> asignación
+PARTITIONED_TABLES = ["daily_requests", "work_shifts", "shift_assignments"]
+
+# Meses cuyas particiones ya se vieron en la base (por proceso)
+_known_months: set[date] = set()
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    for _ in range(count):
+        month = next_month(month)
+    return month
+
+
+def months_between(start_date: date, end_date: date) -> list[date]:
+    months = []
+    month = month_start(start_date)
+    while month <= end_date:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_ddl(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{partition_name(table, month)} "
+        f"PARTITION OF {SCHEMA}.{table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+    )
+
+
+def _missing(db, month: date) -> list[str]:
+    names = [f"{SCHEMA}.{partition_name(table, month)}" for table in PARTITIONED_TABLES]
+    found = db.execute(
+        text("SELECT name FROM unnest(CAST(:names AS text[])) AS name WHERE to_regclass(name) IS NOT NULL"),
+        {"names": names},
+    ).scalars().all()
+    return [table for table, name in zip(PARTITIONED_TABLES, names) if name not in found]
+
+
+def ensure_partitions(db, start_date: date, end_date: date) -> list[str]:
+    """
+    Crea las particiones que falten entre start_date y end_date (meses completos).
+    db: Session o Connection; no hace commit. Devuelve los nombres creados.
+    """
+    created = []
+    for month in months_between(start_date, end_date):
+        if month in _known_months:
+            continue
+        missing = _missing(db, month)
+        if not missing:
+            # Solo se recuerdan los meses que ya existían: lo creado ahora
+            # todavía puede revertirse con la transacción
+            _known_months.add(month)
+            continue
+        for table in missing:
+            db.execute(text(partition_ddl(table, month)))
+            created.append(partition_name(table, month))
+    return created
+
+
+def ensure_for_date(db, day) -> list[str]:
+    """Particiones del mes de `day` (antes de insertar una solicitud con esa fecha)."""
+    day = day if isinstance(day, date) else date.fromisoformat(str(day))
+    return ensure_partitions(db, day, day)
+
+
+def ensure_upcoming(db, months_ahead: int = None, today: date = None) -> list[str]:
+    """Particiones desde el mes actual hasta `months_ahead` meses adelante."""
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current = month_start(today or date.today())
+    return ensure_partitions(db, current, add_months(current, months_ahead))
+
+
+def list_partitions(db, table: str) -> list[str]:
+    return db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "JOIN pg_namespace n ON n.oid = p.relnamespace "
+        "WHERE n.nspname = :schema AND p.relname = :table ORDER BY c.relname"
+    ), {"schema": SCHEMA, "table": table}).scalars().all()
@@ -0,0 +1,129 @@
+"""
+Métricas del pool de conexiones de SQLAlchemy.
+
+Medimos cuánto espera cada petición por una conexión libre (histograma),
+cuántas veces se agotó el tiempo de espera y el estado actual del pool
+(conexiones en uso, en overflow, etc.) para dimensionarlo con carga real.
+"""
+import threading
+import time
+
+from sqlalchemy import event, exc
+
+# Límites (en segundos) del histograma de espera por conexión
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.max_checked_out = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self.pool = None
+
+    def record_wait(self, elapsed: float):
+        with self._lock:
+            self.wait_sum += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if elapsed <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkout(self, checked_out: int):
+        with self._lock:
+            self.checkouts += 1
+            self.max_checked_out = max(self.max_checked_out, checked_out)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            waits = sum(self.wait_buckets)
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS + ("+Inf",), self.wait_buckets):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                "pool_size": pool.size() if pool else None,
+                "checked_out": pool.checkedout() if pool else None,
+                "checked_in": pool.checkedin() if pool else None,
+                "overflow": pool.overflow() if pool else None,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "wait_avg_seconds": round(self.wait_sum / waits, 6) if waits else 0.0,
+                "wait_max_seconds": round(self.wait_max, 6),
+                "wait_buckets": buckets,
+            }
+
+
+# Un PoolMetrics por motor ("primary", "async", ...)
+registry: dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base_pool_class, metrics: PoolMetrics):
+    """
+    Crea una subclase del pool que mide la espera por conexión.
+    Va en la clase (y no en la instancia) para sobrevivir a engine.dispose(),
+    que recrea el pool con la misma clase.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base_pool_class._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{base_pool_class.__name__}", (base_pool_class,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """Engancha los eventos del pool del motor (sync) a sus métricas."""
+    registry[metrics.name] = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.pool = engine.pool
+        metrics.record_checkout(engine.pool.checkedout())
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.record_checkin()
+
+    metrics.pool = engine.pool
+    return engine
+
+
+def get_pool_stats() -> dict:
+    return {name: metrics.snapshot() for name, metrics in registry.items()}
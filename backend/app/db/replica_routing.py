@@ -0,0 +1,49 @@
+"""
+Enrutamiento de lecturas a la réplica con guarda de "staleness".
+
+La réplica puede ir unos segundos por detrás del primario. Para que un usuario
+vea siempre lo que acaba de escribir, cada escritura exitosa deja una marca en
+Redis con TTL = REPLICA_STALENESS_SECONDS; mientras exista, sus lecturas van al
+primario. Si Redis no responde, por seguridad también se usa el primario.
+"""
+import jwt
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client, get_async_redis_client
+
+RECENT_WRITE_PREFIX = "recent_write:"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def subject_from_authorization(authorization: str | None) -> str | None:
+    """Extrae el email (sub) de un header "Bearer <jwt>" sin lanzar errores."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("sub")
+
+
+async def mark_recent_write(subject: str):
+    try:
+        await get_async_redis_client().set(RECENT_WRITE_PREFIX + subject, 1, ex=settings.REPLICA_STALENESS_SECONDS)
+    except RedisError:
+        pass
+
+
+def use_primary_for(subject: str) -> bool:
+    """True si el usuario escribió hace poco (o si no lo podemos saber)."""
+    try:
+        return bool(get_redis_client().exists(RECENT_WRITE_PREFIX + subject))
+    except RedisError:
+        return True
+
+
+async def use_primary_for_async(subject: str) -> bool:
+    try:
+        return bool(await get_async_redis_client().exists(RECENT_WRITE_PREFIX + subject))
+    except RedisError:
+        return True
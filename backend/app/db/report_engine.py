@@ -0,0 +1,242 @@
+"""
+Motor de reportes: arma UNA consulta a partir de dimensiones y medidas.
+
+    compile_report(["company", "status"], ["assignment_count"], start, end, tenant_id=1)
+
+- Dimensiones: por qué se agrupa (empresa, empleado, día/semana/mes, estado...).
+- Medidas: qué se calcula (conteos, horas, bruto, con descuento).
+
+Solo se hacen los joins que piden las dimensiones y medidas elegidas (más los
+del filtro de contratado), y los filtros comunes (fechas, empresa, tenant,
+contratado, solicitudes canceladas) se aplican en un único lugar.
+La tabla base es daily_requests (fecha, empresa, tenant y estado están ahí), salvo
+cuando el reporte es por asignación y todo lo pedido está en sus columnas de
+hechos (fecha, empresa, tenant, estado de la solicitud y montos): entonces la base
+es shift_assignments y solo se unen empleados y empresas para sus nombres.
+
+Solicitudes, turnos y asignaciones están particionadas por mes (request_date):
+los joins van por (id, request_date) y el rango de fechas se repite en cada
+tabla unida, así Postgres descarta las particiones fuera del rango en todas.
+"""
+from typing import Callable, NamedTuple
+
+from sqlalchemy import and_, case, distinct, extract, func, select
+
+from app.models.models import DailyRequest, WorkShift, ShiftAssignment, User, Company
+
+# Estados de business.daily_request_status
+CANCELLED_STATUS_ID = 3
+
+# Estados de business.shift_assignments
+ASSIGNMENT_PRESENT = "PRESENTE"
+ASSIGNMENT_ABSENT = "FALTOU"
+ASSIGNMENT_ASSIGNED = "ASIGNADO"
+
+# Tablas que se pueden unir a daily_requests: nombre -> (dependencias, modelo, condición)
+_JOINS = {
+    "shift": ((), WorkShift, lambda: and_(
+        WorkShift.request_id == DailyRequest.id, WorkShift.request_date == DailyRequest.request_date
+    )),
+    "assignment": (("shift",), ShiftAssignment, lambda: and_(
+        ShiftAssignment.shift_id == WorkShift.id, ShiftAssignment.request_date == WorkShift.request_date
+    )),
+    "employee": (("assignment",), User, lambda: User.id == ShiftAssignment.employee_id),
+    "company": ((), Company, lambda: Company.id == DailyRequest.company_id),
+}
+_JOIN_ORDER = ["shift", "assignment", "employee", "company"]
+# Con shift_assignments como base (hechos): turno y asignación ya están
+_FACT_JOINS = {
+    "employee": (User, lambda: User.id == ShiftAssignment.employee_id),
+    "company": (Company, lambda: Company.id == ShiftAssignment.company_id),
+}
+# Tablas unidas que están particionadas por request_date
+_PARTITIONED = {"shift": WorkShift, "assignment": ShiftAssignment}
+
+
+class Dimension(NamedTuple):
+    columns: Callable[[], list]  # columnas etiquetadas (se agrupa por todas)
+    tables: tuple = ()
+    fact_columns: Callable[[], list] | None = None  # las mismas, desde shift_assignments (None: no hay)
+
+
+class Measure(NamedTuple):
+    expression: Callable[[], object]  # valor por fila
+    aggregate: Callable | None  # función de agregación (None: solo en modo detalle)
+    tables: tuple = ()
+    fact_expression: Callable[[], object] | None = None  # lo mismo, desde shift_assignments
+
+
+def request_date_between(model, start_date, end_date):
+    """
+    Rango de fechas sobre la llave de partición de `model`. Postgres no deduce
+    desigualdades a través del join: cada tabla particionada necesita el suyo.
+    """
+    return and_(model.request_date >= start_date, model.request_date <= end_date)
+
+
+def discounted_amount_expr():
+    """Monto del turno con el descuento aplicado (si tiene)."""
+    return case(
+        (WorkShift.has_discount == True, WorkShift.payment_amount * (1 - WorkShift.discount_percentage / 100.0)),
+        else_=WorkShift.payment_amount
+    )
+
+
+def discounted_amount(shift) -> float:
+    """Lo mismo que discounted_amount_expr, en Python (para ShiftAssignment.final_amount)."""
+    if shift.has_discount:
+        return shift.payment_amount * (1 - (shift.discount_percentage or 0) / 100.0)
+    return shift.payment_amount
+
+
+def _hours_expr():
+    return extract("epoch", WorkShift.end_time - WorkShift.start_time) / 3600.0
+
+
+def _company_columns():
+    return [Company.id.label("company_id"), Company.name.label("company_name")]
+
+
+def _employee_columns():
+    return [User.id.label("employee_id"), User.code, User.first_name, User.last_name, User.pix]
+
+
+def _date_columns(model, unit=None):
+    if unit is None:
+        return lambda: [model.request_date]
+    return lambda: [func.date_trunc(unit, model.request_date).label(unit)]
+
+
+DIMENSIONS = {
+    "company": Dimension(_company_columns, ("company",), _company_columns),
+    "employee": Dimension(_employee_columns, ("employee",), _employee_columns),
+    "date": Dimension(_date_columns(DailyRequest), (), _date_columns(ShiftAssignment)),
+    "week": Dimension(_date_columns(DailyRequest, "week"), (), _date_columns(ShiftAssignment, "week")),
+    "month": Dimension(_date_columns(DailyRequest, "month"), (), _date_columns(ShiftAssignment, "month")),
+    "status": Dimension(lambda: [ShiftAssignment.status], ("assignment",), lambda: [ShiftAssignment.status]),
+    "shift": Dimension(lambda: [WorkShift.start_time, WorkShift.end_time], ("shift",)),
+}
+
+MEASURES = {
+    # DISTINCT: con asignaciones unidas, cada solicitud aparece varias veces
+    "request_count": Measure(lambda: DailyRequest.id, lambda e: func.count(distinct(e))),
+    "assignment_count": Measure(lambda: ShiftAssignment.id, func.count, ("assignment",), lambda: ShiftAssignment.id),
+    "hours": Measure(_hours_expr, func.sum, ("assignment",)),
+    "gross_amount": Measure(lambda: WorkShift.payment_amount, func.sum, ("assignment",), lambda: ShiftAssignment.payment_amount),
+    "avg_payment": Measure(lambda: WorkShift.payment_amount, func.avg, ("assignment",), lambda: ShiftAssignment.payment_amount),
+    "discounted_amount": Measure(discounted_amount_expr, func.sum, ("assignment",), lambda: ShiftAssignment.final_amount),
+}
+
+
+def _required_joins(tables) -> list[str]:
+    required = set()
+    pending = list(tables)
+    while pending:
+        table = pending.pop()
+        if table not in required:
+            required.add(table)
+            pending.extend(_JOINS[table][0])
+    return [table for table in _JOIN_ORDER if table in required]
+
+
+def _request_query(group_columns, measure_columns, tables, start_date, end_date, company_id, tenant_id):
+    """daily_requests como base, con los joins que hagan falta."""
+    query = select(*group_columns, *measure_columns).select_from(DailyRequest)
+    joined = _required_joins(tables)
+    for table in joined:
+        _, model, condition = _JOINS[table]
+        query = query.join(model, condition())
+
+    query = query.where(
+        and_(
+            request_date_between(DailyRequest, start_date, end_date),
+            DailyRequest.status_id != CANCELLED_STATUS_ID
+        )
+    )
+    for table in joined:
+        if table in _PARTITIONED:
+            query = query.where(request_date_between(_PARTITIONED[table], start_date, end_date))
+    if company_id:
+        query = query.where(DailyRequest.company_id == company_id)
+    if tenant_id:
+        query = query.where(DailyRequest.tenant_id == tenant_id)
+    return query
+
+
+def _fact_query(group_columns, measure_columns, tables, start_date, end_date, company_id, tenant_id):
+    """shift_assignments como base: (tenant_id, request_date, status) está indexado."""
+    query = select(*group_columns, *measure_columns).select_from(ShiftAssignment)
+    for table in _JOIN_ORDER:
+        if table in tables and table in _FACT_JOINS:
+            model, condition = _FACT_JOINS[table]
+            query = query.join(model, condition())
+
+    query = query.where(
+        and_(
+            request_date_between(ShiftAssignment, start_date, end_date),
+            ShiftAssignment.request_status_id != CANCELLED_STATUS_ID
+        )
+    )
+    if company_id:
+        query = query.where(ShiftAssignment.company_id == company_id)
+    if tenant_id:
+        query = query.where(ShiftAssignment.tenant_id == tenant_id)
+    return query
+
+
+def compile_report(dimensions: list[str], measures: list[str], start_date, end_date,
+                   company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None,
+                   assignment_statuses: list[str] = None, aggregate: bool = True, order_by: list[str] = None):
+    """
+    Devuelve el SELECT del reporte. Las columnas se llaman como la dimensión
+    (ej: company_name, request_date) o la medida (ej: discounted_amount).
+
+    aggregate=False: una fila por registro (sin GROUP BY), las medidas son el valor de la fila.
+    order_by: etiquetas de columnas; por defecto, las dimensiones en el orden dado.
+    """
+    unknown = [d for d in dimensions if d not in DIMENSIONS] + [m for m in measures if m not in MEASURES]
+    if unknown:
+        raise ValueError(f"Dimensões ou medidas desconhecidas: {', '.join(unknown)}")
+
+    contractor_scope = role == "contratado" and user_id
+    tables = [t for d in dimensions for t in DIMENSIONS[d].tables]
+    tables += [t for m in measures for t in MEASURES[m].tables]
+    if contractor_scope or assignment_statuses:
+        tables.append("assignment")
+
+    # Por asignación y todo disponible en sus hechos: sin turnos ni solicitudes
+    use_facts = "assignment" in tables \
+        and all(DIMENSIONS[d].fact_columns for d in dimensions) \
+        and all(MEASURES[m].fact_expression for m in measures)
+
+    group_columns = [
+        c for d in dimensions
+        for c in (DIMENSIONS[d].fact_columns if use_facts else DIMENSIONS[d].columns)()
+    ]
+    measure_columns = []
+    for name in measures:
+        measure = MEASURES[name]
+        expression = (measure.fact_expression if use_facts else measure.expression)()
+        if aggregate:
+            measure_columns.append(measure.aggregate(expression).label(name))
+        else:
+            if name in ("request_count", "assignment_count"):
+                raise ValueError(f"A medida {name} exige agregação")
+            measure_columns.append(expression.label(name))
+
+    if use_facts:
+        query = _fact_query(group_columns, measure_columns, tables, start_date, end_date, company_id, tenant_id)
+    else:
+        query = _request_query(group_columns, measure_columns, tables, start_date, end_date, company_id, tenant_id)
+
+    if contractor_scope:
+        query = query.where(ShiftAssignment.employee_id == user_id)
+    if assignment_statuses:
+        query = query.where(ShiftAssignment.status.in_(assignment_statuses))
+
+    if aggregate and group_columns:
+        query = query.group_by(*group_columns)
+
+    columns_by_label = {c.key: c for c in group_columns + measure_columns}
+    ordering = order_by if order_by is not None else [c.key for c in group_columns]
+    return query.order_by(*(columns_by_label[label] for label in ordering))
@@ -0,0 +1,176 @@
+"""
+Mantenimiento y lectura del resumen diario de asignaciones (DailyAssignmentRollup).
+
+La unidad de recálculo es (empresa, fecha): cada escritura que afecta asignaciones
+de una solicitud recalcula las filas de ese día y esa empresa a partir de los
+datos crudos, dentro de la misma transacción. Es barato (un día de una empresa)
+y también vale al cancelar o borrar una solicitud. Dos transacciones que
+recalculan la misma empresa se turnan con un advisory lock: sin él, el DELETE
+de la segunda no ve las filas que la primera acaba de insertar y un grupo que
+ya no existe quedaría en el resumen. rebuild() no toma el lock: es una tarea de
+mantenimiento y se corre sin escrituras concurrentes.
+"""
+from datetime import date
+
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import (
+    DailyAssignmentRollup, DailyRequest, WorkShift, ShiftAssignment, User, Company
+)
+from app.db.report_engine import CANCELLED_STATUS_ID, ASSIGNMENT_PRESENT
+
+# Espacio de los advisory locks del recálculo (el segundo entero es la empresa)
+ROLLUP_REFRESH_LOCK = 7302
+
+
+def _aggregate_query(start_date=None, end_date=None, company_id: int = None):
+    """
+    SELECT que produce las filas del resumen a partir de los datos crudos.
+    Lee solo las columnas de hechos de las asignaciones. El tenant es el de la
+    asignación, el mismo que filtra el motor de reportes (migración 0007).
+    """
+    where_clause = ShiftAssignment.request_status_id != CANCELLED_STATUS_ID
+    if start_date:
+        where_clause = and_(where_clause, ShiftAssignment.request_date >= start_date)
+    if end_date:
+        where_clause = and_(where_clause, ShiftAssignment.request_date <= end_date)
+    if company_id:
+        where_clause = and_(where_clause, ShiftAssignment.company_id == company_id)
+    tenant_expr = func.coalesce(ShiftAssignment.tenant_id, 0)
+    return select(
+        tenant_expr.label("tenant_id"),
+        ShiftAssignment.company_id,
+        ShiftAssignment.employee_id,
+        ShiftAssignment.request_date,
+        ShiftAssignment.status,
+        func.count(ShiftAssignment.id).label("assignment_count"),
+        func.sum(ShiftAssignment.payment_amount).label("gross_amount"),
+        func.sum(ShiftAssignment.final_amount).label("discounted_amount"),
+    ).select_from(ShiftAssignment)\
+     .where(where_clause)\
+     .group_by(tenant_expr, ShiftAssignment.company_id, ShiftAssignment.employee_id, ShiftAssignment.request_date, ShiftAssignment.status)
+
+
+def _upsert_from(db: Session, aggregate_query):
+    columns = ["tenant_id", "company_id", "employee_id", "request_date", "status",
+               "assignment_count", "gross_amount", "discounted_amount"]
+    stmt = pg_insert(DailyAssignmentRollup).from_select(columns, aggregate_query)
+    # ON CONFLICT: dos transacciones pueden recalcular el mismo día a la vez
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "company_id", "employee_id", "request_date", "status"],
+        set_={
+            "assignment_count": stmt.excluded.assignment_count,
+            "gross_amount": stmt.excluded.gross_amount,
+            "discounted_amount": stmt.excluded.discounted_amount,
+        },
+    )
+    db.execute(stmt)
+
+
+def refresh_day(db: Session, company_id: int, request_date):
+    """Recalcula el resumen de una empresa en un día. No hace commit (el lock dura hasta él)."""
+    db.flush()
+    # Después del flush: los datos propios ya están escritos y, con el lock
+    # tomado, el DELETE y el SELECT ven lo que confirmó quien lo tenía antes
+    db.execute(select(func.pg_advisory_xact_lock(ROLLUP_REFRESH_LOCK, company_id)))
+    db.execute(delete(DailyAssignmentRollup).where(
+        DailyAssignmentRollup.company_id == company_id,
+        DailyAssignmentRollup.request_date == request_date,
+    ))
+    _upsert_from(db, _aggregate_query(request_date, request_date, company_id))
+
+
+def refresh_for_shift(db: Session, shift_id: int):
+    """Recalcula el día de la solicitud a la que pertenece el turno."""
+    row = db.execute(
+        select(DailyRequest.company_id, DailyRequest.request_date)
+        .join(WorkShift, and_(WorkShift.request_id == DailyRequest.id, WorkShift.request_date == DailyRequest.request_date))
+        .where(WorkShift.id == shift_id)
+    ).first()
+    if row:
+        refresh_day(db, row.company_id, row.request_date)
+
+
+def rebuild(db: Session, start_date=None, end_date=None) -> None:
+    """Reconstruye el resumen completo (o un rango de fechas) desde cero. Hace commit."""
+    delete_stmt = delete(DailyAssignmentRollup)
+    if start_date:
+        delete_stmt = delete_stmt.where(DailyAssignmentRollup.request_date >= start_date)
+    if end_date:
+        delete_stmt = delete_stmt.where(DailyAssignmentRollup.request_date <= end_date)
+
+    db.execute(delete_stmt)
+    _upsert_from(db, _aggregate_query(start_date, end_date))
+    db.commit()
+
+
+# --- LECTURA DESDE EL RESUMEN ---
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def covers_range(start_date, end_date) -> bool:
+    """
+    Los rangos cortos son baratos sobre los datos crudos; a partir de
+    REPORT_ROLLUP_MIN_DAYS días conviene leer del resumen.
+    """
+    if not settings.REPORT_ROLLUP_ENABLED:
+        return False
+    try:
+        days = (_as_date(end_date) - _as_date(start_date)).days + 1
+    except ValueError:
+        return False
+    return days >= settings.REPORT_ROLLUP_MIN_DAYS
+
+
+def _scoped(query, start_date, end_date, company_id, user_id, role, tenant_id):
+    query = query.where(
+        DailyAssignmentRollup.request_date >= start_date,
+        DailyAssignmentRollup.request_date <= end_date,
+    )
+    if company_id:
+        query = query.where(DailyAssignmentRollup.company_id == company_id)
+    if role == "contratado" and user_id:
+        query = query.where(DailyAssignmentRollup.employee_id == user_id)
+    if tenant_id:
+        query = query.where(DailyAssignmentRollup.tenant_id == tenant_id)
+    return query
+
+
+def build_payments_report_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    """Mismas columnas que requests_crud.build_payments_report_query."""
+    assignment_count = func.sum(DailyAssignmentRollup.assignment_count)
+    query = select(
+        User.id.label("employee_id"),
+        User.code,
+        User.first_name,
+        User.last_name,
+        User.pix,
+        assignment_count.label("assignment_count"),
+        (func.sum(DailyAssignmentRollup.gross_amount) / assignment_count).label("avg_payment"),
+        func.sum(DailyAssignmentRollup.discounted_amount).label("discounted_amount")
+    ).select_from(DailyAssignmentRollup)\
+     .join(User, User.id == DailyAssignmentRollup.employee_id)\
+     .where(DailyAssignmentRollup.status == ASSIGNMENT_PRESENT)
+
+    query = _scoped(query, start_date, end_date, company_id, user_id, role, tenant_id)
+    return query.group_by(User.id, User.code, User.first_name, User.last_name, User.pix)\
+                .order_by(User.first_name, User.last_name)
+
+
+def build_attendance_stats_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    """Mismas columnas que requests_crud.build_attendance_stats_query."""
+    query = select(
+        Company.id.label("company_id"),
+        Company.name.label("company_name"),
+        DailyAssignmentRollup.status,
+        func.sum(DailyAssignmentRollup.assignment_count).label("assignment_count")
+    ).select_from(DailyAssignmentRollup)\
+     .join(Company, Company.id == DailyAssignmentRollup.company_id)
+
+    query = _scoped(query, start_date, end_date, company_id, user_id, role, tenant_id)
+    return query.group_by(Company.id, Company.name, DailyAssignmentRollup.status).order_by(Company.name)
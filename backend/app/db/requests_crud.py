@@ -1,235 +1,356 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, selectinload, noload
+from sqlalchemy import desc, and_, select, insert, distinct, tuple_, func
 from app.models.models import DailyRequest, WorkShift, ShiftAssignment, User, Company, DailyRequestStatus
 from app.schemas.request_schemas import DailyRequestCreate, ShiftAssignmentCreate
+from app.core.pagination import decode_cursor, keyset_condition
+from app.db import report_rollup, report_engine, partitions
+from app.core import report_cache
 
-def get_daily_request(db: Session, request_id: int, tenant_id: int = None):
-    query = db.query(DailyRequest).options(
-        joinedload(DailyRequest.shifts)
-        .joinedload(WorkShift.assignments)
-        .joinedload(ShiftAssignment.employee)
-    ).filter(DailyRequest.id == request_id)
+def daily_request_load_options(include=("shifts", "assignments", "employee")):
+    """
+    Opciones de carga del detalle según las relaciones pedidas.
+    selectinload: una consulta por nivel en vez de una fila por solicitud×turno×asignación.
+    """
+    if "shifts" not in include:
+        return [noload(DailyRequest.shifts)]
+    option = selectinload(DailyRequest.shifts)
+    if "assignments" not in include:
+        return [option.noload(WorkShift.assignments)]
+    option = option.selectinload(WorkShift.assignments)
+    if "employee" not in include:
+        return [option.noload(ShiftAssignment.employee)]
+    return [option.selectinload(ShiftAssignment.employee)]
+
+def daily_request_count_columns(counts=()):
+    """Subconsultas escalares para shift_count / assignment_count."""
+    columns = []
+    if "shift_count" in counts:
+        columns.append(
+            select(func.count(WorkShift.id))
+            .where(WorkShift.request_id == DailyRequest.id, WorkShift.request_date == DailyRequest.request_date)
+            .correlate(DailyRequest).scalar_subquery().label("shift_count")
+        )
+    if "assignment_count" in counts:
+        columns.append(
+            select(func.count(ShiftAssignment.id))
+            .join(WorkShift, and_(WorkShift.id == ShiftAssignment.shift_id, WorkShift.request_date == ShiftAssignment.request_date))
+            .where(WorkShift.request_id == DailyRequest.id, ShiftAssignment.request_date == DailyRequest.request_date)
+            .correlate(DailyRequest).scalar_subquery().label("assignment_count")
+        )
+    return columns
+
+def get_daily_request(db: Session, request_id: int, tenant_id: int = None, include=("shifts", "assignments", "employee"), counts=()):
+    """
+    Devuelve la solicitud, o (solicitud, {conteo: valor}) si se piden conteos.
+    """
+    query = select(DailyRequest, *daily_request_count_columns(counts))\
+        .options(*daily_request_load_options(include))\
+        .where(DailyRequest.id == request_id)
     
     if tenant_id:
-        query = query.filter(DailyRequest.tenant_id == tenant_id)
+        query = query.where(DailyRequest.tenant_id == tenant_id)
     
-    return query.first()
-
-from sqlalchemy.sql import func, case
+    row = db.execute(query).first()
+    if row is None:
+        return None
+    if not counts:
+        return row[0]
+    return row[0], {name: row._mapping[name] for name in counts}
 
 def _get_employee_filter(user_id: int):
     """Helper para obtener filtro de empleado logueado."""
     return ShiftAssignment.employee_id == user_id
 
-def get_payments_report(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
-    amount_expr = case(
-        (WorkShift.has_discount == True, WorkShift.payment_amount * (1 - WorkShift.discount_percentage / 100.0)),
-        else_=WorkShift.payment_amount
+# --- REPORTES ---
+# Cada reporte se divide en "build_*" (arma el SELECT) y "format_*" (convierte las filas).
+# Así la versión síncrona y la asíncrona (async_requests_crud) ejecutan exactamente la misma consulta.
+# Los "build_*" son presets del motor de reportes (report_engine).
+
+def build_payments_report_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    # Rangos largos: leer del resumen diario (mismas columnas)
+    if report_rollup.covers_range(start_date, end_date):
+        return report_rollup.build_payments_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+
+    return report_engine.compile_report(
+        ["employee"], ["assignment_count", "avg_payment", "discounted_amount"],
+        start_date, end_date, company_id, user_id, role, tenant_id,
+        assignment_statuses=[report_engine.ASSIGNMENT_PRESENT],
+        order_by=["first_name", "last_name"]
     )
-    
-    query = db.query(
-        User.code,
-        User.first_name,
-        User.last_name,
-        User.pix,
-        func.count(ShiftAssignment.id).label("shift_count"),
-        func.avg(WorkShift.payment_amount).label("avg_payment"),
-        func.sum(amount_expr).label("total_amount")
-    ).join(ShiftAssignment, ShiftAssignment.employee_id == User.id)\
-     .join(WorkShift, WorkShift.id == ShiftAssignment.shift_id)\
-     .join(DailyRequest, DailyRequest.id == WorkShift.request_id)\
-     .join(DailyRequestStatus, DailyRequestStatus.id == DailyRequest.status_id)\
-     .join(Company, Company.id == DailyRequest.company_id)\
-     .filter(
-         and_(
-             DailyRequest.request_date >= start_date,
-             DailyRequest.request_date <= end_date,
-             ShiftAssignment.status == 'PRESENTE',
-             DailyRequest.status_id != 3
-         )
-     )
-    
-    if company_id:
-        query = query.filter(DailyRequest.company_id == company_id)
-    
-    if role == "contratado" and user_id:
-        query = query.filter(ShiftAssignment.employee_id == user_id)
-    
-    if tenant_id:
-        query = query.filter(Company.tenant_id == tenant_id)
-        
-    query = query.group_by(User.id, User.code, User.first_name, User.last_name, User.pix)\
-                 .order_by(User.first_name, User.last_name)
-                 
-    results = query.all()
-    
+
+def format_payments_report(results):
     return [
         {
             "employee_code": r.code,
             "employee_name": f"{r.first_name} {r.last_name}",
-            "shift_count": r.shift_count,
+            "shift_count": r.assignment_count,
             "avg_payment": round(float(r.avg_payment or 0), 2),
-            "total_amount": float(r.total_amount or 0),
+            "total_amount": float(r.discounted_amount or 0),
             "employee_pix": r.pix
         }
         for r in results
     ]
 
+def get_payments_report(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = build_payments_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    return format_payments_report(db.execute(query).all())
+
+def build_attendance_report_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    # Una fila por asignación (sin agrupar)
+    return report_engine.compile_report(
+        ["date", "company", "employee", "shift", "status"], ["discounted_amount"],
+        start_date, end_date, company_id, user_id, role, tenant_id,
+        aggregate=False, order_by=["request_date", "first_name"]
+    )
+
+def format_attendance_report_row(r):
+    return {
+        "date": r.request_date,
+        "company_name": r.company_name,
+        "employee_name": f"{r.first_name} {r.last_name}",
+        "shift_time": f"{r.start_time.strftime('%H:%M')} - {r.end_time.strftime('%H:%M')}",
+        "status": r.status,
+        "amount": float(r.discounted_amount or 0)
+    }
+
+def format_attendance_report(results):
+    return [format_attendance_report_row(r) for r in results]
+
 def get_attendance_report(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
-    amount_expr = case(
-        (WorkShift.has_discount == True, WorkShift.payment_amount * (1 - WorkShift.discount_percentage / 100.0)),
-        else_=WorkShift.payment_amount
+    query = build_attendance_report_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    return format_attendance_report(db.execute(query).all())
+
+def build_dashboard_stats_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    return report_engine.compile_report(
+        ["company"], ["request_count"],
+        start_date, end_date, company_id, user_id, role, tenant_id,
+        order_by=["company_name"]
     )
 
-    query = db.query(
-        DailyRequest.request_date,
-        Company.name.label("company_name"),
-        User.first_name,
-        User.last_name,
-        WorkShift.start_time,
-        WorkShift.end_time,
-        ShiftAssignment.status,
-        amount_expr.label("final_amount")
-    ).join(WorkShift, WorkShift.request_id == DailyRequest.id)\
-     .join(ShiftAssignment, ShiftAssignment.shift_id == WorkShift.id)\
-     .join(User, User.id == ShiftAssignment.employee_id)\
-     .join(Company, Company.id == DailyRequest.company_id)\
-     .join(DailyRequestStatus, DailyRequestStatus.id == DailyRequest.status_id)\
-     .filter(
-         and_(
-             DailyRequest.request_date >= start_date,
-             DailyRequest.request_date <= end_date,
-             DailyRequest.status_id != 3
-         )
-     )
-    
-    if company_id:
-        query = query.filter(DailyRequest.company_id == company_id)
-    
-    if role == "contratado" and user_id:
-        query = query.filter(ShiftAssignment.employee_id == user_id)
-    
-    if tenant_id:
-        query = query.filter(Company.tenant_id == tenant_id)
-        
-    query = query.order_by(DailyRequest.request_date, User.first_name)
-    results = query.all()
-    
+def format_dashboard_stats(results):
     return [
         {
-            "date": r.request_date,
             "company_name": r.company_name,
-            "employee_name": f"{r.first_name} {r.last_name}",
-            "shift_time": f"{r.start_time.strftime('%H:%M')} - {r.end_time.strftime('%H:%M')}",
-            "status": r.status,
-            "amount": float(r.final_amount or 0)
+            "request_count": r.request_count
         }
         for r in results
     ]
 
 def get_dashboard_stats(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
-    query = db.query(
-        Company.name.label("company_name"),
-        func.count(DailyRequest.id).label("request_count")
-    ).join(Company, Company.id == DailyRequest.company_id)\
-     .join(DailyRequestStatus, DailyRequestStatus.id == DailyRequest.status_id)\
-     .filter(
-         and_(
-             DailyRequest.request_date >= start_date,
-             DailyRequest.request_date <= end_date,
-             DailyRequest.status_id != 3
-         )
-     )
-    
-    if company_id:
-        query = query.filter(DailyRequest.company_id == company_id)
-    
-    if tenant_id:
-        query = query.filter(Company.tenant_id == tenant_id)
-    
-    if role == "contratado" and user_id:
-        query = query.join(WorkShift, WorkShift.request_id == DailyRequest.id)\
-                     .join(ShiftAssignment, ShiftAssignment.shift_id == WorkShift.id)\
-                     .filter(ShiftAssignment.employee_id == user_id)
-        
-    query = query.group_by(Company.name).order_by(Company.name)
-    results = query.all()
-    
+    query = build_dashboard_stats_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    return format_dashboard_stats(db.execute(query).all())
+
+def build_attendance_stats_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    # Rangos largos: leer del resumen diario (mismas columnas)
+    if report_rollup.covers_range(start_date, end_date):
+        return report_rollup.build_attendance_stats_query(start_date, end_date, company_id, user_id, role, tenant_id)
+
+    return report_engine.compile_report(
+        ["company", "status"], ["assignment_count"],
+        start_date, end_date, company_id, user_id, role, tenant_id,
+        order_by=["company_name"]
+    )
+
+def format_attendance_stats(results):
     return [
         {
             "company_name": r.company_name,
-            "request_count": r.request_count
+            "status": r.status,
+            "count": r.assignment_count
         }
         for r in results
     ]
 
 def get_attendance_stats(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
-    query = db.query(
+    query = build_attendance_stats_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    return format_attendance_stats(db.execute(query).all())
+
+
+# --- RESUMEN DEL DASHBOARD (una sola pasada) ---
+# grouping(empresa, estado) indica qué nivel de agregación trae cada fila
+OVERVIEW_DETAIL, OVERVIEW_COMPANY, OVERVIEW_STATUS, OVERVIEW_TOTAL = 0, 1, 2, 3
+
+def build_dashboard_overview_query(start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    """
+    Solicitudes por empresa, asignaciones por empresa y estado, totales y monto a
+    pagar (con descuento, solo PRESENTE) en un único recorrido con GROUPING SETS.
+    """
+    presente = ShiftAssignment.status == report_engine.ASSIGNMENT_PRESENT
+    query = select(
+        Company.id.label("company_id"),
         Company.name.label("company_name"),
         ShiftAssignment.status,
-        func.count(ShiftAssignment.id).label("count")
-    ).join(WorkShift, WorkShift.id == ShiftAssignment.shift_id)\
-     .join(DailyRequest, DailyRequest.id == WorkShift.request_id)\
+        func.grouping(Company.id, ShiftAssignment.status).label("level"),
+        func.count(distinct(DailyRequest.id)).label("request_count"),
+        func.count(ShiftAssignment.id).label("assignment_count"),
+        func.coalesce(func.sum(ShiftAssignment.final_amount).filter(presente), 0).label("payout_total")
+    ).select_from(DailyRequest)\
      .join(Company, Company.id == DailyRequest.company_id)\
-     .join(DailyRequestStatus, DailyRequestStatus.id == DailyRequest.status_id)\
-     .filter(
+     .outerjoin(WorkShift, and_(
+         WorkShift.request_id == DailyRequest.id,
+         WorkShift.request_date == DailyRequest.request_date,
+         # En el ON (no en el WHERE) para no convertir el LEFT JOIN en INNER; igual poda particiones
+         report_engine.request_date_between(WorkShift, start_date, end_date)
+     ))\
+     .outerjoin(ShiftAssignment, and_(
+         ShiftAssignment.shift_id == WorkShift.id,
+         ShiftAssignment.request_date == WorkShift.request_date,
+         report_engine.request_date_between(ShiftAssignment, start_date, end_date)
+     ))\
+     .where(
          and_(
-             DailyRequest.request_date >= start_date,
-             DailyRequest.request_date <= end_date,
-             DailyRequest.status_id != 3
+             report_engine.request_date_between(DailyRequest, start_date, end_date),
+             DailyRequest.status_id != report_engine.CANCELLED_STATUS_ID
          )
      )
-    
+
     if company_id:
-        query = query.filter(DailyRequest.company_id == company_id)
-    
+        query = query.where(DailyRequest.company_id == company_id)
+
     if role == "contratado" and user_id:
-        query = query.filter(ShiftAssignment.employee_id == user_id)
-    
+        query = query.where(ShiftAssignment.employee_id == user_id)
+
     if tenant_id:
-        query = query.filter(Company.tenant_id == tenant_id)
-        
-    query = query.group_by(Company.name, ShiftAssignment.status).order_by(Company.name)
-    results = query.all()
-    
-    return [
-        {
-            "company_name": r.company_name,
-            "status": r.status,
-            "count": r.count
-        }
-        for r in results
-    ]
+        query = query.where(DailyRequest.tenant_id == tenant_id)
 
+    return query.group_by(func.grouping_sets(
+        tuple_(Company.id, Company.name, ShiftAssignment.status),
+        tuple_(Company.id, Company.name),
+        ShiftAssignment.status,
+        tuple_(),
+    ))
 
+def format_dashboard_overview(results):
+    totals = {"request_count": 0, "assignment_count": 0, "payout_total": 0.0, "status_counts": {}}
+    companies = {}
+    for r in results:
+        if r.level == OVERVIEW_TOTAL:
+            totals.update(request_count=r.request_count, assignment_count=r.assignment_count, payout_total=float(r.payout_total))
+        elif r.level == OVERVIEW_STATUS:
+            if r.status is not None:
+                totals["status_counts"][r.status] = r.assignment_count
+        else:
+            company = companies.setdefault(r.company_id, {
+                "company_name": r.company_name, "request_count": 0, "assignment_count": 0,
+                "payout_total": 0.0, "status_counts": {}
+            })
+            if r.level == OVERVIEW_COMPANY:
+                company.update(request_count=r.request_count, assignment_count=r.assignment_count, payout_total=float(r.payout_total))
+            elif r.status is not None:
+                # status None: solicitudes sin asignaciones (ya cuentan en request_count)
+                company["status_counts"][r.status] = r.assignment_count
+    return {
+        "totals": totals,
+        "companies": sorted(companies.values(), key=lambda c: c["company_name"]),
+    }
 
+def get_dashboard_overview(db: Session, start_date, end_date, company_id: int = None, user_id: int = None, role: str = None, tenant_id: int = None):
+    query = build_dashboard_overview_query(start_date, end_date, company_id, user_id, role, tenant_id)
+    return format_dashboard_overview(db.execute(query).all())
 
+# Orden del listado de solicitudes: (columna, descendente). También es la llave del cursor.
+DAILY_REQUESTS_ORDER = [(DailyRequest.request_date, True), (DailyRequest.id, False)]
 
-def get_daily_requests(db: Session, skip: int = 0, limit: int = 100, company_id: int = None, start_date: str = None, end_date: str = None, user_id: int = None, role: str = None, tenant_id: int = None):
-    query = db.query(DailyRequest)
+def daily_request_cursor_key(daily_request):
+    return [daily_request.request_date, daily_request.id]
+
+def build_daily_requests_query(skip: int = 0, limit: int = 100, company_id: int = None, start_date=None, end_date=None, user_id: int = None, role: str = None, tenant_id: int = None, cursor: str = None):
+    query = select(DailyRequest)
     if company_id:
-        query = query.filter(DailyRequest.company_id == company_id)
+        query = query.where(DailyRequest.company_id == company_id)
     if start_date:
-        query = query.filter(DailyRequest.request_date >= start_date)
+        query = query.where(DailyRequest.request_date >= start_date)
     if end_date:
-        query = query.filter(DailyRequest.request_date <= end_date)
+        query = query.where(DailyRequest.request_date <= end_date)
     if tenant_id:
-        query = query.filter(DailyRequest.tenant_id == tenant_id)
+        query = query.where(DailyRequest.tenant_id == tenant_id)
     
     if role == "contratado" and user_id:
-        query = query.join(WorkShift, WorkShift.request_id == DailyRequest.id)\
-                     .join(ShiftAssignment, ShiftAssignment.shift_id == WorkShift.id)\
-                     .filter(ShiftAssignment.employee_id == user_id)\
+        query = query.join(WorkShift, and_(WorkShift.request_id == DailyRequest.id, WorkShift.request_date == DailyRequest.request_date))\
+                     .join(ShiftAssignment, and_(ShiftAssignment.shift_id == WorkShift.id, ShiftAssignment.request_date == WorkShift.request_date))\
+                     .where(ShiftAssignment.employee_id == user_id)\
                      .distinct()
     
-    return query.order_by(desc(DailyRequest.request_date)).offset(skip).limit(limit).all()
+    # Con cursor (keyset) ignoramos skip: la página empieza después de la última fila vista
+    if cursor:
+        query = query.where(keyset_condition(DAILY_REQUESTS_ORDER, decode_cursor(cursor, DAILY_REQUESTS_ORDER)))
+    else:
+        query = query.offset(skip)
+    
+    return query.order_by(desc(DailyRequest.request_date), DailyRequest.id).limit(limit)
+
+def get_daily_requests(db: Session, skip: int = 0, limit: int = 100, company_id: int = None, start_date: str = None, end_date: str = None, user_id: int = None, role: str = None, tenant_id: int = None, cursor: str = None):
+    query = build_daily_requests_query(skip, limit, company_id, start_date, end_date, user_id, role, tenant_id, cursor)
+    # Turnos, asignaciones y empleados de toda la página en una consulta por nivel (sin N+1)
+    return db.scalars(query.options(*daily_request_load_options())).all()
+
+def build_daily_requests_summary_query(skip: int = 0, limit: int = 100, company_id: int = None, start_date=None, end_date=None, user_id: int = None, role: str = None, tenant_id: int = None, cursor: str = None):
+    """
+    Misma página que build_daily_requests_query, con conteos por solicitud en vez
+    del grafo de objetos: turnos, vacantes totales, vacantes cubiertas y presentes.
+    """
+    page = build_daily_requests_query(skip, limit, company_id, start_date, end_date, user_id, role, tenant_id, cursor).cte("page")
+
+    # Subconsultas correlacionadas por solicitud de la página: con (id, fecha)
+    # cada una entra por índice solo a la partición de esa fecha (un JOIN contra
+    # la página terminaba recorriendo todas las particiones de turnos)
+    own_shifts = and_(WorkShift.request_id == page.c.id, WorkShift.request_date == page.c.request_date)
+
+    def per_request(column, *conditions):
+        return select(column).where(own_shifts, *conditions).correlate(page).scalar_subquery()
+
+    def per_assignment(*conditions):
+        # Anidada por turno: (shift_id, fecha) siempre entra por el índice de shift_id
+        per_shift = select(func.count(ShiftAssignment.id))\
+            .where(ShiftAssignment.shift_id == WorkShift.id, ShiftAssignment.request_date == WorkShift.request_date, *conditions)\
+            .correlate(WorkShift).scalar_subquery()
+        return per_request(func.coalesce(func.sum(per_shift), 0))
+
+    return select(
+        page.c.id,
+        page.c.company_id,
+        page.c.request_date,
+        page.c.status_id,
+        DailyRequestStatus.code.label("status"),
+        per_request(func.count(WorkShift.id)).label("shift_count"),
+        per_request(func.coalesce(func.sum(WorkShift.quantity), 0)).label("total_slots"),
+        per_assignment().label("filled_slots"),
+        per_assignment(ShiftAssignment.status == report_engine.ASSIGNMENT_PRESENT).label("present_count")
+    ).select_from(page)\
+     .join(DailyRequestStatus, DailyRequestStatus.id == page.c.status_id)\
+     .order_by(desc(page.c.request_date), page.c.id)
+
+def get_daily_requests_summary(db: Session, skip: int = 0, limit: int = 100, company_id: int = None, start_date: str = None, end_date: str = None, user_id: int = None, role: str = None, tenant_id: int = None, cursor: str = None):
+    query = build_daily_requests_summary_query(skip, limit, company_id, start_date, end_date, user_id, role, tenant_id, cursor)
+    return db.execute(query).all()
+
+# Espacio de los advisory locks de creación de solicitudes (el segundo entero es la empresa)
+COMPANY_REQUESTS_LOCK = 7301
+
+def lock_company_requests(db: Session, company_id: int):
+    """
+    Serializa hasta el commit la creación de solicitudes de una empresa, así la
+    generación por plantillas no crea un día que otra transacción está creando.
+    """
+    db.execute(select(func.pg_advisory_xact_lock(COMPANY_REQUESTS_LOCK, company_id)))
 
 def create_daily_request(db: Session, request: DailyRequestCreate, user_id: int, tenant_id: int = None):
+    """Retorna "COMPANY_NOT_FOUND" si la empresa no existe en el tenant."""
+    company_query = select(Company.id, Company.tenant_id).where(Company.id == request.company_id)
+    if tenant_id:
+        company_query = company_query.where(Company.tenant_id == tenant_id)
+    company = db.execute(company_query).first()
+    if company is None:
+        return "COMPANY_NOT_FOUND"
+
+    lock_company_requests(db, request.company_id)
+    # La fecha puede caer en un mes sin partición todavía (ej: carga de meses pasados)
+    partitions.ensure_for_date(db, request.request_date)
     db_request = DailyRequest(
         company_id=request.company_id,
         request_date=request.request_date,
         status_id=1,
-        tenant_id=tenant_id,
+        tenant_id=company.tenant_id,  # El de la empresa, no el de quien crea
         created_by=user_id,
         updated_by=user_id
     )
@@ -240,13 +361,14 @@ def create_daily_request(db: Session, request: DailyRequestCreate, user_id: int,
         final_discount = shift.discount_percentage if shift.has_discount else 0.0
         db_shift = WorkShift(
             request_id=db_request.id,
+            request_date=db_request.request_date,
             start_time=shift.start_time,
             end_time=shift.end_time,
             payment_amount=shift.payment_amount,
             quantity=shift.quantity,
             has_discount=shift.has_discount,
             discount_percentage=final_discount,
-            tenant_id=tenant_id,
+            tenant_id=company.tenant_id,
             created_by=user_id,
             updated_by=user_id
         )
@@ -254,61 +376,121 @@ def create_daily_request(db: Session, request: DailyRequestCreate, user_id: int,
 
     db.commit()
     db.refresh(db_request)
+    report_cache.bump_version(company.tenant_id)
     return db_request
 
 # --- LÓGICA DE ASIGNACIÓN MEJORADA ---
 
-def create_assignment(db: Session, assignment: ShiftAssignmentCreate, user_id: int, tenant_id: int = None):
-    # 1. Obtener el turno para ver el límite (quantity)
-    shift = db.query(WorkShift).filter(WorkShift.id == assignment.shift_id).first()
-    if not shift:
+def create_assignments_bulk(db: Session, shift_id: int, employee_ids: list[int], user_id: int, tenant_id: int = None):
+    """
+    Asigna varios empleados a un turno en una sola transacción, sin carreras:
+    la fila del turno se bloquea (SELECT ... FOR UPDATE) hasta el commit, así dos
+    coordinadores asignando a la vez no pueden pasar del cupo (quantity).
+
+    Retorna "NOT_FOUND" si el turno no existe, o un dict con el resultado por empleado:
+    CREATED, EXISTS (ya estaba), FULL (sin cupo), DUPLICATE (repetido en la lista)
+    o EMPLOYEE_NOT_FOUND.
+    """
+    # 1. Bloquear el turno (y validar que pertenece al tenant); la solicitud trae
+    #    los datos que se copian a cada asignación
+    shift_query = select(WorkShift, DailyRequest.company_id, DailyRequest.status_id, DailyRequest.tenant_id)\
+        .join(DailyRequest, and_(DailyRequest.id == WorkShift.request_id, DailyRequest.request_date == WorkShift.request_date))\
+        .where(WorkShift.id == shift_id)
+    if tenant_id:
+        shift_query = shift_query.where(DailyRequest.tenant_id == tenant_id)
+    row = db.execute(shift_query.with_for_update(of=WorkShift)).first()
+    if not row:
+        db.rollback()
         return "NOT_FOUND"
-    
-    # Verificar que el turno pertenece al tenant del usuario
+    shift = row.WorkShift
+
+    requested_ids = list(dict.fromkeys(employee_ids))
+
+    # 2. Cupo ocupado y duplicados en una sola consulta
+    current_count, already_assigned = db.execute(
+        select(
+            func.count(ShiftAssignment.id),
+            func.array_agg(ShiftAssignment.employee_id).filter(ShiftAssignment.employee_id.in_(requested_ids))
+        ).where(ShiftAssignment.shift_id == shift_id, ShiftAssignment.request_date == shift.request_date)
+    ).one()
+    already_assigned = set(already_assigned or [])
+
+    # Los empleados deben existir (y ser del mismo tenant)
+    employees_query = select(User.id).where(User.id.in_(requested_ids))
     if tenant_id:
-        daily_request = db.query(DailyRequest).filter(
-            DailyRequest.id == shift.request_id,
-            DailyRequest.tenant_id == tenant_id
-        ).first()
-        if not daily_request:
-            return "NOT_FOUND"
-
-    # 2. Contar cuántos ya están asignados
-    current_count = db.query(ShiftAssignment).filter(
-        ShiftAssignment.shift_id == assignment.shift_id
-    ).count()
-
-    # 3. Validar si está lleno
-    if current_count >= shift.quantity:
-        return "FULL"
-
-    # 4. Verificar si el empleado ya está en este turno
-    exists = db.query(ShiftAssignment).filter(
-        ShiftAssignment.shift_id == assignment.shift_id,
-        ShiftAssignment.employee_id == assignment.employee_id
-    ).first()
-    
-    if exists:
-        return "EXISTS"
-
-    # 5. Crear asignación
-    db_assignment = ShiftAssignment(
-        shift_id=assignment.shift_id,
-        employee_id=assignment.employee_id,
-        status="ASIGNADO",
-        tenant_id=tenant_id,
-        created_by=user_id,
-        updated_by=user_id
-    )
-    db.add(db_assignment)
+        employees_query = employees_query.where(User.tenant_id == tenant_id)
+    valid_employees = set(db.scalars(employees_query).all())
+
+    # 3. Decidir por empleado, respetando el orden de la lista
+    free_slots = shift.quantity - current_count
+    results = []
+    to_create = []
+    seen = set()
+    for employee_id in employee_ids:
+        if employee_id in seen:
+            status = "DUPLICATE"
+        elif employee_id not in valid_employees:
+            status = "EMPLOYEE_NOT_FOUND"
+        elif employee_id in already_assigned:
+            status = "EXISTS"
+        elif len(to_create) >= free_slots:
+            status = "FULL"
+        else:
+            status = "CREATED"
+            to_create.append(employee_id)
+        seen.add(employee_id)
+        results.append({"employee_id": employee_id, "status": status, "assignment_id": None})
+
+    # 4. Insertar todas las asignaciones en un INSERT multi-fila
+    if to_create:
+        final_amount = report_engine.discounted_amount(shift)
+        created_rows = db.execute(
+            insert(ShiftAssignment).returning(ShiftAssignment.id, ShiftAssignment.employee_id),
+            [
+                {
+                    "shift_id": shift_id,
+                    "request_date": shift.request_date,
+                    "employee_id": employee_id,
+                    "status": "ASIGNADO",
+                    "tenant_id": row.tenant_id if row.tenant_id is not None else tenant_id,
+                    "company_id": row.company_id,
+                    "request_status_id": row.status_id,
+                    "payment_amount": shift.payment_amount,
+                    "final_amount": final_amount,
+                    "created_by": user_id,
+                    "updated_by": user_id,
+                }
+                for employee_id in to_create
+            ]
+        ).all()
+        created_ids = {row.employee_id: row.id for row in created_rows}
+        for item in results:
+            if item["status"] == "CREATED":
+                item["assignment_id"] = created_ids[item["employee_id"]]
+
+        # Resumen diario de reportes, en la misma transacción
+        report_rollup.refresh_for_shift(db, shift_id)
+
+    # El commit libera el bloqueo del turno
     db.commit()
-    
-    # 6. Recargar para traer los datos del empleado
-    db.refresh(db_assignment) 
-    return db_assignment
+    if to_create:
+        # El tenant de la solicitud, no el de quien asigna (puede no tener)
+        report_cache.bump_version(row.tenant_id)
+    return {"shift_id": shift_id, "request_date": shift.request_date, "created": len(to_create), "results": results}
 
-    args = [assignment.shift_id, assignment.employee_id, "ASIGNADO", user_id, user_id]
-    # ... (código anterior) ... esto no es lo que quiero reemplazar, voy a appendear al final
+def create_assignment(db: Session, assignment: ShiftAssignmentCreate, user_id: int, tenant_id: int = None):
+    # Usa el mismo camino sin carreras que la asignación masiva
+    result = create_assignments_bulk(db, assignment.shift_id, [assignment.employee_id], user_id, tenant_id)
+    if result == "NOT_FOUND":
+        return "NOT_FOUND"
+
+    item = result["results"][0]
+    if item["status"] != "CREATED":
+        # FULL, EXISTS o EMPLOYEE_NOT_FOUND
+        return item["status"]
+
+    # Recargar para traer los datos del empleado (la llave incluye la fecha de partición)
+    return db.get(ShiftAssignment, (item["assignment_id"], result["request_date"]))
 
 def delete_assignment(db: Session, assignment_id: int, tenant_id: int = None):
     query = db.query(ShiftAssignment).filter(ShiftAssignment.id == assignment_id)
@@ -316,8 +498,11 @@ def delete_assignment(db: Session, assignment_id: int, tenant_id: int = None):
         query = query.filter(ShiftAssignment.tenant_id == tenant_id)
     db_assign = query.first()
     if db_assign:
+        shift_id, assignment_tenant_id = db_assign.shift_id, db_assign.tenant_id
         db.delete(db_assign)
+        report_rollup.refresh_for_shift(db, shift_id)
         db.commit()
+        report_cache.bump_version(assignment_tenant_id)
         return True
     return False
 
@@ -329,7 +514,10 @@ def update_assignment_status(db: Session, assignment_id: int, status: str, user_
     if db_assign:
         db_assign.status = status
         db_assign.updated_by = user_id
+        assignment_tenant_id = db_assign.tenant_id
+        report_rollup.refresh_for_shift(db, db_assign.shift_id)
         db.commit()
+        report_cache.bump_version(assignment_tenant_id)
         db.refresh(db_assign)
     return db_assign
 
@@ -346,18 +534,29 @@ def update_daily_request_status(db: Session, request_id: int, status_id: int, us
         db_request.status_id = status_id
         db_request.updated_by = user_id
         
+        shifts_subquery = db.query(WorkShift.id).filter(
+            WorkShift.request_id == request_id, WorkShift.request_date == db_request.request_date
+        ).subquery()
+        request_assignments = db.query(ShiftAssignment).filter(
+            ShiftAssignment.shift_id.in_(shifts_subquery),
+            ShiftAssignment.request_date == db_request.request_date
+        )
+        # Copia del estado en las asignaciones (los reportes excluyen las canceladas con ella)
+        request_assignments.update({"request_status_id": status_id}, synchronize_session=False)
+
         # 2 = CONFIRMADA
         if status_id == 2:
-            shifts_subquery = db.query(WorkShift.id).filter(WorkShift.request_id == request_id).subquery()
-            db.query(ShiftAssignment).filter(
-                ShiftAssignment.shift_id.in_(shifts_subquery),
-                ShiftAssignment.status == "ASIGNADO"
-            ).update(
+            request_assignments.filter(ShiftAssignment.status == "ASIGNADO").update(
                 {"status": "FALTOU", "updated_by": user_id},
                 synchronize_session=False
             )
+        
+        # El estado de la solicitud (ej: CANCELADA) y de sus asignaciones cambia los reportes
+        report_rollup.refresh_day(db, db_request.company_id, db_request.request_date)
+        request_tenant_id = db_request.tenant_id
             
         db.commit()
+        report_cache.bump_version(request_tenant_id)
         db.refresh(db_request)
     return db_request
 
@@ -367,7 +566,11 @@ def delete_daily_request(db: Session, request_id: int, tenant_id: int = None):
         query = query.filter(DailyRequest.tenant_id == tenant_id)
     db_request = query.first()
     if db_request:
+        company_id, request_date = db_request.company_id, db_request.request_date
+        request_tenant_id = db_request.tenant_id
         db.delete(db_request)
+        report_rollup.refresh_day(db, company_id, request_date)
         db.commit()
+        report_cache.bump_version(request_tenant_id)
         return True
     return False
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Plantillas de escala: la misma solicitud (empresa + turnos) en los días de la
+semana marcados. generate_requests() las materializa en un rango de fechas en
+una sola transacción: un INSERT multi-fila de solicitudes y otro de turnos,
+ambos con RETURNING, en vez de una solicitud (y un commit) por día.
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core import report_cache
+from app.core.config import settings
+from app.db import partitions, requests_crud
+from app.models.models import Company, DailyRequest, ScheduleTemplate, ScheduleTemplateShift, WorkShift
+from app.schemas.schedule_schemas import ScheduleTemplateCreate
+
+PENDING_STATUS_ID = 1
+
+
+def template_dates(weekday_mask: int, start_date: date, end_date: date) -> list[date]:
+    """Días entre start_date y end_date (inclusive) cuyo día de la semana está en la máscara."""
+    days = []
+    day = start_date
+    while day <= end_date:
+        if weekday_mask & (1 << day.weekday()):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def shift_times(day: date, start_time, end_time) -> tuple[datetime, datetime]:
+    """Inicio y fin del turno en `day`; si termina a la misma hora o antes, es al día siguiente."""
+    start = datetime.combine(day, start_time)
+    end = datetime.combine(day, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def get_template(db: Session, template_id: int, tenant_id: int = None):
+    query = select(ScheduleTemplate).options(selectinload(ScheduleTemplate.shifts))\
+        .where(ScheduleTemplate.id == template_id)
+    if tenant_id:
+        query = query.where(ScheduleTemplate.tenant_id == tenant_id)
+    return db.scalars(query).first()
+
+
+def get_templates(db: Session, tenant_id: int = None, company_id: int = None):
+    query = select(ScheduleTemplate).options(selectinload(ScheduleTemplate.shifts))
+    if tenant_id:
+        query = query.where(ScheduleTemplate.tenant_id == tenant_id)
+    if company_id:
+        query = query.where(ScheduleTemplate.company_id == company_id)
+    return db.scalars(query.order_by(ScheduleTemplate.name, ScheduleTemplate.id)).all()
+
+
+def create_template(db: Session, template: ScheduleTemplateCreate, user_id: int, tenant_id: int = None):
+    """Retorna "COMPANY_NOT_FOUND" si la empresa no existe en el tenant."""
+    company_query = select(Company.id, Company.tenant_id).where(Company.id == template.company_id)
+    if tenant_id:
+        company_query = company_query.where(Company.tenant_id == tenant_id)
+    company = db.execute(company_query).first()
+    if company is None:
+        return "COMPANY_NOT_FOUND"
+
+    db_template = ScheduleTemplate(
+        name=template.name,
+        company_id=template.company_id,
+        weekday_mask=template.weekday_mask,
+        start_date=template.start_date,
+        end_date=template.end_date,
+        tenant_id=company.tenant_id,  # El de la empresa (como sus solicitudes)
+        created_by=user_id,
+        updated_by=user_id,
+        shifts=[
+            ScheduleTemplateShift(
+                start_time=shift.start_time,
+                end_time=shift.end_time,
+                payment_amount=shift.payment_amount,
+                quantity=shift.quantity,
+                has_discount=shift.has_discount,
+                discount_percentage=shift.discount_percentage if shift.has_discount else 0.0,
+            )
+            for shift in template.shifts
+        ],
+    )
+    db.add(db_template)
+    db.commit()
+    db.refresh(db_template)
+    return db_template
+
+
+def delete_template(db: Session, template_id: int, tenant_id: int = None) -> bool:
+    db_template = get_template(db, template_id, tenant_id)
+    if not db_template:
+        return False
+    db.delete(db_template)
+    db.commit()
+    return True
+
+
+def generate_requests(db: Session, template_id: int, user_id: int, tenant_id: int = None,
+                      start_date: date = None, end_date: date = None):
+    """
+    Crea las solicitudes (PENDENTE) y turnos de la plantilla entre start_date y
+    end_date (por defecto y como máximo, el rango de la plantilla). Los días en
+    que la empresa ya tiene una solicitud (en cualquier estado) se saltan, así
+    que volver a generar el mismo rango no duplica nada.
+
+    Lo generado es del tenant de la plantilla, no del de quien genera.
+
+    Retorna "NOT_FOUND" o {"template_id", "created", "created_requests", "skipped_dates"}.
+    Lanza ValueError si el rango supera SCHEDULE_GENERATE_MAX_DAYS.
+    """
+    # Bloquea la plantilla: no se puede borrar mientras se generan sus días
+    query = select(ScheduleTemplate).options(selectinload(ScheduleTemplate.shifts))\
+        .where(ScheduleTemplate.id == template_id)
+    if tenant_id:
+        query = query.where(ScheduleTemplate.tenant_id == tenant_id)
+    template = db.scalars(query.with_for_update(of=ScheduleTemplate)).first()
+    if not template:
+        db.rollback()
+        return "NOT_FOUND"
+
+    start_date = max(start_date or template.start_date, template.start_date)
+    end_date = min(end_date or template.end_date, template.end_date)
+    if (end_date - start_date).days + 1 > settings.SCHEDULE_GENERATE_MAX_DAYS:
+        db.rollback()
+        raise ValueError(f"O intervalo não pode passar de {settings.SCHEDULE_GENERATE_MAX_DAYS} dias")
+
+    result = {"template_id": template.id, "created": 0, "created_requests": [], "skipped_dates": []}
+    candidates = template_dates(template.weekday_mask, start_date, end_date)
+    if not candidates:
+        db.rollback()
+        return result
+
+    # El lock de la plantilla no alcanza: otras plantillas de la empresa o una
+    # solicitud creada a mano podrían ver el mismo día libre a la vez
+    requests_crud.lock_company_requests(db, template.company_id)
+    existing = set(db.scalars(
+        select(DailyRequest.request_date).distinct().where(
+            DailyRequest.company_id == template.company_id,
+            DailyRequest.request_date >= candidates[0],
+            DailyRequest.request_date <= candidates[-1],
+        )
+    ).all())
+    days = [day for day in candidates if day not in existing]
+    result["skipped_dates"] = [day for day in candidates if day in existing]
+    if not days:
+        db.rollback()
+        return result
+
+    partitions.ensure_partitions(db, days[0], days[-1])
+
+    # 1. Solicitudes: un INSERT multi-fila; RETURNING en el orden de los parámetros
+    request_rows = db.execute(
+        insert(DailyRequest).returning(DailyRequest.id, DailyRequest.request_date, sort_by_parameter_order=True),
+        [
+            {
+                "company_id": template.company_id,
+                "request_date": day,
+                "status_id": PENDING_STATUS_ID,
+                "tenant_id": template.tenant_id,
+                "created_by": user_id,
+                "updated_by": user_id,
+            }
+            for day in days
+        ]
+    ).all()
+
+    # 2. Turnos de todas las solicitudes, también en un solo INSERT
+    shift_params = []
+    for request in request_rows:
+        for shift in template.shifts:
+            start_time, end_time = shift_times(request.request_date, shift.start_time, shift.end_time)
+            shift_params.append({
+                "request_id": request.id,
+                "request_date": request.request_date,
+                "start_time": start_time,
+                "end_time": end_time,
+                "payment_amount": shift.payment_amount,
+                "quantity": shift.quantity,
+                "has_discount": shift.has_discount,
+                "discount_percentage": shift.discount_percentage if shift.has_discount else 0.0,
+                "tenant_id": template.tenant_id,
+                "created_by": user_id,
+                "updated_by": user_id,
+            })
+    shift_ids = {request.id: [] for request in request_rows}
+    if shift_params:
+        shift_rows = db.execute(
+            insert(WorkShift).returning(WorkShift.id, WorkShift.request_id, sort_by_parameter_order=True),
+            shift_params
+        ).all()
+        for row in shift_rows:
+            shift_ids[row.request_id].append(row.id)
+
+    db.commit()
+    report_cache.bump_version(template.tenant_id)
+
+    result["created"] = len(request_rows)
+    result["created_requests"] = [
+        {"request_id": request.id, "request_date": request.request_date, "shift_ids": shift_ids[request.id]}
+        for request in request_rows
+    ]
+    return result
@@ -0,0 +1,293 @@
+"""
+Registro de consultas lentas (opcional, settings.SLOW_QUERY_ENABLED).
+
+Cada sentencia que tarda más de SLOW_QUERY_THRESHOLD_MS se anota con su SQL
+normalizado (sin valores), la forma de sus parámetros (nombre -> tipo, nunca
+el valor: pueden ser datos personales), la ruta y el tenant de la petición que
+la originó. Se agrupan por huella del SQL normalizado para listar las que más
+tiempo acumulan (GET /admin/slow-queries, de este proceso).
+
+Un hilo aparte captura el plan en otra conexión: EXPLAIN (ANALYZE, BUFFERS)
+para los SELECT (vuelve a ejecutarlos, con statement_timeout y dentro de una
+transacción que se revierte) y EXPLAIN simple para el resto, que no se ejecuta.
+Como mucho un plan por huella cada SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS y
+SLOW_QUERY_EXPLAIN_PER_MINUTE en total; si la cola está llena se descarta.
+
+Las entradas (con su plan, cuando lo hay) se escriben como una línea JSON en
+SLOW_QUERY_LOG_FILE, que rota por tamaño.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event, text
+
+from app.core import metrics
+from app.core.config import settings
+
+# Opción de ejecución para que las consultas del propio registro (los EXPLAIN) no se registren
+SKIP_OPTION = "skip_slow_query_log"
+
+# Huellas distintas que se guardan en memoria; al superarlo se descarta la de menor tiempo total
+MAX_FINGERPRINTS = 500
+EXPLAIN_QUEUE_SIZE = 100
+
+logger = logging.getLogger("app.slow_queries")
+logger.propagate = False
+
+_lock = threading.Lock()
+_entries: dict[str, dict] = {}
+_explain_queue: queue.Queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+_worker: threading.Thread | None = None
+_last_explain: dict[str, float] = {}
+_recent_explains: list[float] = []
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+# IN (?, ?, ?) -> IN (?...): listas de distinto largo son la misma consulta
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+_DOLLAR_PARAM = re.compile(r"\$(\d+)")
+_DML = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+# SELECT que bloquean filas o tienen efectos: EXPLAIN ANALYZE los volvería a
+# ejecutar en otra conexión (y esperaría los locks que aún tiene la original)
+_LOCKING = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+_SIDE_EFFECT_FUNCTIONS = re.compile(
+    r"\b(?:nextval|setval|pg_advisory\w*|pg_try_advisory\w*|pg_notify|set_config|pg_sleep\w*"
+    r"|pg_cancel_backend|pg_terminate_backend|lo_\w+|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(statement: str) -> str:
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _PLACEHOLDER_LIST.sub("?...", sql)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _shape(value):
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters, executemany: bool = False):
+    """Tipos (y largos de las listas) de los parámetros, sin sus valores."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shapes(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: _shape(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return None
+
+
+def _is_select(normalized: str) -> bool:
+    """Solo lectura y sin locks: se puede explicar con ANALYZE."""
+    if _LOCKING.search(normalized) or _SIDE_EFFECT_FUNCTIONS.search(normalized):
+        return False
+    head = normalized.lstrip("( ").upper()
+    return head.startswith("SELECT") or (head.startswith("WITH") and not _DML.search(normalized))
+
+
+def _to_pyformat(statement: str, parameters):
+    """
+    Pasa una sentencia de asyncpg ($1, $2...) al formato de psycopg para
+    explicarla con el motor síncrono de la misma base.
+    """
+    statement = _DOLLAR_PARAM.sub(lambda m: f"%(p{m.group(1)})s", statement.replace("%", "%%"))
+    return statement, {f"p{i}": value for i, value in enumerate(parameters or (), start=1)}
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    directory = os.path.dirname(settings.SLOW_QUERY_LOG_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = RotatingFileHandler(
+        settings.SLOW_QUERY_LOG_FILE,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+        encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def _write(entry: dict):
+    try:
+        logger.info(json.dumps(entry, default=str, ensure_ascii=False))
+    except Exception:
+        # Un disco lleno no debe tumbar la petición que hizo la consulta
+        pass
+
+
+def _record(fp: str, normalized: str, elapsed_ms: float, route: str, tenant_id):
+    with _lock:
+        entry = _entries.get(fp)
+        if entry is None:
+            if len(_entries) >= MAX_FINGERPRINTS:
+                del _entries[min(_entries, key=lambda key: _entries[key]["total_ms"])]
+            entry = _entries[fp] = {
+                "fingerprint": fp, "sql": normalized, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "routes": {}, "tenants": {}, "last_seen": None, "plan": None,
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["routes"][route] = entry["routes"].get(route, 0) + 1
+        tenant = str(tenant_id) if tenant_id is not None else "-"
+        entry["tenants"][tenant] = entry["tenants"].get(tenant, 0) + 1
+        entry["last_seen"] = datetime.now(timezone.utc).isoformat()
+
+
+def _should_explain(fp: str) -> bool:
+    """Límite por huella y global (ventana de un minuto)."""
+    now = time.monotonic()
+    with _lock:
+        if now - _last_explain.get(fp, float("-inf")) < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return False
+        _recent_explains[:] = [t for t in _recent_explains if now - t < 60]
+        if len(_recent_explains) >= settings.SLOW_QUERY_EXPLAIN_PER_MINUTE:
+            return False
+        _last_explain[fp] = now
+        _recent_explains.append(now)
+        return True
+
+
+def explain(engine, statement: str, parameters, analyze: bool) -> str:
+    """Plan de la sentencia en una conexión nueva del motor (siempre se revierte)."""
+    options = "(ANALYZE, BUFFERS)" if analyze else ""
+    with engine.connect().execution_options(**{SKIP_OPTION: True}) as connection:
+        with connection.begin() as transaction:
+            connection.execute(text(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"))
+            # Siempre con parámetros (aunque vacíos): psycopg solo desescapa "%%" si los hay
+            rows = connection.exec_driver_sql(f"EXPLAIN {options} {statement}", parameters or {}).all()
+            transaction.rollback()
+    return "\n".join(row[0] for row in rows)
+
+
+def _explain_loop():
+    while True:
+        log_entry, engine, statement, parameters = _explain_queue.get()
+        try:
+            plan = explain(engine, statement, parameters, analyze=_is_select(log_entry["sql"]))
+        except Exception as exc:
+            plan = None
+            log_entry["explain_error"] = f"{type(exc).__name__}: {exc}"[:500]
+        log_entry["plan"] = plan
+        if plan:
+            with _lock:
+                entry = _entries.get(log_entry["fingerprint"])
+                if entry is not None:
+                    entry["plan"] = plan
+        _write(log_entry)
+
+
+def _ensure_worker():
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_explain_loop, name="slow-query-explain", daemon=True)
+            _worker.start()
+
+
+def install(engine, name: str, explain_engine=None):
+    """
+    Engancha el registro al motor (sync; para async pasar engine.sync_engine y
+    en explain_engine el motor síncrono de la misma base, donde se corre el EXPLAIN).
+    """
+    numeric = engine.dialect.paramstyle == "numeric_dollar"
+    explain_engine = explain_engine or engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_started"].pop()) * 1000
+        if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS or not settings.SLOW_QUERY_ENABLED:
+            return
+        if context is not None and context.execution_options.get(SKIP_OPTION):
+            return
+        on_slow_query(explain_engine, name, statement, parameters, executemany, elapsed_ms, numeric)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("slow_query_started") if conn is not None else None
+        if started:
+            started.pop()
+
+    return engine
+
+
+def on_slow_query(explain_engine, engine_name: str, statement: str, parameters, executemany: bool,
+                  elapsed_ms: float, numeric: bool = False):
+    request = metrics.current_request()
+    route = request.route if request is not None else "-"
+    tenant_id = request.tenant_id if request is not None else None
+    normalized = normalize_sql(statement)
+    fp = fingerprint(normalized)
+    _record(fp, normalized, elapsed_ms, route, tenant_id)
+
+    log_entry = {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "fingerprint": fp,
+        "engine": engine_name,
+        "duration_ms": round(elapsed_ms, 3),
+        "route": route,
+        "tenant_id": tenant_id,
+        "sql": normalized,
+        "params": parameter_shapes(parameters, executemany),
+        "plan": None,
+    }
+    _configure_logger()
+    # executemany no se puede explicar como una sola sentencia
+    if not executemany and _should_explain(fp):
+        if numeric:
+            statement, parameters = _to_pyformat(statement, parameters)
+        try:
+            _explain_queue.put_nowait((log_entry, explain_engine, statement, parameters))
+            _ensure_worker()
+            return
+        except queue.Full:
+            log_entry["explain_error"] = "cola llena"
+    _write(log_entry)
+
+
+def get_top(limit: int = 20) -> list[dict]:
+    """Huellas con más tiempo acumulado (de este proceso)."""
+    with _lock:
+        entries = sorted(_entries.values(), key=lambda entry: entry["total_ms"], reverse=True)[:limit]
+        return [
+            {**entry, "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3),
+             "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+             "routes": dict(entry["routes"]), "tenants": dict(entry["tenants"])}
+            for entry in entries
+        ]
+
+
+def reset() -> None:
+    with _lock:
+        _entries.clear()
+        _last_explain.clear()
+        _recent_explains.clear()
@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from app.models.models import User
 from app.schemas.schemas import UserCreate, UserUpdate
 from app.core.security import get_password_hash
+from app.core.pagination import decode_cursor, keyset_condition
 from enum import Enum
 
 def get_user_by_email(db: Session, email: str, tenant_id: int = None):
@@ -26,22 +27,38 @@ def get_user_by_code(db: Session, code: str, tenant_id: int = None):
         query = query.filter(User.tenant_id == tenant_id)
     return query.first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100, tenant_id: int = None):
+# Orden del listado de usuarios: (columna, descendente). También es la llave del cursor.
+USERS_ORDER = [(User.is_active, True), (User.first_name, False), (User.last_name, False), (User.id, False)]
+
+def user_cursor_key(user):
+    return [user.is_active, user.first_name, user.last_name, user.id]
+
+def build_users_query(skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
     """
-    Obtiene lista de usuarios con orden específico:
+    Lista de usuarios con orden específico:
     1. is_active = true (primero)
     2. first_name asc
     3. last_name asc
+    4. id (desempate estable para el cursor)
     Filtra por tenant_id si se proporciona.
     """
-    query = db.query(User)
+    query = select(User)
     if tenant_id:
-        query = query.filter(User.tenant_id == tenant_id)
+        query = query.where(User.tenant_id == tenant_id)
+    if cursor:
+        query = query.where(keyset_condition(USERS_ORDER, decode_cursor(cursor, USERS_ORDER)))
+    else:
+        query = query.offset(skip)
     return query.order_by(
         desc(User.is_active),
         User.first_name.asc(),
-        User.last_name.asc()
-    ).offset(skip).limit(limit).all()
+        User.last_name.asc(),
+        User.id.asc()
+    ).limit(limit)
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, tenant_id: int = None, cursor: str = None):
+    """Obtiene la lista de usuarios (ver build_users_query)"""
+    return db.scalars(build_users_query(skip, limit, tenant_id, cursor)).all()
 
 def create_user(db: Session, user: UserCreate, tenant_id: int = None):
     """Crea un nuevo usuario en la BD"""
@@ -1,10 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import jwt
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, ReplicaSessionLocal
+from app.db.async_database import get_async_db, AsyncSessionLocal, AsyncReplicaSessionLocal
+from app.db import replica_routing
 from app.core.config import settings
-from app.db import usersCrud
+from app.core import metrics
+from app.db import usersCrud, async_usersCrud
 from app.schemas.schemas import UserResponse # Para tipado
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -16,30 +20,68 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _get_token_subject(token: str) -> str:
+    """Decodifica el JWT y devuelve el email (sub)"""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except jwt.InvalidTokenError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return email
 
-    user = usersCrud.get_user_by_email(db, email=email)
+def _ensure_active_user(user):
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
         
     # Validamos también que el usuario esté activo
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Usuário inativo")
-        
+
+    # Para atribuir las consultas lentas al tenant (ver app/db/slow_queries.py)
+    metrics.set_request_tenant(user.tenant_id)
     return user
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    email = _get_token_subject(token)
+    user = usersCrud.get_user_by_email(db, email=email)
+    return _ensure_active_user(user)
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Igual que get_current_user, para endpoints "async def" (no ocupa un hilo del threadpool)"""
+    email = _get_token_subject(token)
+    user = await async_usersCrud.get_user_by_email(db, email=email)
+    return _ensure_active_user(user)
+
+# --- LECTURAS EN LA RÉPLICA ---
+# Para endpoints de solo lectura (listados y reportes). Si el usuario escribió
+# hace menos de REPLICA_STALENESS_SECONDS, se le atiende desde el primario.
+
+def get_read_db(current_user: UserResponse = Depends(get_current_user)):
+    session_factory = SessionLocal if replica_routing.use_primary_for(current_user.email) else ReplicaSessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_session_factory(current_user: UserResponse = Depends(get_current_user_async)):
+    """Fábrica de sesiones de lectura (réplica, o primaria si el usuario escribió hace poco)"""
+    use_primary = await replica_routing.use_primary_for_async(current_user.email)
+    return AsyncSessionLocal if use_primary else AsyncReplicaSessionLocal
+
+async def get_async_read_db(session_factory = Depends(get_async_read_session_factory)):
+    async with session_factory() as db:
+        yield db
+
 # --- NUEVA LÓGICA DE ROLES ---
 
 class RoleChecker:
@@ -1,7 +1,16 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import FastAPI, Request, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, users, companies, requests 
+from app.routers import auth, users, companies, requests, admin, schedule_templates
+from app.core.hashing_pool import HashingBusyError
+from app.db import replica_routing
+from app.core.serialization import TrustedJSONResponse
+from app.core import metrics
+from app.core.config import settings
 
+# Sin default_response_class: con una clase propia FastAPI deja de serializar los
+# response_model directo a JSON con Pydantic (más lento). Los endpoints calientes
+# que devuelven datos propios usan TrustedJSONResponse (orjson, sin revalidar).
 app = FastAPI(title="Backend Profesional")
 
 # --- CONFIGURACIÓN CORS (Vital para que React se conecte) ---
@@ -19,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,     # Permitir cookies/headers de autenticación
     allow_methods=["*"],        # Permitir todos los métodos (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],        # Permitir todos los headers (Authorization, Content-Type, etc.)
+    expose_headers=["X-Next-Cursor"], # El navegador puede leer el cursor de la página siguiente
 )
 
 # Incluimos los routers
@@ -26,6 +36,39 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(companies.router)
 app.include_router(requests.router)
+app.include_router(admin.router)
+app.include_router(schedule_templates.router)
+
+# Marca las escrituras exitosas para que ese usuario lea del primario unos segundos
+@app.middleware("http")
+async def track_recent_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in replica_routing.WRITE_METHODS and response.status_code < 400:
+        subject = replica_routing.subject_from_authorization(request.headers.get("authorization"))
+        if subject:
+            await replica_routing.mark_recent_write(subject)
+    return response
+
+# Latencia, estado y consultas SQL por ruta. Se agrega al final para que quede
+# por fuera de los demás middlewares y mida también su tiempo
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Pool de hashing saturado: respondemos rápido en vez de encolar sin límite
+@app.exception_handler(HashingBusyError)
+def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    return TrustedJSONResponse(
+        status_code=503,
+        content={"detail": "Servidor ocupado. Tente novamente em alguns segundos."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics(authorization: str | None = Header(None)):
+    """Métricas en formato Prometheus (de todos los workers con PROMETHEUS_MULTIPROC_DIR)"""
+    if settings.METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    content, media_type = metrics.render()
+    return Response(content=content, media_type=media_type)
 
 @app.get("/")
 def read_root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, text, DateTime, ForeignKey, Date, Float, BigInteger, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, text, DateTime, ForeignKey, ForeignKeyConstraint, Date, Float, BigInteger, UniqueConstraint, Index, Time
 from sqlalchemy.orm import relationship 
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
@@ -93,13 +93,21 @@ class DailyRequestStatus(Base):
 
     requests = relationship("DailyRequest", back_populates="status_rel")
 
+# --- TABLAS PARTICIONADAS POR MES (ver app/db/partitions.py) ---
+# La llave primaria incluye request_date (Postgres lo exige en tablas
+# particionadas) y turnos/asignaciones la copian de su solicitud: las llaves
+# foráneas son compuestas (id, request_date). Las particiones no son modelos;
+# se crean con partitions.ensure_partitions().
+PARTITION_BY_MONTH = "RANGE (request_date)"
+
 class DailyRequest(Base):
     __tablename__ = "daily_requests"
-    __table_args__ = {"schema": "business", "extend_existing": True}
+    __table_args__ = {"schema": "business", "extend_existing": True, "postgresql_partition_by": PARTITION_BY_MONTH}
 
-    id = Column(Integer, primary_key=True, index=True)
+    # autoincrement explícito: con llave compuesta SQLAlchemy no lo asume
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     company_id = Column(Integer, ForeignKey('business.companies.id'), nullable=False)
-    request_date = Column(Date, nullable=False)
+    request_date = Column(Date, primary_key=True, nullable=False)
     
     # FK a daily_request_status
     status_id = Column(Integer, ForeignKey('business.daily_request_status.id'), nullable=False)
@@ -119,10 +127,18 @@ class DailyRequest(Base):
 
 class WorkShift(Base):
     __tablename__ = "work_shifts"
-    __table_args__ = {"schema": "business", "extend_existing": True}
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["request_id", "request_date"], ["business.daily_requests.id", "business.daily_requests.request_date"],
+            onupdate="CASCADE",
+        ),
+        {"schema": "business", "extend_existing": True, "postgresql_partition_by": PARTITION_BY_MONTH},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    request_id = Column(Integer, ForeignKey('business.daily_requests.id'), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    request_id = Column(Integer, nullable=False)
+    # Fecha de la solicitud (llave de partición)
+    request_date = Column(Date, primary_key=True, nullable=False)
     tenant_id = Column(BigInteger, ForeignKey('core.tenants.id'), nullable=True)
     
     start_time = Column(DateTime(timezone=False), nullable=False)
@@ -145,16 +161,34 @@ class WorkShift(Base):
 
 class ShiftAssignment(Base):
     __tablename__ = "shift_assignments"
-    __table_args__ = {"schema": "business", "extend_existing": True}
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["shift_id", "request_date"], ["business.work_shifts.id", "business.work_shifts.request_date"],
+            onupdate="CASCADE",
+        ),
+        {"schema": "business", "extend_existing": True, "postgresql_partition_by": PARTITION_BY_MONTH},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    shift_id = Column(Integer, ForeignKey('business.work_shifts.id'), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    shift_id = Column(Integer, nullable=False)
+    # Fecha de la solicitud del turno (llave de partición)
+    request_date = Column(Date, primary_key=True, nullable=False)
     tenant_id = Column(BigInteger, ForeignKey('core.tenants.id'), nullable=True)
     
     # Esta es la llave que nos interesa para la relación principal
     employee_id = Column(Integer, ForeignKey('auth.users.id'), nullable=False)
     
     status = Column(String(20), server_default='ASIGNADO', nullable=False)
+
+    # Hechos copiados de la solicitud y el turno para que los reportes lean solo
+    # esta tabla. Los llena requests_crud al insertar; los triggers de la
+    # migración 0005 los completan (escrituras por fuera de la aplicación) y los
+    # actualizan si cambian la solicitud o el turno
+    company_id = Column(Integer, ForeignKey('business.companies.id'), nullable=False)
+    request_status_id = Column(Integer, ForeignKey('business.daily_request_status.id'), nullable=False)
+    payment_amount = Column(Float, nullable=False)
+    # Monto del turno con el descuento aplicado
+    final_amount = Column(Float, nullable=False)
     
     # Estas llaves causaban la ambigüedad
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -165,4 +199,91 @@ class ShiftAssignment(Base):
     shift = relationship("WorkShift", back_populates="assignments")
     
     # ⚠️ CORRECCIÓN: Aquí también especificamos foreign_keys=[employee_id]
-    employee = relationship("User", back_populates="assignments", foreign_keys=[employee_id])
\ No newline at end of file
+    employee = relationship("User", back_populates="assignments", foreign_keys=[employee_id])
+
+class DailyAssignmentRollup(Base):
+    """
+    Resumen diario de asignaciones para los reportes (pagos y estadísticas de asistencia).
+    Una fila por (tenant, empresa, empleado, fecha, estado de la asignación), solo de
+    solicitudes no canceladas. Se mantiene en la misma transacción que las escrituras
+    de requests_crud (ver app/db/report_rollup.py).
+    """
+    __tablename__ = "daily_assignment_rollups"
+    __table_args__ = {"schema": "business", "extend_existing": True}
+
+    tenant_id = Column(BigInteger, primary_key=True, nullable=False, default=0)
+    company_id = Column(Integer, ForeignKey('business.companies.id'), primary_key=True)
+    employee_id = Column(Integer, ForeignKey('auth.users.id'), primary_key=True)
+    request_date = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+
+    assignment_count = Column(Integer, nullable=False, default=0)
+    gross_amount = Column(Float, nullable=False, default=0.0) # Suma de payment_amount
+    discounted_amount = Column(Float, nullable=False, default=0.0) # Suma con descuento aplicado
+
+class ScheduleTemplate(Base):
+    """
+    Escala recurrente de una empresa: los mismos turnos en los días de la semana
+    marcados, entre start_date y end_date. Se materializa en solicitudes con
+    schedule_templates_crud.generate_requests().
+    """
+    __tablename__ = "schedule_templates"
+    __table_args__ = {"schema": "business", "extend_existing": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey('business.companies.id'), nullable=False, index=True)
+    tenant_id = Column(BigInteger, ForeignKey('core.tenants.id'), nullable=True)
+    name = Column(String(100), nullable=False)
+
+    # Días de la semana: bit 0 = lunes ... bit 6 = domingo (como date.weekday()); 31 = lunes a viernes
+    weekday_mask = Column(Integer, nullable=False, server_default=text('31'))
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_by = Column(Integer, ForeignKey('auth.users.id'), nullable=False)
+    updated_by = Column(Integer, ForeignKey('auth.users.id'), nullable=True)
+
+    shifts = relationship("ScheduleTemplateShift", back_populates="template", cascade="all, delete-orphan",
+                          order_by="ScheduleTemplateShift.id")
+
+class ScheduleTemplateShift(Base):
+    """Turno de una plantilla (horas del día; si end_time <= start_time termina al día siguiente)."""
+    __tablename__ = "schedule_template_shifts"
+    __table_args__ = {"schema": "business", "extend_existing": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    template_id = Column(Integer, ForeignKey('business.schedule_templates.id', ondelete="CASCADE"), nullable=False, index=True)
+
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    payment_amount = Column(Float, nullable=False)
+    quantity = Column(Integer, default=1, nullable=False)
+    has_discount = Column(Boolean, default=False, nullable=False)
+    discount_percentage = Column(Float, default=0.0)
+
+    template = relationship("ScheduleTemplate", back_populates="shifts")
+
+# --- ÍNDICES PARA LA PAGINACIÓN POR CURSOR ---
+# Siguen exactamente el orden de cada listado (tenant + ORDER BY + id)
+Index("ix_daily_requests_tenant_date_id", DailyRequest.tenant_id, DailyRequest.request_date.desc(), DailyRequest.id)
+Index("ix_users_tenant_listing", User.tenant_id, User.is_active.desc(), User.first_name, User.last_name, User.id)
+Index("ix_companies_tenant_name_id", Company.tenant_id, Company.name, Company.id)
+
+# --- ÍNDICE DEL RESUMEN DIARIO (los reportes filtran por tenant y rango de fechas) ---
+Index("ix_daily_assignment_rollups_tenant_date", DailyAssignmentRollup.tenant_id, DailyAssignmentRollup.request_date)
+
+# --- ÍNDICE DE LOS HECHOS DE ASIGNACIÓN (reportes de pagos y asistencia sin joins) ---
+Index("ix_shift_assignments_tenant_date_status", ShiftAssignment.tenant_id, ShiftAssignment.request_date, ShiftAssignment.status)
+
+# --- ÍNDICES DE RENDIMIENTO (llaves foráneas y filtros frecuentes) ---
+# Postgres no indexa las llaves foráneas por sí solo: sin estos índices cada
+# join turno -> solicitud / asignación -> turno recorre la tabla completa.
+# daily_requests(tenant_id, request_date) ya lo cubre ix_daily_requests_tenant_date_id.
+Index("ix_tenants_uuid", Tenant.uuid, unique=True)
+Index("ix_daily_requests_company_date", DailyRequest.company_id, DailyRequest.request_date)
+Index("ix_work_shifts_request_id", WorkShift.request_id)
+Index("ix_shift_assignments_shift_id", ShiftAssignment.shift_id)
+Index("ix_shift_assignments_employee_id", ShiftAssignment.employee_id)
+Index("ix_shift_assignments_tenant_status", ShiftAssignment.tenant_id, ShiftAssignment.status)
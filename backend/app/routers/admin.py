@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from app.dependencies import allow_admin
+from app.core import hashing_pool, report_cache
+from app.db import pool_metrics, slow_queries
+from app.core.config import settings
+
+router = APIRouter(prefix="/admin", tags=["Administración"], dependencies=[Depends(allow_admin)])
+
+@router.get("/hashing-stats")
+def read_hashing_stats():
+    """Profundidad de cola y latencias del pool de hashing de contraseñas"""
+    return hashing_pool.get_stats()
+
+@router.get("/db-pool")
+def read_db_pool_stats():
+    """Estado y métricas de los pools de conexiones a Postgres (de este proceso)"""
+    return pool_metrics.get_pool_stats()
+
+@router.get("/report-cache")
+def read_report_cache_stats():
+    """Aciertos, fallos y tamaño máximo de la caché de reportes (de este proceso)"""
+    return report_cache.get_stats()
+
+@router.get("/slow-queries")
+def read_slow_queries(limit: int = Query(20, ge=1, le=200)):
+    """Consultas lentas con más tiempo acumulado, con su último plan (de este proceso)"""
+    return {
+        "enabled": settings.SLOW_QUERY_ENABLED,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "queries": slow_queries.get_top(limit),
+    }
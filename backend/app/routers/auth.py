@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from app.schemas.schemas import UserCreate, PublicUserCreate, UserResponse, Token
+from app.schemas.schemas import UserCreate, PublicUserCreate, UserResponse, Token, RefreshTokenRequest
 from app.db import usersCrud
 from app.core.security import verify_password, create_access_token
-from app.core.redis_client import get_redis_client
+from app.core import refresh_tokens
+from app.core.rate_limit import login_limiter, client_ip
 from app.core.config import settings
 from app.dependencies import get_db, get_current_user
 from app.models.models import Tenant
@@ -55,29 +56,73 @@ def register_user(user: PublicUserCreate, db: Session = Depends(get_db)):
     return usersCrud.create_user(db=db, user=user, tenant_id=tenant_id)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    # 1. Redis Check
-    r = get_redis_client()
-    redis_key = f"failed_attempts:{form_data.username}" 
-    failed_attempts = r.get(redis_key)
-    
-    if failed_attempts and int(failed_attempts) >= 5:
+def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # 1. Rate limit (un solo script atómico en Redis, con respaldo en memoria)
+    user_key = f"login_attempts:user:{form_data.username}"
+    ip_key = f"login_attempts:ip:{client_ip(request)}"
+    attempt = login_limiter.hit({
+        user_key: settings.LOGIN_MAX_ATTEMPTS,
+        ip_key: settings.LOGIN_IP_MAX_ATTEMPTS,
+    })
+
+    if attempt.blocked_key == user_key:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuário bloqueado temporariamente.")
+    if attempt.blocked_key == ip_key:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente mais tarde.",
+            headers={"Retry-After": str(settings.LOGIN_WINDOW_SECONDS)},
+        )
     
     # 2. DB Check
     user = usersCrud.get_user_by_email(db, email=form_data.username)
     
     if not user or not verify_password(form_data.password, user.hashed_password):
-        new_attempts = r.incr(redis_key)
-        if new_attempts == 1:
-            r.expire(redis_key, 300) 
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Credenciais incorretas. Tentativas: {new_attempts}/5")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Credenciais incorretas. Tentativas: {attempt.counts[user_key]}/{settings.LOGIN_MAX_ATTEMPTS}"
+        )
     
-    # 3. Success
-    r.delete(redis_key)
+    # 3. Success: la IP solo cuenta intentos fallidos (en un cambio de turno entran
+    # muchos usuarios por la misma NAT o el mismo proxy)
+    login_limiter.reset(user_key)
+    login_limiter.forget(ip_key, attempt.attempt_id)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
     tenant_uuid = str(user.tenant.uuid) if user.tenant and user.tenant.uuid else None
-    return {"access_token": access_token, "token_type": "bearer", "tenant_uuid": tenant_uuid}
\ No newline at end of file
+    refresh_token = refresh_tokens.issue_refresh_token(sub=user.email, tenant_uuid=tenant_uuid)
+    return {"access_token": access_token, "token_type": "bearer", "tenant_uuid": tenant_uuid, "refresh_token": refresh_token}
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(body: RefreshTokenRequest):
+    """
+    Emite un nuevo access token a partir de un refresh token (y lo rota).
+    Solo consulta Redis: no toca Argon2 ni Postgres.
+    """
+    try:
+        new_refresh_token, session = refresh_tokens.rotate_refresh_token(body.refresh_token)
+    except refresh_tokens.RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token = create_access_token(
+        data={"sub": session["sub"]},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "tenant_uuid": session["tenant_uuid"],
+        "refresh_token": new_refresh_token,
+    }
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: RefreshTokenRequest):
+    """Revoca la sesión (familia de refresh tokens) del usuario"""
+    refresh_tokens.revoke_refresh_token(body.refresh_token)
+    return None
\ No newline at end of file
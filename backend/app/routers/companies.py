@@ -1,23 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.dependencies import get_current_user
-from app.schemas.schemas import UserResponse
+from app.dependencies import get_current_user, get_read_db, allow_admin
+from app.schemas.schemas import UserResponse, ImportReport
 from app.schemas.company_schemas import CompanyCreate, CompanyResponse, CompanyUpdate
-from app.db import companies_crud
+from app.db import companies_crud, bulk_import
+from app.core.pagination import next_cursor
 
 router = APIRouter(prefix="/companies", tags=["Empresas"])
 
 @router.get("/", response_model=List[CompanyResponse])
 def read_companies(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    """Listar empresas filtradas por el tenant del usuario autenticado"""
-    return companies_crud.get_companies(db, skip=skip, limit=limit, tenant_id=current_user.tenant_id)
+    """
+    Listar empresas filtradas por el tenant del usuario autenticado.
+    Para paginar use `cursor` con el header X-Next-Cursor de la respuesta anterior.
+    """
+    try:
+        companies = companies_crud.get_companies(db, skip=skip, limit=limit, tenant_id=current_user.tenant_id, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cursor_value = next_cursor(companies, limit, companies_crud.company_cursor_key)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return companies
+
+@router.post("/import", response_model=ImportReport)
+def import_companies(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(allow_admin)
+):
+    """
+    Crea empresas en lote (CSV, JSON o NDJSON) en el tenant del administrador.
+    Columnas: name, tax_id, phone, email, contact_person, is_active.
+    """
+    fmt = format or bulk_import.detect_format(file.filename)
+    try:
+        rows = bulk_import.read_rows(file.file, fmt)
+        return bulk_import.import_companies(db, rows, user_id=current_user.id, tenant_id=current_user.tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Arquivo inválido: {e}")
 
 @router.get("/{company_id}", response_model=CompanyResponse)
 def read_company(
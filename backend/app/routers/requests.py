@@ -1,49 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from typing import List, Optional
+from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_user_async, get_read_db, get_async_read_db, get_async_read_session_factory
 from app.schemas.schemas import UserResponse
-from app.schemas.request_schemas import DailyRequestCreate, DailyRequestResponse, ShiftAssignmentCreate, ShiftAssignmentResponse, DailyRequestUpdate, ShiftAssignmentUpdate, PaymentReportItem, AttendanceReportItem, DashboardStatsItem, AttendanceStatsItem
-from app.db import requests_crud
+from app.schemas.request_schemas import DailyRequestCreate, DailyRequestResponse, ShiftAssignmentCreate, ShiftAssignmentResponse, ShiftAssignmentBulkCreate, ShiftAssignmentBulkResponse, DailyRequestUpdate, ShiftAssignmentUpdate, PaymentReportItem, AttendanceReportItem, DashboardStatsItem, AttendanceStatsItem, DashboardOverview, DailyRequestSummary, DAILY_REQUEST_INCLUDES, DAILY_REQUEST_FIELDS, DAILY_REQUEST_COUNT_FIELDS, daily_request_view_model
+from app.db import requests_crud, async_requests_crud
+from app.core.pagination import next_cursor
+from app.core import exports
+from app.core.serialization import TrustedJSONResponse, dump_orm, dump_orm_list
 
 router = APIRouter(prefix="/daily-requests", tags=["Solicitudes Diarias"])
 
 @router.post("/", response_model=DailyRequestResponse, status_code=status.HTTP_201_CREATED)
 def create_daily_request(request: DailyRequestCreate, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     try:
-        return requests_crud.create_daily_request(db=db, request=request, user_id=current_user.id, tenant_id=current_user.tenant_id)
+        result = requests_crud.create_daily_request(db=db, request=request, user_id=current_user.id, tenant_id=current_user.tenant_id)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if result == "COMPANY_NOT_FOUND":
+        raise HTTPException(status_code=404, detail="Empresa não encontrada")
+    return result
+
+_summary_list = TypeAdapter(List[DailyRequestSummary])
 
-@router.get("/", response_model=List[DailyRequestResponse])
+@router.get("/", response_model=List[DailyRequestResponse], responses={200: {"model": List[DailyRequestSummary]}})
 def read_daily_requests(
     skip: int = 0, 
     limit: int = 100, 
     company_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db), 
+    cursor: Optional[str] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    db: Session = Depends(get_read_db), 
     current_user: UserResponse = Depends(get_current_user)
 ):
-    return requests_crud.get_daily_requests(
-        db=db, 
-        skip=skip, 
-        limit=limit, 
-        company_id=company_id,
-        start_date=start_date,
-        end_date=end_date,
-        user_id=current_user.id,
-        role=current_user.role,
-        tenant_id=current_user.tenant_id
-    )
+    """
+    Lista de solicitudes. Para paginar use `cursor` con el valor del header
+    X-Next-Cursor de la respuesta anterior (skip/limit siguen funcionando).
+
+    `view=summary` devuelve por solicitud solo los conteos (turnos, vacantes,
+    vacantes cubiertas y presentes), calculados en una única consulta.
+    """
+    get_page = requests_crud.get_daily_requests_summary if view == "summary" else requests_crud.get_daily_requests
+    try:
+        items = get_page(
+            db=db, 
+            skip=skip, 
+            limit=limit, 
+            company_id=company_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=current_user.id,
+            role=current_user.role,
+            tenant_id=current_user.tenant_id,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cursor_value = next_cursor(items, limit, requests_crud.daily_request_cursor_key)
+    headers = {"X-Next-Cursor": cursor_value} if cursor_value else {}
+    if view == "summary":
+        return Response(content=_summary_list.dump_json(_summary_list.validate_python(items, from_attributes=True)), media_type="application/json", headers=headers)
 
-@router.get("/{request_id}", response_model=DailyRequestResponse)
-def read_daily_request(request_id: int, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
-    db_request = requests_crud.get_daily_request(db=db, request_id=request_id, tenant_id=current_user.tenant_id)
-    if db_request is None:
+    # Objetos ORM propios: se serializan sin volver a validar (ver app.core.serialization)
+    return TrustedJSONResponse(dump_orm_list(items, DailyRequestResponse), headers=headers)
+
+def _parse_csv_param(value: Optional[str], allowed: tuple, error_message: str) -> list[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()] if value else []
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"{error_message}: {', '.join(unknown)}")
+    return items
+
+@router.get("/{request_id}", response_model=None, responses={200: {"model": DailyRequestResponse}})
+def read_daily_request(
+    request_id: int,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Detalle de una solicitud. Sin parámetros devuelve todo (turnos, asignaciones y empleados).
+
+    - `include=shifts,assignments,employee`: relaciones anidadas a cargar
+      (cada una incluye las anteriores; vacío = solo la cabecera).
+    - `fields=id,request_date,status,shift_count`: campos de la cabecera; con `fields`
+      y sin `include` no se cargan los turnos.
+    """
+    if include is None and fields is None:
+        db_request = requests_crud.get_daily_request(db=db, request_id=request_id, tenant_id=current_user.tenant_id)
+        if db_request is None:
+            raise HTTPException(status_code=404, detail="Solicitação não encontrada")
+        return TrustedJSONResponse(dump_orm(db_request, DailyRequestResponse))
+
+    included = _parse_csv_param(include, DAILY_REQUEST_INCLUDES, "Relações desconhecidas")
+    # Cada relación requiere la anterior (employee -> assignments -> shifts)
+    depth = max((DAILY_REQUEST_INCLUDES.index(item) + 1 for item in included), default=0)
+    included = DAILY_REQUEST_INCLUDES[:depth]
+    selected = _parse_csv_param(fields, DAILY_REQUEST_FIELDS, "Campos desconhecidos") if fields is not None else None
+    counts = [name for name in DAILY_REQUEST_COUNT_FIELDS if selected and name in selected]
+
+    result = requests_crud.get_daily_request(
+        db=db, request_id=request_id, tenant_id=current_user.tenant_id, include=included, counts=counts
+    )
+    if result is None:
         raise HTTPException(status_code=404, detail="Solicitação não encontrada")
-    return db_request
+    db_request, count_values = result if counts else (result, {})
+
+    view_model = daily_request_view_model(frozenset(included), tuple(selected) if selected is not None else None)
+    data = {name: count_values.get(name, getattr(db_request, name, None)) for name in view_model.model_fields}
+    return Response(content=view_model.model_validate(data).model_dump_json(), media_type="application/json")
 
 # --- ASIGNACIONES ---
 
@@ -61,9 +135,32 @@ def assign_employee(
         raise HTTPException(status_code=400, detail="O turno já está completo (Vagas preenchidas)")
     if result == "EXISTS":
         raise HTTPException(status_code=400, detail="O colaborador já está escalado neste turno")
+    if result == "EMPLOYEE_NOT_FOUND":
+        raise HTTPException(status_code=404, detail="Colaborador não encontrado")
         
     return result
 
+@router.post("/assignments/bulk", response_model=ShiftAssignmentBulkResponse)
+def assign_employees_bulk(
+    assignment: ShiftAssignmentBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Asigna una lista de empleados a un turno en una sola transacción.
+    Retorna el resultado por empleado (CREATED, EXISTS, FULL, DUPLICATE, EMPLOYEE_NOT_FOUND).
+    """
+    result = requests_crud.create_assignments_bulk(
+        db=db,
+        shift_id=assignment.shift_id,
+        employee_ids=assignment.employee_ids,
+        user_id=current_user.id,
+        tenant_id=current_user.tenant_id
+    )
+    if result == "NOT_FOUND":
+        raise HTTPException(status_code=404, detail="Turno não encontrado")
+    return result
+
 @router.delete("/assignments/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_assignment(
     assignment_id: int,
@@ -132,18 +229,18 @@ def delete_request(
     return None
 
 @router.get("/report/payments", response_model=List[PaymentReportItem])
-def get_payments_report(
-    start_date: str,
-    end_date: str,
+async def get_payments_report(
+    start_date: date,
+    end_date: date,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Genera un reporte de pagos para empleados 'PRESENTE'.
     Fechas deben ser YYYY-MM-DD.
     """
-    return requests_crud.get_payments_report(
+    return TrustedJSONResponse(await async_requests_crud.get_payments_report(
         db=db, 
         start_date=start_date, 
         end_date=end_date, 
@@ -151,21 +248,23 @@ def get_payments_report(
         user_id=current_user.id,
         role=current_user.role,
         tenant_id=current_user.tenant_id
-    )
+    ))
 
 @router.get("/report/attendance", response_model=List[AttendanceReportItem])
-def get_attendance_report(
-    start_date: str,
-    end_date: str,
+async def get_attendance_report(
+    start_date: date,
+    end_date: date,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    format: str = Query("json", pattern="^(json|csv|ndjson)$"),
+    session_factory = Depends(get_async_read_session_factory),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Genera un reporte detallado de asistencia (por registro).
+    Con `format=csv` o `format=ndjson` la respuesta se envía en streaming,
+    apta para rangos grandes.
     """
-    return requests_crud.get_attendance_report(
-        db=db, 
+    params = dict(
         start_date=start_date, 
         end_date=end_date, 
         company_id=company_id,
@@ -173,19 +272,30 @@ def get_attendance_report(
         role=current_user.role,
         tenant_id=current_user.tenant_id
     )
+    if format != "json":
+        batches = async_requests_crud.stream_attendance_report(session_factory, **params)
+        filename = f"asistencia_{start_date}_{end_date}.{format}"
+        return StreamingResponse(
+            exports.encode(batches, format, list(AttendanceReportItem.model_fields)),
+            media_type=exports.MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    async with session_factory() as db:
+        return TrustedJSONResponse(await async_requests_crud.get_attendance_report(db=db, **params))
 
 @router.get("/stats/dashboard", response_model=List[DashboardStatsItem])
-def get_dashboard_stats(
-    start_date: str,
-    end_date: str,
+async def get_dashboard_stats(
+    start_date: date,
+    end_date: date,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Retorna estadísticas para el dashboard (cantidad de solicitudes por empresa).
     """
-    return requests_crud.get_dashboard_stats(
+    return TrustedJSONResponse(await async_requests_crud.get_dashboard_stats(
         db=db, 
         start_date=start_date, 
         end_date=end_date, 
@@ -193,20 +303,42 @@ def get_dashboard_stats(
         user_id=current_user.id,
         role=current_user.role,
         tenant_id=current_user.tenant_id
-    )
+    ))
+
+@router.get("/stats/overview", response_model=DashboardOverview)
+async def get_dashboard_overview(
+    start_date: date,
+    end_date: date,
+    company_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
+):
+    """
+    Todo lo que muestra el dashboard en una sola consulta: solicitudes por empresa,
+    asignaciones por empresa y estado, totales y monto a pagar.
+    """
+    return TrustedJSONResponse(await async_requests_crud.get_dashboard_overview(
+        db=db, 
+        start_date=start_date, 
+        end_date=end_date, 
+        company_id=company_id,
+        user_id=current_user.id,
+        role=current_user.role,
+        tenant_id=current_user.tenant_id
+    ))
 
 @router.get("/stats/attendance", response_model=List[AttendanceStatsItem])
-def get_attendance_stats(
-    start_date: str,
-    end_date: str,
+async def get_attendance_stats(
+    start_date: date,
+    end_date: date,
     company_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserResponse = Depends(get_current_user_async)
 ):
     """
     Retorna estadísticas de asistencia (conteo por status).
     """
-    return requests_crud.get_attendance_stats(
+    return TrustedJSONResponse(await async_requests_crud.get_attendance_stats(
         db=db, 
         start_date=start_date, 
         end_date=end_date, 
@@ -214,6 +346,6 @@ def get_attendance_stats(
         user_id=current_user.id,
         role=current_user.role,
         tenant_id=current_user.tenant_id
-    )
+    ))
 
 
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.dependencies import get_current_user
+from app.schemas.schemas import UserResponse
+from app.schemas.schedule_schemas import (
+    ScheduleTemplateCreate, ScheduleTemplateResponse, ScheduleGenerateRequest, ScheduleGenerateResponse
+)
+from app.db import schedule_templates_crud
+
+router = APIRouter(prefix="/schedule-templates", tags=["Plantillas de Escala"])
+
+@router.post("/", response_model=ScheduleTemplateResponse, status_code=status.HTTP_201_CREATED)
+def create_template(
+    template: ScheduleTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Crea una plantilla: empresa, días de la semana (máscara), turnos y rango de fechas"""
+    result = schedule_templates_crud.create_template(
+        db=db, template=template, user_id=current_user.id, tenant_id=current_user.tenant_id
+    )
+    if result == "COMPANY_NOT_FOUND":
+        raise HTTPException(status_code=404, detail="Empresa não encontrada")
+    return result
+
+@router.get("/", response_model=List[ScheduleTemplateResponse])
+def read_templates(
+    company_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    return schedule_templates_crud.get_templates(db, tenant_id=current_user.tenant_id, company_id=company_id)
+
+@router.get("/{template_id}", response_model=ScheduleTemplateResponse)
+def read_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    db_template = schedule_templates_crud.get_template(db, template_id=template_id, tenant_id=current_user.tenant_id)
+    if db_template is None:
+        raise HTTPException(status_code=404, detail="Plantilla não encontrada")
+    return db_template
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Elimina la plantilla; las solicitudes ya generadas se mantienen"""
+    success = schedule_templates_crud.delete_template(db, template_id=template_id, tenant_id=current_user.tenant_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Plantilla não encontrada")
+    return None
+
+@router.post("/{template_id}/generate", response_model=ScheduleGenerateResponse)
+def generate_requests(
+    template_id: int,
+    body: Optional[ScheduleGenerateRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Crea en una transacción las solicitudes y turnos de la plantilla en el rango
+    (por defecto, el de la plantilla). Los días en que la empresa ya tiene una
+    solicitud se saltan y vuelven en `skipped_dates`.
+    """
+    body = body or ScheduleGenerateRequest()
+    try:
+        result = schedule_templates_crud.generate_requests(
+            db, template_id=template_id, user_id=current_user.id, tenant_id=current_user.tenant_id,
+            start_date=body.start_date, end_date=body.end_date,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result == "NOT_FOUND":
+        raise HTTPException(status_code=404, detail="Plantilla não encontrada")
+    return result
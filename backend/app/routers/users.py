@@ -1,23 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.schemas.schemas import UserResponse, UserUpdate, UserTenantChange
-from app.db import usersCrud
-from app.dependencies import get_current_user, get_db
+from app.schemas.schemas import UserResponse, UserUpdate, UserTenantChange, ImportReport
+from app.db import usersCrud, bulk_import
+from app.dependencies import get_current_user, get_db, get_read_db, allow_admin
+from app.core.pagination import next_cursor
 
 router = APIRouter(prefix="/users", tags=["Usuarios"])
 
 @router.get("/", response_model=List[UserResponse])
 def read_users(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db), 
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db), 
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     Retorna la lista de usuarios del tenant del usuario autenticado.
+    Para paginar use `cursor` con el header X-Next-Cursor de la respuesta anterior.
     """
-    return usersCrud.get_users(db, skip=skip, limit=limit, tenant_id=current_user.tenant_id)
+    try:
+        users = usersCrud.get_users(db, skip=skip, limit=limit, tenant_id=current_user.tenant_id, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cursor_value = next_cursor(users, limit, usersCrud.user_cursor_key)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return users
+
+# --- ENDPOINT ADMIN: Importación masiva (CSV, JSON o NDJSON) ---
+@router.post("/import", response_model=ImportReport)
+def import_users(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(allow_admin)
+):
+    """
+    Crea usuarios en lote en el tenant del administrador.
+    Columnas: first_name, last_name, cpf, email, password, role, code, pix.
+    Retorna cuántos se crearon y los errores por fila.
+    """
+    fmt = format or bulk_import.detect_format(file.filename)
+    try:
+        rows = bulk_import.read_rows(file.file, fmt)
+        return bulk_import.import_users(db, rows, tenant_id=current_user.tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Arquivo inválido: {e}")
 
 # Endpoint protegido movido aquí
 @router.get("/me", response_model=UserResponse)
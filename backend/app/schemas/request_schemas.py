@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, create_model
+from functools import lru_cache
+from typing import Dict, List, Optional
 from datetime import datetime, date
 
 # --- Esquema Simple de Usuario (Para anidar en respuestas) ---
@@ -36,6 +37,19 @@ class AttendanceStatsItem(BaseModel):
     status: str
     count: int
 
+class DashboardOverviewTotals(BaseModel):
+    request_count: int
+    assignment_count: int
+    payout_total: float
+    status_counts: Dict[str, int] # Asignaciones por estado (PRESENTE, FALTOU, ASIGNADO...)
+
+class DashboardOverviewCompany(DashboardOverviewTotals):
+    company_name: str
+
+class DashboardOverview(BaseModel):
+    totals: DashboardOverviewTotals
+    companies: List[DashboardOverviewCompany]
+
 
 
 
@@ -48,6 +62,20 @@ class ShiftAssignmentCreate(ShiftAssignmentBase):
     shift_id: int
     employee_id: int
 
+class ShiftAssignmentBulkCreate(BaseModel):
+    shift_id: int
+    employee_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class ShiftAssignmentResult(BaseModel):
+    employee_id: int
+    status: str # CREATED, EXISTS, FULL, DUPLICATE, EMPLOYEE_NOT_FOUND
+    assignment_id: Optional[int] = None
+
+class ShiftAssignmentBulkResponse(BaseModel):
+    shift_id: int
+    created: int
+    results: List[ShiftAssignmentResult]
+
 class ShiftAssignmentUpdate(BaseModel):
     status: str
 
@@ -106,4 +134,61 @@ class DailyRequestResponse(DailyRequestBase):
     # Incluye lista de turnos (que ahora incluyen asignaciones)
     shifts: List[WorkShiftResponse] = [] 
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+class DailyRequestSummary(BaseModel):
+    """Fila del listado con view=summary (conteos en vez de turnos anidados)."""
+    id: int
+    company_id: int
+    request_date: date
+    status_id: int
+    status: Optional[str] = None
+    shift_count: int
+    total_slots: int # Suma de quantity de los turnos
+    filled_slots: int # Asignaciones (cualquier estado)
+    present_count: int
+    model_config = ConfigDict(from_attributes=True)
+
+# --- VISTAS PARCIALES DEL DETALLE (?include= / ?fields=) ---
+# Relaciones anidadas que se pueden pedir; cada una requiere la anterior
+DAILY_REQUEST_INCLUDES = ("shifts", "assignments", "employee")
+# Campos calculados en SQL (no requieren cargar los turnos)
+DAILY_REQUEST_COUNT_FIELDS = ("shift_count", "assignment_count")
+DAILY_REQUEST_FIELDS = tuple(f for f in DailyRequestResponse.model_fields if f != "shifts") + DAILY_REQUEST_COUNT_FIELDS
+
+class EmployeeSummary(BaseModel):
+    """Como EmployeeSimple, pero sin validar el email (solo es salida)."""
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    role: str
+    model_config = ConfigDict(from_attributes=True)
+
+def _fields_of(model, exclude=()):
+    return {name: (info.annotation, info) for name, info in model.model_fields.items() if name not in exclude}
+
+@lru_cache(maxsize=64)
+def daily_request_view_model(include: frozenset, fields: tuple | None):
+    """
+    Modelo de respuesta del detalle con solo los campos y relaciones pedidos.
+    fields None: todos los campos de DailyRequestResponse.
+    """
+    config = ConfigDict(from_attributes=True)
+
+    assignment_fields = _fields_of(ShiftAssignmentResponse, exclude=("employee",))
+    if "employee" in include:
+        assignment_fields["employee"] = (Optional[EmployeeSummary], None)
+    assignment_model = create_model("ShiftAssignmentView", __config__=config, **assignment_fields)
+
+    shift_fields = _fields_of(WorkShiftResponse, exclude=("assignments",))
+    if "assignments" in include:
+        shift_fields["assignments"] = (List[assignment_model], [])
+    shift_model = create_model("WorkShiftView", __config__=config, **shift_fields)
+
+    request_fields = _fields_of(DailyRequestResponse, exclude=("shifts",))
+    if fields is not None:
+        request_fields.update({name: (int, 0) for name in DAILY_REQUEST_COUNT_FIELDS})
+        request_fields = {name: request_fields[name] for name in fields}
+    if "shifts" in include:
+        request_fields["shifts"] = (List[shift_model], [])
+    return create_model("DailyRequestView", __config__=config, **request_fields)
@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Optional
+from datetime import datetime, date, time
+
+# --- Turnos de la plantilla (solo horas; la fecha la pone cada día generado) ---
+class ScheduleTemplateShiftBase(BaseModel):
+    start_time: time
+    end_time: time # Si es <= start_time, el turno termina al día siguiente
+    payment_amount: float = Field(..., gt=0)
+    quantity: int = Field(default=1, gt=0)
+    has_discount: bool = False
+    discount_percentage: Optional[float] = 0.0
+
+class ScheduleTemplateShiftCreate(ScheduleTemplateShiftBase):
+    pass
+
+class ScheduleTemplateShiftResponse(ScheduleTemplateShiftBase):
+    id: int
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Plantillas ---
+class ScheduleTemplateBase(BaseModel):
+    name: str = Field(..., min_length=2, max_length=100)
+    company_id: int
+    # bit 0 = lunes ... bit 6 = domingo; 31 = lunes a viernes
+    weekday_mask: int = Field(default=31, ge=1, le=127)
+    start_date: date
+    end_date: date
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.end_date < self.start_date:
+            raise ValueError("end_date deve ser posterior a start_date")
+        return self
+
+class ScheduleTemplateCreate(ScheduleTemplateBase):
+    shifts: List[ScheduleTemplateShiftCreate] = Field(..., min_length=1, max_length=20)
+
+class ScheduleTemplateResponse(ScheduleTemplateBase):
+    id: int
+    shifts: List[ScheduleTemplateShiftResponse] = []
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Generación ---
+class ScheduleGenerateRequest(BaseModel):
+    # Por defecto, el rango de la plantilla (recortado a él en cualquier caso)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+class GeneratedRequest(BaseModel):
+    request_id: int
+    request_date: date
+    shift_ids: List[int]
+
+class ScheduleGenerateResponse(BaseModel):
+    template_id: int
+    created: int
+    created_requests: List[GeneratedRequest]
+    skipped_dates: List[date] # Días que ya tenían una solicitud de la empresa
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 import re
 from uuid import UUID
 
@@ -72,7 +72,21 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     tenant_uuid: Optional[str] = None
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class UserTenantChange(BaseModel):
     user_id: int
-    tenant_id: int
\ No newline at end of file
+    tenant_id: int
+
+# --- IMPORTACIÓN MASIVA (CSV / JSON) ---
+class ImportRowError(BaseModel):
+    row: int # Número de fila de datos (empieza en 1)
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    total: int
+    created: int
+    errors: List[ImportRowError] = []
@@ -0,0 +1,129 @@
+"""
+Casos del benchmark: cada función de los crud y cada endpoint de listado/reporte.
+
+- CRUD_CASES: lecturas, fn(db, ctx).
+- WRITE_CASES: escrituras, fn(db, ctx). Se ejecutan dentro de una transacción
+  que se revierte al final (los commit de los crud pasan a ser SAVEPOINTs), así
+  los datos sembrados no cambian entre repeticiones. setup(db, ctx) no se mide.
+- ENDPOINT_CASES: rutas GET que se piden con TestClient (validación,
+  serialización y dependencias incluidas).
+
+ctx son los ids reales de la escala sembrada (ver resolve_context).
+"""
+from datetime import date, datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import select, update
+
+from app.db import requests_crud, usersCrud, companies_crud
+from app.models.models import DailyRequest, WorkShift, ShiftAssignment, User
+from app.schemas.request_schemas import DailyRequestCreate, WorkShiftCreate, ShiftAssignmentCreate
+from app.schemas.schemas import UserUpdate
+from app.schemas.company_schemas import CompanyUpdate
+
+TENANT = 3
+COMPANY = 42  # pertenece al tenant 3 (42 % 20 + 1)
+DAY = date(2024, 6, 3)
+MONTH = (date(2024, 6, 1), date(2024, 6, 30))
+YEAR = (date(2024, 1, 1), date(2024, 12, 31))  # rango largo: lee del resumen diario
+
+
+class Case(NamedTuple):
+    name: str
+    fn: Callable
+    setup: Callable | None = None
+
+
+class Context(NamedTuple):
+    user_id: int
+    user_email: str
+    request_id: int
+    shift_id: int
+    assignment_id: int
+    employee_ids: list
+
+
+def resolve_context(db) -> Context:
+    """Ids de una solicitud del tenant/empresa de prueba, con su turno y asignaciones."""
+    request_id, shift_id = db.execute(
+        select(DailyRequest.id, WorkShift.id)
+        .join(WorkShift, WorkShift.request_id == DailyRequest.id)
+        .where(DailyRequest.tenant_id == TENANT, DailyRequest.company_id == COMPANY)
+        .order_by(DailyRequest.id).limit(1)
+    ).one()
+    assignment_id = db.scalar(select(ShiftAssignment.id).where(ShiftAssignment.shift_id == shift_id).limit(1))
+    users = db.execute(select(User.id, User.email).where(User.tenant_id == TENANT).order_by(User.id).limit(11)).all()
+    return Context(users[0].id, users[0].email, request_id, shift_id, assignment_id, [u.id for u in users[1:]])
+
+
+def _report(fn, start_date, end_date):
+    return lambda db, ctx: fn(db, start_date, end_date, tenant_id=TENANT)
+
+
+CRUD_CASES = [
+    Case("requests.get_daily_requests", lambda db, ctx: requests_crud.get_daily_requests(db, limit=50, tenant_id=TENANT)),
+    Case("requests.get_daily_requests_empresa_mes", lambda db, ctx: requests_crud.get_daily_requests(
+        db, limit=50, company_id=COMPANY, start_date=MONTH[0], end_date=MONTH[1], tenant_id=TENANT)),
+    Case("requests.get_daily_requests_summary", lambda db, ctx: requests_crud.get_daily_requests_summary(db, limit=50, tenant_id=TENANT)),
+    Case("requests.get_daily_request", lambda db, ctx: requests_crud.get_daily_request(db, ctx.request_id, tenant_id=TENANT)),
+    Case("requests.get_payments_report_dia", _report(requests_crud.get_payments_report, DAY, DAY)),
+    Case("requests.get_payments_report_mes", _report(requests_crud.get_payments_report, *MONTH)),
+    Case("requests.get_attendance_report_mes", _report(requests_crud.get_attendance_report, *MONTH)),
+    Case("requests.get_dashboard_stats_mes", _report(requests_crud.get_dashboard_stats, *MONTH)),
+    Case("requests.get_attendance_stats_mes", _report(requests_crud.get_attendance_stats, *MONTH)),
+    Case("requests.get_attendance_stats_anio", _report(requests_crud.get_attendance_stats, *YEAR)),
+    Case("requests.get_dashboard_overview_mes", _report(requests_crud.get_dashboard_overview, *MONTH)),
+    Case("users.get_users", lambda db, ctx: usersCrud.get_users(db, limit=50, tenant_id=TENANT)),
+    Case("users.get_user_by_email", lambda db, ctx: usersCrud.get_user_by_email(db, ctx.user_email, tenant_id=TENANT)),
+    Case("companies.get_companies", lambda db, ctx: companies_crud.get_companies(db, limit=50, tenant_id=TENANT)),
+    Case("companies.get_company", lambda db, ctx: companies_crud.get_company(db, COMPANY, tenant_id=TENANT)),
+]
+
+
+def _new_request():
+    start = datetime(DAY.year, DAY.month, DAY.day, 8)
+    return DailyRequestCreate(
+        company_id=COMPANY, request_date=DAY,
+        shifts=[WorkShiftCreate(start_time=start, end_time=start.replace(hour=17), payment_amount=120.0, quantity=2)],
+    )
+
+
+def _free_slots(db, ctx):
+    """El turno sembrado está completo: le damos cupo para que las asignaciones se creen."""
+    db.execute(update(WorkShift).where(WorkShift.id == ctx.shift_id).values(quantity=WorkShift.quantity + 20))
+
+
+WRITE_CASES = [
+    Case("requests.create_daily_request", lambda db, ctx: requests_crud.create_daily_request(db, _new_request(), ctx.user_id, TENANT)),
+    Case("requests.create_assignment", lambda db, ctx: requests_crud.create_assignment(
+        db, ShiftAssignmentCreate(shift_id=ctx.shift_id, employee_id=ctx.employee_ids[0]), ctx.user_id, TENANT), _free_slots),
+    Case("requests.create_assignments_bulk", lambda db, ctx: requests_crud.create_assignments_bulk(
+        db, ctx.shift_id, ctx.employee_ids, ctx.user_id, TENANT), _free_slots),
+    Case("requests.update_assignment_status", lambda db, ctx: requests_crud.update_assignment_status(
+        db, ctx.assignment_id, "FALTOU", ctx.user_id, TENANT)),
+    Case("requests.delete_assignment", lambda db, ctx: requests_crud.delete_assignment(db, ctx.assignment_id, TENANT)),
+    Case("requests.update_daily_request_status", lambda db, ctx: requests_crud.update_daily_request_status(
+        db, ctx.request_id, 2, ctx.user_id, TENANT)),
+    Case("requests.delete_daily_request", lambda db, ctx: requests_crud.delete_daily_request(db, ctx.request_id, TENANT)),
+    Case("users.update_user", lambda db, ctx: usersCrud.update_user(db, ctx.user_id, UserUpdate(first_name="Bench"), TENANT)),
+    Case("companies.update_company", lambda db, ctx: companies_crud.update_company(
+        db, COMPANY, CompanyUpdate(contact_person="Bench"), ctx.user_id, TENANT)),
+]
+
+
+def _period(start_date, end_date):
+    return f"start_date={start_date}&end_date={end_date}"
+
+
+ENDPOINT_CASES = [
+    Case("GET /daily-requests/", lambda ctx: "/daily-requests/?limit=50"),
+    Case("GET /daily-requests/?view=summary", lambda ctx: "/daily-requests/?limit=50&view=summary"),
+    Case("GET /daily-requests/{id}", lambda ctx: f"/daily-requests/{ctx.request_id}"),
+    Case("GET /daily-requests/report/payments", lambda ctx: f"/daily-requests/report/payments?{_period(*MONTH)}"),
+    Case("GET /daily-requests/report/attendance", lambda ctx: f"/daily-requests/report/attendance?{_period(*MONTH)}"),
+    Case("GET /daily-requests/stats/dashboard", lambda ctx: f"/daily-requests/stats/dashboard?{_period(*MONTH)}"),
+    Case("GET /daily-requests/stats/overview", lambda ctx: f"/daily-requests/stats/overview?{_period(*MONTH)}"),
+    Case("GET /daily-requests/stats/attendance", lambda ctx: f"/daily-requests/stats/attendance?{_period(*YEAR)}"),
+    Case("GET /users/", lambda ctx: "/users/?limit=50"),
+    Case("GET /companies/", lambda ctx: "/companies/?limit=50"),
+]
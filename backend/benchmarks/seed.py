@@ -0,0 +1,88 @@
+"""
+Datos sintéticos para los benchmarks (y para test_query_plans).
+
+La escala se mide en asignaciones: un turno por solicitud y dos asignaciones
+por turno, repartidas en ~3 años (1.000 días) entre 20 tenants, 400 empresas
+y 5.000 usuarios. Tenants, empresas y usuarios no cambian con la escala, así
+que al crecer aumenta la densidad por día y por empresa.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import partitions, report_rollup
+
+TENANTS = 20
+COMPANIES = 400
+USERS = 5000
+DAYS = 1000
+FIRST_DAY = date(2023, 1, 1)
+ASSIGNMENTS_PER_SHIFT = 2
+
+TABLES = [
+    "business.daily_assignment_rollups", "business.shift_assignments", "business.work_shifts",
+    "business.daily_requests", "business.daily_request_status", "business.companies",
+    "auth.users", "core.tenants",
+]
+
+# Tablas cuyo id se siembra explícito: el siguiente INSERT de la aplicación
+# debe continuar después del último id
+SERIAL_TABLES = ["auth.users", "core.tenants", "business.companies", "business.daily_requests", "business.work_shifts"]
+
+_SEED_SQL = """
+INSERT INTO auth.users (id, first_name, last_name, cpf, email, hashed_password, role)
+SELECT g, 'Nome' || g, 'Sobrenome', lpad(g::text, 11, '0'), 'u' || g || '@teste.com', 'x', 'contratado'
+FROM generate_series(1, {users}) g;
+INSERT INTO core.tenants (id, uuid, name, active, created_by)
+SELECT t, gen_random_uuid(), 'Tenant ' || t, 1, 1 FROM generate_series(1, {tenants}) t;
+UPDATE auth.users SET tenant_id = id % {tenants} + 1;
+INSERT INTO business.companies (id, name, tax_id, tenant_id, created_by)
+SELECT c, 'Empresa ' || c, 'TAX' || lpad(c::text, 6, '0'), c % {tenants} + 1, 1 FROM generate_series(1, {companies}) c;
+INSERT INTO business.daily_request_status (id, code, created_by)
+VALUES (1, 'PENDENTE', 1), (2, 'CONCLUIDA', 1), (3, 'CANCELADA', 1);
+INSERT INTO business.daily_requests (id, company_id, request_date, status_id, tenant_id, created_by)
+SELECT r, r % {companies} + 1, date '{first_day}' + r % {days}, 1 + r % 3, (r % {companies} + 1) % {tenants} + 1, 1
+FROM generate_series(1, {requests}) r;
+INSERT INTO business.work_shifts (id, request_id, request_date, tenant_id, start_time, end_time, payment_amount, quantity, has_discount, discount_percentage, created_by)
+SELECT r, r, date '{first_day}' + r % {days}, (r % {companies} + 1) % {tenants} + 1, timestamp '2023-01-01 08:00', timestamp '2023-01-01 17:00', 120, {per_shift}, r % 5 = 0, 10, 1
+FROM generate_series(1, {requests}) r;
+INSERT INTO business.shift_assignments (shift_id, request_date, tenant_id, employee_id, status, company_id, request_status_id, payment_amount, final_amount, created_by)
+SELECT r, date '{first_day}' + r % {days}, (r % {companies} + 1) % {tenants} + 1, (r * 7 + k) % {users} + 1, CASE WHEN r % 4 = 0 THEN 'FALTOU' ELSE 'PRESENTE' END,
+       r % {companies} + 1, 1 + r % 3, 120, CASE WHEN r % 5 = 0 THEN 120 * (1 - 10 / 100.0) ELSE 120 END, 1
+FROM generate_series(1, {requests}) r, generate_series(0, {per_shift} - 1) k;
+"""
+
+
+def seed_sql(assignments: int) -> str:
+    """INSERTs que generan `assignments` asignaciones (y las solicitudes, turnos, etc. que requieren)."""
+    return _SEED_SQL.format(
+        users=USERS, tenants=TENANTS, companies=COMPANIES, days=DAYS, first_day=FIRST_DAY,
+        requests=max(1, assignments // ASSIGNMENTS_PER_SHIFT), per_shift=ASSIGNMENTS_PER_SHIFT,
+    )
+
+
+def ensure_seed_partitions(connection) -> None:
+    """Particiones mensuales de todo el rango sembrado."""
+    partitions.ensure_partitions(connection, FIRST_DAY, FIRST_DAY + timedelta(days=DAYS - 1))
+
+
+def seed(engine, assignments: int) -> None:
+    """Vacía las tablas, siembra la escala pedida, reconstruye el resumen y actualiza estadísticas."""
+    with engine.begin() as connection:
+        # Cursor DBAPI directo: el SQL usa "%" (módulo) y no lleva parámetros
+        ensure_seed_partitions(connection)
+        cursor = connection.connection.cursor()
+        cursor.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        cursor.execute(seed_sql(assignments))
+        for table in SERIAL_TABLES:
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+    with Session(engine) as db:
+        report_rollup.rebuild(db)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def assignment_count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT count(*) FROM business.shift_assignments")).scalar()
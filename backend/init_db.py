@@ -1,38 +1,47 @@
 import sys
 import os
-from sqlalchemy import text
+from sqlalchemy import inspect
+
+from alembic import command
+from alembic.config import Config
 
 # Configuración de rutas
 sys.path.append(os.getcwd())
 
-from app.db.database import engine, Base
-from app.models import models 
+from app.db.database import engine
+from app.db import partitions
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
 
 def reset_db():
     print("🔄 Conectando a PostgreSQL...")
     
     try:
-        with engine.connect() as connection:
-            # 1. Crear esquema de Autenticación
-            connection.execute(text("CREATE SCHEMA IF NOT EXISTS auth"))
-            
-            # 2. Crear esquema de Negocio (NUEVO)
-            connection.execute(text("CREATE SCHEMA IF NOT EXISTS business"))
-            
-            connection.commit()
-            print("✅ Esquemas 'auth' y 'business' verificados.")
-
-        # 3. BORRAR TABLAS (Opcional, solo para desarrollo/reset)
-        # print("🗑️  Borrando tablas existentes...")
-        # Base.metadata.drop_all(bind=engine)
-
-        # 4. CREAR TABLAS
-        print("🏗️  Creando/Actualizando tablas...")
-        Base.metadata.create_all(bind=engine)
+        config = Config(ALEMBIC_INI)
+        config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+
+        # 1. Bases creadas antes de las migraciones (con create_all): se marcan
+        #    con el esquema inicial para no volver a crear sus tablas
+        inspector = inspect(engine)
+        if inspector.has_table("users", schema="auth") and not inspector.has_table("alembic_version", schema="public"):
+            print("📌 Base existente sin migraciones: marcando revisión inicial (0001)...")
+            command.stamp(config, "0001")
+
+        # 2. Esquemas (auth, business, core), tablas e índices
+        #    (migrations/env.py toma la URL de app/db/database.py)
+        print("🏗️  Aplicando migraciones...")
+        command.upgrade(config, "head")
+
+        # 3. Particiones mensuales del mes actual y los siguientes
+        with engine.begin() as connection:
+            created = partitions.ensure_upcoming(connection)
+        if created:
+            print(f"🗓️  Particiones creadas: {len(created)}")
+
         print("✅ ¡ÉXITO! Base de datos lista.")
         
     except Exception as e:
         print(f"❌ ERROR: {e}")
 
 if __name__ == "__main__":
-    reset_db()
\ No newline at end of file
+    reset_db()
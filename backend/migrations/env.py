@@ -0,0 +1,70 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.db.database import Base, SQLALCHEMY_DATABASE_URL
+from app.models import models  # noqa: F401 (registra las tablas en Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Esquemas propios de la aplicación; la tabla alembic_version queda en public
+SCHEMAS = ("auth", "business", "core")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "schema":
+        return name in SCHEMAS
+    return True
+
+
+def _database_url():
+    # Permite apuntar a otra base: alembic -x url=postgresql://... upgrade head
+    return context.get_x_argument(as_dictionary=True).get("url") or config.get_main_option("sqlalchemy.url") or SQLALCHEMY_DATABASE_URL
+
+
+def _configure(connection=None, **kwargs):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_schemas=True,
+        include_name=include_name,
+        version_table_schema="public",
+        compare_type=True,
+        # Una transacción por migración: algunas crean índices CONCURRENTLY (autocommit)
+        transaction_per_migration=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)."""
+    _configure(url=_database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # Quien llama puede pasar su propia conexión (init_db, tests)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(_database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,163 @@
+"""Esquema inicial (el que creaba init_db.py con create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Bases creadas antes de las migraciones: no correr esta revisión, marcarla con
+"alembic stamp 0001" (init_db.py lo hace solo) y seguir con "alembic upgrade head".
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def _audit():
+    return [
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("auth.users.id"), nullable=False),
+        sa.Column("updated_by", sa.Integer(), sa.ForeignKey("auth.users.id"), nullable=True),
+    ]
+
+
+def upgrade():
+    for schema in ("auth", "business", "core"):
+        op.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+
+    # users <-> tenants se referencian mutuamente: la FK de users.tenant_id va al final
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("cpf", sa.String(14), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("role", sa.String(20), server_default="user", nullable=False),
+        sa.Column("code", sa.String(50), nullable=True),
+        sa.Column("pix", sa.String(255), nullable=True),
+        sa.Column("tenant_id", sa.BigInteger(), nullable=True),
+        *_timestamps(),
+        sa.UniqueConstraint("tenant_id", "email", name="uq_user_tenant_email"),
+        sa.UniqueConstraint("tenant_id", "cpf", name="uq_user_tenant_cpf"),
+        sa.UniqueConstraint("tenant_id", "code", name="uq_user_tenant_code"),
+        schema="auth",
+    )
+    op.create_index("ix_auth_users_id", "users", ["id"], schema="auth")
+    op.create_index("ix_auth_users_cpf", "users", ["cpf"], schema="auth")
+    op.create_index("ix_auth_users_email", "users", ["email"], schema="auth")
+
+    op.create_table(
+        "tenants",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(150), nullable=False),
+        sa.Column("document", sa.String(30), nullable=True),
+        sa.Column("email", sa.String(150), nullable=True),
+        sa.Column("phone", sa.String(30), nullable=True),
+        sa.Column("active", sa.Integer(), nullable=False),
+        *_timestamps(),
+        *_audit(),
+        schema="core",
+    )
+    op.create_index("ix_core_tenants_id", "tenants", ["id"], schema="core")
+    op.create_foreign_key(
+        "users_tenant_id_fkey", "users", "tenants", ["tenant_id"], ["id"],
+        source_schema="auth", referent_schema="core",
+    )
+
+    op.create_table(
+        "companies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(150), nullable=False),
+        sa.Column("tax_id", sa.String(20), nullable=False),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("email", sa.String(100)),
+        sa.Column("contact_person", sa.String(100)),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), sa.ForeignKey("core.tenants.id"), nullable=True),
+        *_timestamps(),
+        *_audit(),
+        sa.UniqueConstraint("tenant_id", "tax_id", name="uq_company_tenant_tax_id"),
+        schema="business",
+    )
+    op.create_index("ix_business_companies_id", "companies", ["id"], schema="business")
+    op.create_index("ix_business_companies_name", "companies", ["name"], schema="business")
+    op.create_index("ix_business_companies_tax_id", "companies", ["tax_id"], schema="business")
+
+    op.create_table(
+        "daily_request_status",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(20), nullable=False, unique=True),
+        sa.Column("description", sa.String(100)),
+        *_timestamps(),
+        *_audit(),
+        schema="business",
+    )
+    op.create_index("ix_business_daily_request_status_id", "daily_request_status", ["id"], schema="business")
+
+    op.create_table(
+        "daily_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("business.companies.id"), nullable=False),
+        sa.Column("request_date", sa.Date(), nullable=False),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("business.daily_request_status.id"), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), sa.ForeignKey("core.tenants.id"), nullable=True),
+        *_timestamps(),
+        *_audit(),
+        schema="business",
+    )
+    op.create_index("ix_business_daily_requests_id", "daily_requests", ["id"], schema="business")
+
+    op.create_table(
+        "work_shifts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("request_id", sa.Integer(), sa.ForeignKey("business.daily_requests.id"), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), sa.ForeignKey("core.tenants.id"), nullable=True),
+        sa.Column("start_time", sa.DateTime(timezone=False), nullable=False),
+        sa.Column("end_time", sa.DateTime(timezone=False), nullable=False),
+        sa.Column("payment_amount", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("has_discount", sa.Boolean(), nullable=False),
+        sa.Column("discount_percentage", sa.Float()),
+        *_timestamps(),
+        *_audit(),
+        schema="business",
+    )
+    op.create_index("ix_business_work_shifts_id", "work_shifts", ["id"], schema="business")
+
+    op.create_table(
+        "shift_assignments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("shift_id", sa.Integer(), sa.ForeignKey("business.work_shifts.id"), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), sa.ForeignKey("core.tenants.id"), nullable=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("auth.users.id"), nullable=False),
+        sa.Column("status", sa.String(20), server_default="ASIGNADO", nullable=False),
+        *_timestamps(),
+        *_audit(),
+        schema="business",
+    )
+    op.create_index("ix_business_shift_assignments_id", "shift_assignments", ["id"], schema="business")
+
+
+def downgrade():
+    op.drop_table("shift_assignments", schema="business")
+    op.drop_table("work_shifts", schema="business")
+    op.drop_table("daily_requests", schema="business")
+    op.drop_table("daily_request_status", schema="business")
+    op.drop_table("companies", schema="business")
+    op.drop_constraint("users_tenant_id_fkey", "users", schema="auth", type_="foreignkey")
+    op.drop_table("tenants", schema="core")
+    op.drop_table("users", schema="auth")
@@ -0,0 +1,55 @@
+"""Índices de la paginación por cursor y tabla del resumen diario de reportes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Usa IF NOT EXISTS: en bases creadas con init_db.py estos objetos pueden existir ya.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_daily_requests_tenant_date_id", "daily_requests",
+        ["tenant_id", sa.text("request_date DESC"), "id"], schema="business", if_not_exists=True,
+    )
+    op.create_index(
+        "ix_users_tenant_listing", "users",
+        ["tenant_id", sa.text("is_active DESC"), "first_name", "last_name", "id"], schema="auth", if_not_exists=True,
+    )
+    op.create_index(
+        "ix_companies_tenant_name_id", "companies",
+        ["tenant_id", "name", "id"], schema="business", if_not_exists=True,
+    )
+
+    op.create_table(
+        "daily_assignment_rollups",
+        sa.Column("tenant_id", sa.BigInteger(), primary_key=True, nullable=False),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("business.companies.id"), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("auth.users.id"), primary_key=True),
+        sa.Column("request_date", sa.Date(), primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("assignment_count", sa.Integer(), nullable=False),
+        sa.Column("gross_amount", sa.Float(), nullable=False),
+        sa.Column("discounted_amount", sa.Float(), nullable=False),
+        schema="business",
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_daily_assignment_rollups_tenant_date", "daily_assignment_rollups",
+        ["tenant_id", "request_date"], schema="business", if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("daily_assignment_rollups", schema="business")
+    op.drop_index("ix_companies_tenant_name_id", table_name="companies", schema="business")
+    op.drop_index("ix_users_tenant_listing", table_name="users", schema="auth")
+    op.drop_index("ix_daily_requests_tenant_date_id", table_name="daily_requests", schema="business")
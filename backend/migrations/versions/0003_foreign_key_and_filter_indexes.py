@@ -0,0 +1,41 @@
+"""Índices de llaves foráneas y filtros frecuentes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Se crean CONCURRENTLY para no bloquear escrituras en bases con datos
+(por eso fuera de la transacción de la migración).
+daily_requests(tenant_id, request_date) ya lo cubre ix_daily_requests_tenant_date_id (0002).
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas, esquema, único)
+INDEXES = [
+    ("ix_tenants_uuid", "tenants", ["uuid"], "core", True),
+    ("ix_daily_requests_company_date", "daily_requests", ["company_id", "request_date"], "business", False),
+    ("ix_work_shifts_request_id", "work_shifts", ["request_id"], "business", False),
+    ("ix_shift_assignments_shift_id", "shift_assignments", ["shift_id"], "business", False),
+    ("ix_shift_assignments_employee_id", "shift_assignments", ["employee_id"], "business", False),
+    ("ix_shift_assignments_tenant_status", "shift_assignments", ["tenant_id", "status"], "business", False),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, schema, unique in INDEXES:
+            op.create_index(
+                name, table, columns, schema=schema, unique=unique,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, schema, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, schema=schema, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,185 @@
+"""Particionado mensual de solicitudes, turnos y asignaciones por request_date
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+daily_requests, work_shifts y shift_assignments pasan a estar particionadas
+por RANGE (request_date), una partición por mes. Turnos y asignaciones reciben
+la columna request_date (copiada de su solicitud) y las llaves primarias y
+foráneas pasan a ser compuestas (id, request_date).
+
+Reescribe las tres tablas completas (se copian a las nuevas, bloqueando
+escrituras mientras dura): correr en una ventana de mantenimiento.
+Los ids y sus secuencias se conservan. Se crean particiones desde el mes más
+antiguo con datos hasta PREMAKE_MONTHS meses después del actual; las
+siguientes las crea scripts/ensure_partitions.py (app/db/partitions.py).
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "business"
+TABLES = ["daily_requests", "work_shifts", "shift_assignments"]
+PREMAKE_MONTHS = 3
+
+# Llaves foráneas simples por tabla: (columna, tabla referenciada)
+FOREIGN_KEYS = {
+    "daily_requests": [
+        ("company_id", "business.companies"), ("status_id", "business.daily_request_status"),
+        ("tenant_id", "core.tenants"), ("created_by", "auth.users"), ("updated_by", "auth.users"),
+    ],
+    "work_shifts": [("tenant_id", "core.tenants"), ("created_by", "auth.users"), ("updated_by", "auth.users")],
+    "shift_assignments": [
+        ("tenant_id", "core.tenants"), ("employee_id", "auth.users"),
+        ("created_by", "auth.users"), ("updated_by", "auth.users"),
+    ],
+}
+# Hijo -> (columna, padre)
+PARENTS = {"work_shifts": ("request_id", "daily_requests"), "shift_assignments": ("shift_id", "work_shifts")}
+
+# (nombre, tabla, columnas) — los mismos índices de 0001-0003, ahora en cada partición
+INDEXES = [
+    ("ix_business_daily_requests_id", "daily_requests", "id"),
+    ("ix_daily_requests_tenant_date_id", "daily_requests", "tenant_id, request_date DESC, id"),
+    ("ix_daily_requests_company_date", "daily_requests", "company_id, request_date"),
+    ("ix_business_work_shifts_id", "work_shifts", "id"),
+    ("ix_work_shifts_request_id", "work_shifts", "request_id"),
+    ("ix_business_shift_assignments_id", "shift_assignments", "id"),
+    ("ix_shift_assignments_shift_id", "shift_assignments", "shift_id"),
+    ("ix_shift_assignments_employee_id", "shift_assignments", "employee_id"),
+    ("ix_shift_assignments_tenant_status", "shift_assignments", "tenant_id, status"),
+]
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _months(first: date, last: date):
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = _next_month(month)
+
+
+def _sequences(bind) -> dict:
+    return {
+        table: bind.execute(sa.text(f"SELECT pg_get_serial_sequence('{SCHEMA}.{table}', 'id')")).scalar()
+        for table in TABLES
+    }
+
+
+def _release_sequences(sequences):
+    # Sin esto, borrar la tabla vieja borraría la secuencia de sus ids
+    for sequence in sequences.values():
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+
+
+def _own_sequences(sequences):
+    for table, sequence in sequences.items():
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {SCHEMA}.{table}.id")
+
+
+def _add_constraints(partitioned: bool):
+    key = "id, request_date" if partitioned else "id"
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY ({key})")
+    for table in TABLES:
+        for column, referenced in FOREIGN_KEYS[table]:
+            op.execute(f"ALTER TABLE {SCHEMA}.{table} ADD FOREIGN KEY ({column}) REFERENCES {referenced} (id)")
+        if table in PARENTS:
+            column, parent = PARENTS[table]
+            if partitioned:
+                op.execute(
+                    f"ALTER TABLE {SCHEMA}.{table} ADD FOREIGN KEY ({column}, request_date) "
+                    f"REFERENCES {SCHEMA}.{parent} (id, request_date) ON UPDATE CASCADE"
+                )
+            else:
+                op.execute(f"ALTER TABLE {SCHEMA}.{table} ADD FOREIGN KEY ({column}) REFERENCES {SCHEMA}.{parent} (id)")
+    for name, table, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {SCHEMA}.{table} ({columns})")
+
+
+def upgrade():
+    bind = op.get_bind()
+    sequences = _sequences(bind)
+    first_day = bind.execute(sa.text(f"SELECT min(request_date) FROM {SCHEMA}.daily_requests")).scalar()
+    current = date.today().replace(day=1)
+    last_month = current
+    for _ in range(PREMAKE_MONTHS):
+        last_month = _next_month(last_month)
+
+    _release_sequences(sequences)
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {SCHEMA}.{table} RENAME TO {table}_old")
+
+    # Tablas nuevas (mismas columnas y defaults; turnos y asignaciones + request_date)
+    op.execute(
+        f"CREATE TABLE {SCHEMA}.daily_requests (LIKE {SCHEMA}.daily_requests_old INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (request_date)"
+    )
+    for table in ("work_shifts", "shift_assignments"):
+        op.execute(
+            f"CREATE TABLE {SCHEMA}.{table} (LIKE {SCHEMA}.{table}_old INCLUDING DEFAULTS, request_date date NOT NULL) "
+            "PARTITION BY RANGE (request_date)"
+        )
+    for month in _months(min(first_day or current, current), last_month):
+        for table in TABLES:
+            op.execute(
+                f"CREATE TABLE {SCHEMA}.{table}_p{month:%Y_%m} PARTITION OF {SCHEMA}.{table} "
+                f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+            )
+
+    # Copia (la fecha de turnos y asignaciones sale de su solicitud)
+    op.execute(f"INSERT INTO {SCHEMA}.daily_requests SELECT * FROM {SCHEMA}.daily_requests_old")
+    op.execute(
+        f"INSERT INTO {SCHEMA}.work_shifts SELECT ws.*, dr.request_date FROM {SCHEMA}.work_shifts_old ws "
+        f"JOIN {SCHEMA}.daily_requests_old dr ON dr.id = ws.request_id"
+    )
+    op.execute(
+        f"INSERT INTO {SCHEMA}.shift_assignments SELECT sa.*, ws.request_date FROM {SCHEMA}.shift_assignments_old sa "
+        f"JOIN {SCHEMA}.work_shifts ws ON ws.id = sa.shift_id"
+    )
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE {SCHEMA}.{table}_old")
+
+    _add_constraints(partitioned=True)
+    _own_sequences(sequences)
+    for table in TABLES:
+        op.execute(f"ANALYZE {SCHEMA}.{table}")
+
+
+def downgrade():
+    bind = op.get_bind()
+    sequences = _sequences(bind)
+    columns = {
+        table: [c["name"] for c in sa.inspect(bind).get_columns(table, schema=SCHEMA)]
+        for table in TABLES
+    }
+
+    _release_sequences(sequences)
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {SCHEMA}.{table} RENAME TO {table}_partitioned")
+
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE {SCHEMA}.{table}_partitioned INCLUDING DEFAULTS)")
+        kept = columns[table]
+        if table in PARENTS:
+            op.execute(f"ALTER TABLE {SCHEMA}.{table} DROP COLUMN request_date")
+            kept = [c for c in kept if c != "request_date"]
+        column_list = ", ".join(kept)
+        op.execute(
+            f"INSERT INTO {SCHEMA}.{table} ({column_list}) SELECT {column_list} FROM {SCHEMA}.{table}_partitioned"
+        )
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE {SCHEMA}.{table}_partitioned")
+
+    _add_constraints(partitioned=False)
+    _own_sequences(sequences)
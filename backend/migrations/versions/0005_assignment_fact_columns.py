@@ -0,0 +1,138 @@
+"""Hechos denormalizados en shift_assignments (empresa, estado de la solicitud y montos)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+Los reportes de pagos y de estadísticas de asistencia leían
+asignación -> turno -> solicitud -> empresa solo para la fecha, la empresa, el
+tenant y el monto con descuento. Ahora la asignación los trae:
+- company_id, request_status_id y tenant_id (de la solicitud; request_date ya estaba)
+- payment_amount y final_amount (monto del turno y con el descuento aplicado)
+
+Triggers (para escrituras por fuera de requests_crud):
+- BEFORE INSERT / UPDATE OF shift_id en shift_assignments: completa los hechos
+  que lleguen vacíos (o todos, si cambió el turno).
+- AFTER UPDATE en work_shifts (montos) y daily_requests (empresa, estado, tenant):
+  los copia a sus asignaciones.
+
+Rellenar la tabla reescribe todas las asignaciones: correr en una ventana de mantenimiento.
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "business"
+FINAL_AMOUNT_SQL = (
+    "CASE WHEN {s}.has_discount THEN {s}.payment_amount * (1 - coalesce({s}.discount_percentage, 0) / 100.0) "
+    "ELSE {s}.payment_amount END"
+)
+
+FILL_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.shift_assignments_fill_facts() RETURNS trigger AS $$
+DECLARE
+    shift_changed boolean := TG_OP = 'UPDATE' AND NEW.shift_id IS DISTINCT FROM OLD.shift_id;
+BEGIN
+    IF shift_changed OR NEW.company_id IS NULL OR NEW.request_status_id IS NULL
+       OR NEW.payment_amount IS NULL OR NEW.final_amount IS NULL THEN
+        SELECT dr.company_id, dr.status_id, coalesce(dr.tenant_id, NEW.tenant_id),
+               ws.payment_amount, {FINAL_AMOUNT_SQL.format(s="ws")}
+          INTO NEW.company_id, NEW.request_status_id, NEW.tenant_id, NEW.payment_amount, NEW.final_amount
+          FROM {SCHEMA}.work_shifts ws
+          JOIN {SCHEMA}.daily_requests dr ON dr.id = ws.request_id AND dr.request_date = ws.request_date
+         WHERE ws.id = NEW.shift_id AND ws.request_date = NEW.request_date;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SHIFT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.work_shifts_sync_facts() RETURNS trigger AS $$
+BEGIN
+    UPDATE {SCHEMA}.shift_assignments sa
+       SET payment_amount = NEW.payment_amount, final_amount = {FINAL_AMOUNT_SQL.format(s="NEW")}
+     WHERE sa.shift_id = NEW.id AND sa.request_date = NEW.request_date
+       AND (sa.payment_amount, sa.final_amount)
+           IS DISTINCT FROM (NEW.payment_amount, {FINAL_AMOUNT_SQL.format(s="NEW")});
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+REQUEST_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.daily_requests_sync_facts() RETURNS trigger AS $$
+BEGIN
+    UPDATE {SCHEMA}.shift_assignments sa
+       SET company_id = NEW.company_id, request_status_id = NEW.status_id,
+           tenant_id = coalesce(NEW.tenant_id, sa.tenant_id)
+      FROM {SCHEMA}.work_shifts ws
+     WHERE ws.request_id = NEW.id AND ws.request_date = NEW.request_date
+       AND sa.shift_id = ws.id AND sa.request_date = NEW.request_date
+       AND (sa.company_id, sa.request_status_id, sa.tenant_id)
+           IS DISTINCT FROM (NEW.company_id, NEW.status_id, coalesce(NEW.tenant_id, sa.tenant_id));
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# (nombre, tabla, momento y eventos, función)
+TRIGGERS = [
+    ("trg_shift_assignments_fill_facts", "shift_assignments", "BEFORE INSERT OR UPDATE OF shift_id",
+     "shift_assignments_fill_facts"),
+    ("trg_work_shifts_sync_facts", "work_shifts",
+     "AFTER UPDATE OF payment_amount, has_discount, discount_percentage", "work_shifts_sync_facts"),
+    ("trg_daily_requests_sync_facts", "daily_requests", "AFTER UPDATE OF company_id, status_id, tenant_id",
+     "daily_requests_sync_facts"),
+]
+
+
+def upgrade():
+    for column, definition in [
+        ("company_id", "integer"), ("request_status_id", "integer"),
+        ("payment_amount", "double precision"), ("final_amount", "double precision"),
+    ]:
+        op.execute(f"ALTER TABLE {SCHEMA}.shift_assignments ADD COLUMN {column} {definition}")
+
+    # Relleno (el tenant de la asignación pasa a ser el de su solicitud)
+    op.execute(f"""
+        UPDATE {SCHEMA}.shift_assignments sa
+           SET company_id = dr.company_id, request_status_id = dr.status_id,
+               tenant_id = coalesce(dr.tenant_id, sa.tenant_id),
+               payment_amount = ws.payment_amount, final_amount = {FINAL_AMOUNT_SQL.format(s="ws")}
+          FROM {SCHEMA}.work_shifts ws
+          JOIN {SCHEMA}.daily_requests dr ON dr.id = ws.request_id AND dr.request_date = ws.request_date
+         WHERE ws.id = sa.shift_id AND ws.request_date = sa.request_date
+    """)
+    for column in ("company_id", "request_status_id", "payment_amount", "final_amount"):
+        op.execute(f"ALTER TABLE {SCHEMA}.shift_assignments ALTER COLUMN {column} SET NOT NULL")
+    op.execute(f"ALTER TABLE {SCHEMA}.shift_assignments ADD FOREIGN KEY (company_id) REFERENCES {SCHEMA}.companies (id)")
+    op.execute(
+        f"ALTER TABLE {SCHEMA}.shift_assignments ADD FOREIGN KEY (request_status_id) "
+        f"REFERENCES {SCHEMA}.daily_request_status (id)"
+    )
+    op.execute(
+        f"CREATE INDEX ix_shift_assignments_tenant_date_status "
+        f"ON {SCHEMA}.shift_assignments (tenant_id, request_date, status)"
+    )
+
+    for function in (FILL_FUNCTION, SHIFT_FUNCTION, REQUEST_FUNCTION):
+        op.execute(function)
+    for name, table, timing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {timing} ON {SCHEMA}.{table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {SCHEMA}.{function}()"
+        )
+    op.execute(f"ANALYZE {SCHEMA}.shift_assignments")
+
+
+def downgrade():
+    for name, table, _, function in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {SCHEMA}.{table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.{function}()")
+    op.execute(f"DROP INDEX IF EXISTS {SCHEMA}.ix_shift_assignments_tenant_date_status")
+    for column in ("final_amount", "payment_amount", "request_status_id", "company_id"):
+        op.execute(f"ALTER TABLE {SCHEMA}.shift_assignments DROP COLUMN {column}")
@@ -0,0 +1,64 @@
+"""Plantillas de escala recurrentes (schedule_templates y sus turnos)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _audit_columns():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("auth.users.id"), nullable=False),
+        sa.Column("updated_by", sa.Integer(), sa.ForeignKey("auth.users.id"), nullable=True),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        "schedule_templates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("business.companies.id"), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), sa.ForeignKey("core.tenants.id"), nullable=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("weekday_mask", sa.Integer(), server_default=sa.text("31"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        *_audit_columns(),
+        schema="business",
+    )
+    op.create_index("ix_business_schedule_templates_id", "schedule_templates", ["id"], schema="business")
+    op.create_index("ix_business_schedule_templates_company_id", "schedule_templates", ["company_id"], schema="business")
+
+    op.create_table(
+        "schedule_template_shifts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "template_id", sa.Integer(),
+            sa.ForeignKey("business.schedule_templates.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("payment_amount", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("has_discount", sa.Boolean(), nullable=False),
+        sa.Column("discount_percentage", sa.Float(), nullable=True),
+        schema="business",
+    )
+    op.create_index("ix_business_schedule_template_shifts_id", "schedule_template_shifts", ["id"], schema="business")
+    op.create_index(
+        "ix_business_schedule_template_shifts_template_id", "schedule_template_shifts", ["template_id"], schema="business"
+    )
+
+
+def downgrade():
+    op.drop_table("schedule_template_shifts", schema="business")
+    op.drop_table("schedule_templates", schema="business")
@@ -0,0 +1,132 @@
+"""El tenant de una solicitud (y de sus asignaciones) es siempre el de su empresa
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+Los reportes sobre datos crudos filtran por daily_requests.tenant_id /
+shift_assignments.tenant_id y el resumen diario se agrupa por el tenant de las
+asignaciones. Una solicitud creada por un usuario sin tenant quedaba con
+tenant_id NULL y el mismo reporte cambiaba según el largo del rango. Ahora:
+- BEFORE INSERT / UPDATE OF company_id, tenant_id en daily_requests: el tenant
+  sale de la empresa.
+- AFTER UPDATE OF tenant_id en companies: lo copia a sus solicitudes.
+- Los hechos de las asignaciones copian el tenant de la solicitud tal cual (sin
+  conservar el suyo si la solicitud no tiene).
+Se corrigen las filas existentes; el resumen no cambia (ya se agrupaba por el
+tenant de la empresa).
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "business"
+FINAL_AMOUNT_SQL = (
+    "CASE WHEN {s}.has_discount THEN {s}.payment_amount * (1 - coalesce({s}.discount_percentage, 0) / 100.0) "
+    "ELSE {s}.payment_amount END"
+)
+
+
+def _fill_function(tenant_sql: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.shift_assignments_fill_facts() RETURNS trigger AS $$
+DECLARE
+    shift_changed boolean := TG_OP = 'UPDATE' AND NEW.shift_id IS DISTINCT FROM OLD.shift_id;
+BEGIN
+    IF shift_changed OR NEW.company_id IS NULL OR NEW.request_status_id IS NULL
+       OR NEW.payment_amount IS NULL OR NEW.final_amount IS NULL THEN
+        SELECT dr.company_id, dr.status_id, {tenant_sql},
+               ws.payment_amount, {FINAL_AMOUNT_SQL.format(s="ws")}
+          INTO NEW.company_id, NEW.request_status_id, NEW.tenant_id, NEW.payment_amount, NEW.final_amount
+          FROM {SCHEMA}.work_shifts ws
+          JOIN {SCHEMA}.daily_requests dr ON dr.id = ws.request_id AND dr.request_date = ws.request_date
+         WHERE ws.id = NEW.shift_id AND ws.request_date = NEW.request_date;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _request_function(tenant_sql: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.daily_requests_sync_facts() RETURNS trigger AS $$
+BEGIN
+    UPDATE {SCHEMA}.shift_assignments sa
+       SET company_id = NEW.company_id, request_status_id = NEW.status_id, tenant_id = {tenant_sql}
+      FROM {SCHEMA}.work_shifts ws
+     WHERE ws.request_id = NEW.id AND ws.request_date = NEW.request_date
+       AND sa.shift_id = ws.id AND sa.request_date = NEW.request_date
+       AND (sa.company_id, sa.request_status_id, sa.tenant_id)
+           IS DISTINCT FROM (NEW.company_id, NEW.status_id, {tenant_sql});
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+REQUEST_TENANT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.daily_requests_company_tenant() RETURNS trigger AS $$
+BEGIN
+    NEW.tenant_id := (SELECT c.tenant_id FROM {SCHEMA}.companies c WHERE c.id = NEW.company_id);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+COMPANY_TENANT_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {SCHEMA}.companies_sync_request_tenant() RETURNS trigger AS $$
+BEGIN
+    UPDATE {SCHEMA}.daily_requests SET tenant_id = NEW.tenant_id
+     WHERE company_id = NEW.id AND tenant_id IS DISTINCT FROM NEW.tenant_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# (nombre, tabla, momento y eventos, función)
+TRIGGERS = [
+    ("trg_daily_requests_company_tenant", "daily_requests", "BEFORE INSERT OR UPDATE OF company_id, tenant_id",
+     "daily_requests_company_tenant"),
+    ("trg_companies_sync_request_tenant", "companies", "AFTER UPDATE OF tenant_id",
+     "companies_sync_request_tenant"),
+]
+
+
+def upgrade():
+    op.execute(_fill_function("dr.tenant_id"))
+    op.execute(_request_function("NEW.tenant_id"))
+    for function in (REQUEST_TENANT_FUNCTION, COMPANY_TENANT_FUNCTION):
+        op.execute(function)
+    for name, table, timing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {timing} ON {SCHEMA}.{table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {SCHEMA}.{function}()"
+        )
+
+    # Solicitudes con otro tenant que su empresa (el trigger de hechos lo copia a sus asignaciones)
+    op.execute(f"""
+        UPDATE {SCHEMA}.daily_requests dr SET tenant_id = c.tenant_id
+          FROM {SCHEMA}.companies c
+         WHERE c.id = dr.company_id AND dr.tenant_id IS DISTINCT FROM c.tenant_id
+    """)
+    # Asignaciones que conservaban su tenant bajo una solicitud sin tenant
+    op.execute(f"""
+        UPDATE {SCHEMA}.shift_assignments sa SET tenant_id = dr.tenant_id
+          FROM {SCHEMA}.work_shifts ws
+          JOIN {SCHEMA}.daily_requests dr ON dr.id = ws.request_id AND dr.request_date = ws.request_date
+         WHERE ws.id = sa.shift_id AND ws.request_date = sa.request_date
+           AND sa.tenant_id IS DISTINCT FROM dr.tenant_id
+    """)
+
+
+def downgrade():
+    for name, table, _, function in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {SCHEMA}.{table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {SCHEMA}.{function}()")
+    # Versiones de 0005
+    op.execute(_fill_function("coalesce(dr.tenant_id, NEW.tenant_id)"))
+    op.execute(_request_function("coalesce(NEW.tenant_id, sa.tenant_id)"))
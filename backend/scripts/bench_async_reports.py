@@ -0,0 +1,95 @@
+"""
+Benchmark: reportes con el stack síncrono vs el asíncrono bajo concurrencia.
+
+El camino síncrono se ejecuta como lo hace FastAPI con endpoints "def": cada
+petición ocupa un hilo de un threadpool de 40 mientras espera a Postgres.
+El camino asíncrono lanza todas las peticiones como corrutinas sobre asyncpg.
+
+Uso: python -m scripts.bench_async_reports --tenant-id 1 --start 2025-01-01 --end 2025-03-31
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal, engine
+from app.db.async_database import AsyncSessionLocal, async_engine
+from app.db import requests_crud, async_requests_crud
+
+# Tamaño por defecto del threadpool de FastAPI/Starlette (anyio)
+THREADPOOL_SIZE = 40
+
+REPORTS = ["get_payments_report", "get_attendance_report", "get_dashboard_stats", "get_attendance_stats"]
+
+
+def _summary(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"  {label:<6} {len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms"
+    )
+
+
+def run_sync(report, concurrency, params):
+    fn = getattr(requests_crud, report)
+
+    def one_call():
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            fn(db, **params)
+        finally:
+            db.close()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as pool:
+        latencies = list(pool.map(lambda _: one_call(), range(concurrency)))
+    _summary("sync", latencies, time.perf_counter() - started)
+
+
+async def run_async(report, concurrency, params):
+    fn = getattr(async_requests_crud, report)
+
+    async def one_call():
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await fn(db, **params)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one_call() for _ in range(concurrency)))
+    _summary("async", latencies, time.perf_counter() - started)
+
+
+async def main(args):
+    params = {
+        "start_date": date.fromisoformat(args.start),
+        "end_date": date.fromisoformat(args.end),
+        "tenant_id": args.tenant_id,
+    }
+    for report in REPORTS:
+        for concurrency in args.concurrency:
+            print(f"{report} (concurrencia={concurrency})")
+            run_sync(report, concurrency, params)
+            await run_async(report, concurrency, params)
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant-id", type=int, default=None)
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    asyncio.run(main(parser.parse_args()))
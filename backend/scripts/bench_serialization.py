@@ -0,0 +1,89 @@
+"""
+Benchmark: CPU de serialización por petición en /daily-requests/ y /report/attendance.
+
+Compara, con los mismos datos ya cargados de la base:
+- validado: lo que hacía FastAPI con response_model (valida los objetos ORM con
+  from_attributes y serializa con Pydantic).
+- confianza: dump_orm + TrustedJSONResponse (sin revalidar, orjson si está instalado).
+
+Mide solo la serialización (la consulta se hace una vez) y comprueba que ambos
+caminos producen el mismo JSON.
+
+Uso: python -m scripts.bench_serialization --tenant-id 1 --start 2025-01-01 --end 2025-01-31
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import List
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import TrustedJSONResponse, dump_orm_list
+from app.db.database import SessionLocal
+from app.db import requests_crud
+from app.schemas.request_schemas import DailyRequestResponse, AttendanceReportItem
+
+
+def _cpu_per_call(fn, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat
+
+
+def compare(label, validated, trusted, repeat):
+    assert json.loads(validated()) == json.loads(trusted()), f"{label}: los dos caminos difieren"
+    validated_cpu = _cpu_per_call(validated, repeat)
+    trusted_cpu = _cpu_per_call(trusted, repeat)
+    print(
+        f"  {label:<32} validado {validated_cpu * 1000:8.2f} ms   "
+        f"confianza {trusted_cpu * 1000:8.2f} ms   ahorro {(validated_cpu - trusted_cpu) * 1000:8.2f} ms "
+        f"({1 - trusted_cpu / validated_cpu:.0%})"
+    )
+
+
+def main(args):
+    params = {
+        "start_date": date.fromisoformat(args.start),
+        "end_date": date.fromisoformat(args.end),
+        "tenant_id": args.tenant_id,
+    }
+    db = SessionLocal()
+    try:
+        page = requests_crud.get_daily_requests(db, limit=args.limit, tenant_id=args.tenant_id)
+        attendance = requests_crud.get_attendance_report(db, **params)
+
+        print("/daily-requests/")
+        adapter = TypeAdapter(List[DailyRequestResponse])
+        compare(
+            f"{len(page)} solicitudes",
+            lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)),
+            lambda: TrustedJSONResponse(dump_orm_list(page, DailyRequestResponse)).body,
+            args.repeat,
+        )
+
+        print("/report/attendance")
+        adapter = TypeAdapter(List[AttendanceReportItem])
+        compare(
+            f"{len(attendance)} filas",
+            lambda: adapter.dump_json(adapter.validate_python(attendance)),
+            lambda: TrustedJSONResponse(attendance).body,
+            args.repeat,
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant-id", type=int, default=None)
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--limit", type=int, default=100, help="Tamaño de página del listado")
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,47 @@
+"""
+Crea las particiones mensuales de solicitudes, turnos y asignaciones.
+
+Correr por cron (ej: una vez al día): crea el mes actual y los
+PARTITION_PREMAKE_MONTHS siguientes si todavía no existen. Con --start/--end
+crea un rango cualquiera (ej: antes de cargar datos históricos).
+
+Uso:
+  python -m scripts.ensure_partitions
+  python -m scripts.ensure_partitions --months-ahead 6
+  python -m scripts.ensure_partitions --start 2020-01-01 --end 2022-12-31
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+
+from app.db import partitions
+from app.db.database import SQLALCHEMY_DATABASE_URL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea las particiones mensuales que falten")
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--months-ahead", type=int, default=None, help="Por defecto PARTITION_PREMAKE_MONTHS")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    try:
+        with engine.begin() as connection:
+            if args.start or args.end:
+                created = partitions.ensure_partitions(connection, args.start or date.today(), args.end or date.today())
+            else:
+                created = partitions.ensure_upcoming(connection, args.months_ahead)
+        print(f"Particiones creadas: {', '.join(created)}" if created else "No faltaban particiones.")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
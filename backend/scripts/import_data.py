@@ -0,0 +1,54 @@
+"""
+Importación masiva de usuarios o empresas desde la terminal.
+
+Uso:
+  python -m scripts.import_data users contratados.csv --tenant-id 1
+  python -m scripts.import_data companies empresas.json --tenant-id 1 --created-by 1
+"""
+
+import argparse
+import json
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal
+from app.db import bulk_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa usuarios o empresas desde CSV, JSON o NDJSON")
+    parser.add_argument("kind", choices=["users", "companies"])
+    parser.add_argument("path")
+    parser.add_argument("--tenant-id", type=int, default=None)
+    parser.add_argument("--created-by", type=int, help="ID del usuario auditor (obligatorio para empresas)")
+    parser.add_argument("--format", choices=bulk_import.SUPPORTED_FORMATS, default=None)
+    parser.add_argument("--chunk-size", type=int, default=bulk_import.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.kind == "companies" and not args.created_by:
+        parser.error("--created-by es obligatorio para importar empresas")
+
+    fmt = args.format or bulk_import.detect_format(args.path)
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            try:
+                # Valida el archivo completo antes del primer commit
+                rows = bulk_import.read_rows(f, fmt)
+            except ValueError as e:
+                parser.error(f"{args.path}: {e}")
+            if args.kind == "users":
+                report = bulk_import.import_users(db, rows, tenant_id=args.tenant_id, chunk_size=args.chunk_size)
+            else:
+                report = bulk_import.import_companies(db, rows, user_id=args.created_by, tenant_id=args.tenant_id, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    print(f"Filas: {report['total']}  Creadas: {report['created']}  Con error: {len(report['errors'])}")
+    for error in report["errors"]:
+        print(json.dumps(error, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
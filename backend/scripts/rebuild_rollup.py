@@ -0,0 +1,37 @@
+"""
+Reconstruye el resumen diario de asignaciones (daily_assignment_rollups).
+
+Necesario una vez al crear la tabla en una base existente; después el resumen
+se mantiene solo con cada escritura.
+
+Uso:
+  python -m scripts.rebuild_rollup
+  python -m scripts.rebuild_rollup --start 2025-01-01 --end 2025-03-31
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.database import SessionLocal
+from app.db import report_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye el resumen diario de asignaciones")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report_rollup.rebuild(db, args.start, args.end)
+        print("Resumen reconstruido.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
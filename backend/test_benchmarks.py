@@ -0,0 +1,26 @@
+from benchmarks.run import compare
+
+BASELINE = {"scales": {"10000": {
+    "requests.get_daily_requests": {"p50_ms": 10.0, "p95_ms": 12.0, "mean_ms": 10.5, "queries": 4},
+    "GET /users/": {"p50_ms": 0.5, "p95_ms": 0.6, "mean_ms": 0.5, "queries": 1},
+}}}
+
+def _results(**cases):
+    return {"scales": {"10000": cases}}
+
+def test_sin_regresion_dentro_del_umbral():
+    results = _results(**{"requests.get_daily_requests": {"p50_ms": 11.5, "queries": 4}})
+    assert compare(results, BASELINE, threshold=0.2) == []
+
+def test_regresion_de_latencia():
+    results = _results(**{"requests.get_daily_requests": {"p50_ms": 13.0, "queries": 4}})
+    assert compare(results, BASELINE, threshold=0.2) == ["[10000] requests.get_daily_requests: p50 10.00 -> 13.00 ms (+30%)"]
+
+def test_mas_consultas_es_regresion():
+    results = _results(**{"requests.get_daily_requests": {"p50_ms": 10.0, "queries": 25}})
+    assert compare(results, BASELINE, threshold=0.2) == ["[10000] requests.get_daily_requests: 4 -> 25 consultas"]
+
+def test_diferencias_minimas_y_casos_nuevos_se_ignoran():
+    # +60% pero menos de 1 ms; el caso nuevo no está en la línea base
+    results = _results(**{"GET /users/": {"p50_ms": 0.8, "queries": 1}, "nuevo": {"p50_ms": 99.0, "queries": 9}})
+    assert compare(results, BASELINE, threshold=0.2) == []
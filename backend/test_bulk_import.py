@@ -0,0 +1,21 @@
+import io
+import pytest
+from app.db.bulk_import import RowError, read_rows
+
+def test_linea_ndjson_ilegible_es_error_de_esa_fila():
+    data = b'{"name": "A"}\n{"name": \n{"name": "C"}\n'
+    rows = list(read_rows(io.BytesIO(data), "ndjson"))
+    assert rows[0] == {"name": "A"} and rows[2] == {"name": "C"}
+    assert isinstance(rows[1], RowError)
+
+def test_csv_con_campo_gigante_no_corta_la_importacion():
+    data = b"name,tax_id\nA,1\n" + b"B" * 200000 + b",2\nC,3\n"
+    rows = list(read_rows(io.BytesIO(data), "csv"))
+    assert isinstance(rows[1], RowError)
+    assert rows[2] == {"name": "C", "tax_id": "3"}
+
+def test_utf8_invalido_se_rechaza_antes_de_importar():
+    """El error sale de read_rows, antes de que el import haga el primer commit."""
+    data = b"name,tax_id\n" + b"A,1\n" * 5000 + b"\xff\xfe,2\n"
+    with pytest.raises(ValueError):
+        read_rows(io.BytesIO(data), "csv")
@@ -0,0 +1,29 @@
+import asyncio
+import json
+from datetime import date
+from app.core.exports import encode
+
+FIELDS = ["date", "employee_name", "amount"]
+
+async def _batches(*batches):
+    for rows in batches:
+        yield rows
+
+def _collect(fmt, *batches):
+    async def run():
+        return "".join([chunk async for chunk in encode(_batches(*batches), fmt, FIELDS)])
+    return asyncio.run(run())
+
+def test_csv_por_lotes():
+    text = _collect("csv", [{"date": date(2025, 1, 2), "employee_name": "Ana Souza", "amount": 100.0}], [{"date": date(2025, 1, 3), "employee_name": "João, Jr", "amount": 80.5}])
+    lines = text.splitlines()
+    assert lines[0] == "date,employee_name,amount"
+    assert lines[1] == "2025-01-02,Ana Souza,100.0"
+    assert lines[2] == '2025-01-03,"João, Jr",80.5'
+
+def test_csv_sin_filas_devuelve_cabecera():
+    assert _collect("csv").splitlines() == ["date,employee_name,amount"]
+
+def test_ndjson_una_fila_por_linea():
+    text = _collect("ndjson", [{"date": date(2025, 1, 2), "employee_name": "Ana", "amount": 1.5}])
+    assert json.loads(text.splitlines()[0]) == {"date": "2025-01-02", "employee_name": "Ana", "amount": 1.5}
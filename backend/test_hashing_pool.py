@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import hashing_pool
+from app.core.hashing_pool import HashingBusyError
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool de un solo cupo con hilos en vez de procesos (mismo camino de run())."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(hashing_pool, "_get_executor", lambda: executor)
+    monkeypatch.setattr(hashing_pool, "_slots", threading.BoundedSemaphore(1))
+    yield
+    executor.shutdown()
+
+def test_cola_llena_falla_rapido(pool):
+    """Sin cupo libre run() no encola: lanza HashingBusyError y cuenta el rechazo."""
+    rejected = hashing_pool.get_stats()["rejected"]
+    hashing_pool._slots.acquire()  # Otra operación ocupando el único cupo
+    try:
+        with pytest.raises(HashingBusyError):
+            hashing_pool.run(abs, -1)
+    finally:
+        hashing_pool._slots.release()
+    assert hashing_pool.get_stats()["rejected"] == rejected + 1
+
+def test_cupo_se_libera_tras_cada_operacion(pool):
+    assert hashing_pool.run(abs, -2) == 2
+    assert hashing_pool.run(abs, -3) == 3
+    assert hashing_pool.get_stats()["pending"] == 0
+
+def test_pool_saturado_responde_503_con_retry_after():
+    from app.main import app
+
+    def busy():
+        raise HashingBusyError(retry_after=7)
+    app.add_api_route("/_test/hashing-busy", busy)
+    try:
+        response = TestClient(app).get("/_test/hashing-busy")
+    finally:
+        app.router.routes = [r for r in app.router.routes if getattr(r, "path", None) != "/_test/hashing-busy"]
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert "ocupado" in response.json()["detail"]
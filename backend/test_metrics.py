@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.core import metrics
+
+# Motor propio (SQLite en memoria) para contar consultas sin Postgres
+engine = metrics.instrument_queries(create_engine("sqlite://"), "test")
+
+app = FastAPI()
+app.add_middleware(metrics.MetricsMiddleware)
+
+@app.get("/items/{item_id}")
+def read_item(item_id: int):
+    # Endpoint "def": corre en el threadpool, las consultas deben sumarse igual
+    with engine.connect() as connection:
+        for _ in range(3):
+            connection.execute(text("SELECT 1"))
+    return {"id": item_id}
+
+client = TestClient(app)
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_consultas_por_ruta():
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = _sample("http_request_db_queries_sum", **labels)
+    requests_before = _sample("http_requests_total", status="200", **labels)
+
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+
+    # Etiqueta con la plantilla de la ruta, no con la URL
+    assert _sample("http_requests_total", status="200", **labels) == requests_before + 2
+    assert _sample("http_request_db_queries_sum", **labels) == before + 6
+    assert _sample("db_query_duration_seconds_count", engine="test") >= 6
+
+def test_rutas_inexistentes_comparten_etiqueta():
+    before = _sample("http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404")
+    client.get("/no-existe/1")
+    client.get("/no-existe/2")
+    assert _sample("http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404") == before + 2
+
+def test_formato_prometheus():
+    client.get("/items/3")
+    content, media_type = metrics.render()
+    assert media_type.startswith("text/plain")
+    assert b'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/items/{item_id}"}' in content
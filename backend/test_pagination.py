@@ -0,0 +1,47 @@
+import pytest
+from datetime import date
+from sqlalchemy import Boolean, Column, Date, Integer, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from app.core.pagination import encode_cursor, decode_cursor, keyset_condition, next_cursor
+
+TABLE = Table(
+    "t", MetaData(),
+    Column("request_date", Date, nullable=False), Column("id", Integer, nullable=False),
+    Column("active", Boolean, nullable=False), Column("name", String, nullable=False),
+)
+ORDER_4 = [(TABLE.c.request_date, True), (TABLE.c.id, False), (TABLE.c.active, True), (TABLE.c.name, False)]
+ORDER_2 = [(TABLE.c.request_date, True), (TABLE.c.id, False)]
+
+def test_cursor_ida_y_vuelta():
+    """El cursor debe devolver exactamente los mismos valores (incluidas fechas)."""
+    values = [date(2025, 3, 1), 42, True, "Ana"]
+    cursor = encode_cursor(values)
+    assert decode_cursor(cursor, ORDER_4) == values
+
+@pytest.mark.parametrize("cursor_invalido", ["no-es-base64!!", encode_cursor([1]), encode_cursor({"a": 1})])
+def test_cursor_invalido(cursor_invalido):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor_invalido, ORDER_2)
+
+@pytest.mark.parametrize("values", [
+    ["2025-01-01", 7],                  # fecha como texto plano
+    [date(2025, 1, 1), "7"],            # id como texto
+    [date(2025, 1, 1), True],           # bool no es un id aunque sea int
+    [date(2025, 1, 1), 7.5],
+    [None, 7],
+])
+def test_cursor_con_tipos_que_no_son_los_de_la_columna(values):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_cursor(encode_cursor(values), ORDER_2)
+
+def test_condicion_keyset_orden_mixto():
+    """(fecha desc, id asc) => fecha < :f OR (fecha = :f AND id > :i)"""
+    table = Table("t", MetaData(), Column("request_date", Date), Column("id", Integer))
+    condition = keyset_condition([(table.c.request_date, True), (table.c.id, False)], [date(2025, 1, 1), 7])
+    sql = str(condition.compile(dialect=postgresql.dialect()))
+    assert "t.request_date < " in sql
+    assert "t.request_date = " in sql and "t.id > " in sql
+
+def test_sin_cursor_en_la_ultima_pagina():
+    assert next_cursor([1, 2], 5, lambda x: [x]) is None
+    assert decode_cursor(next_cursor([1, 2], 2, lambda x: [x]), [(TABLE.c.id, False)]) == [2]
@@ -0,0 +1,92 @@
+import redis
+from app.core.rate_limit import CircuitBreaker, LocalSlidingWindow, SlidingWindowRateLimiter
+
+def test_ventana_local_bloquea_al_llegar_al_limite():
+    """El intento número `limite + 1` dentro de la ventana debe bloquearse."""
+    window = LocalSlidingWindow(window_seconds=60)
+    for i in range(1, 4):
+        result = window.hit({"user:a": 3})
+        assert result.allowed is True
+        assert result.counts["user:a"] == i
+
+    blocked = window.hit({"user:a": 3})
+    assert blocked.allowed is False
+    assert blocked.blocked_key == "user:a"
+
+def test_ventana_local_no_registra_intento_bloqueado():
+    """Si la IP está bloqueada, el intento no debe sumar al contador del usuario."""
+    window = LocalSlidingWindow(window_seconds=60)
+    window.hit({"ip:1": 1})
+    result = window.hit({"user:a": 5, "ip:1": 1})
+    assert result.blocked_key == "ip:1"
+
+    window.reset("ip:1")
+    assert window.hit({"user:a": 5, "ip:1": 1}).counts["user:a"] == 1
+
+def test_circuit_breaker_abre_tras_fallos():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.allow_request() is True
+
+def test_limitador_usa_memoria_si_redis_no_responde():
+    """Con Redis caído (puerto cerrado) el login debe seguir limitado en memoria."""
+    pool = redis.ConnectionPool(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    limiter = SlidingWindowRateLimiter(
+        window_seconds=60,
+        client_factory=lambda: redis.Redis(connection_pool=pool),
+        breaker=CircuitBreaker(failure_threshold=1, cooldown=60),
+    )
+
+    assert limiter.hit({"user:a": 2}).allowed is True
+    assert limiter.breaker.is_open
+    assert limiter.hit({"user:a": 2}).allowed is True
+    assert limiter.hit({"user:a": 2}).allowed is False
+
+def test_login_exitoso_no_cuenta_para_la_ip():
+    """forget() descuenta solo ese intento de la IP: los exitosos no llevan a la IP al límite."""
+    window = LocalSlidingWindow(window_seconds=60)
+    for user in ("a", "b", "c"):
+        result = window.hit({f"user:{user}": 5, "ip:1": 2})
+        assert result.allowed is True
+        window.forget("ip:1", result.attempt_id)
+    assert window.hit({"user:d": 5, "ip:1": 2}).counts["ip:1"] == 1
+
+def test_ip_del_cliente_detras_de_proxy_de_confianza(monkeypatch):
+    from types import SimpleNamespace
+    from app.core.config import settings
+    from app.core.rate_limit import client_ip
+
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+    def request(peer, forwarded=None):
+        headers = {"x-forwarded-for": forwarded} if forwarded else {}
+        return SimpleNamespace(client=SimpleNamespace(host=peer), headers=headers)
+
+    assert client_ip(request("10.0.0.5", "203.0.113.7, 10.0.0.9")) == "203.0.113.7"
+    # Un cliente que no pasa por el proxy no puede elegir su IP con el header
+    assert client_ip(request("198.51.100.1", "203.0.113.7")) == "198.51.100.1"
+    assert client_ip(request("10.0.0.5")) == "10.0.0.5"
+
+def test_llenar_la_tabla_no_reinicia_el_contador_de_una_cuenta():
+    """Con Redis caído, muchas llaves nuevas no deben desalojar una llave con intentos vigentes."""
+    window = LocalSlidingWindow(window_seconds=60, max_keys=3)
+    window.hit({"user:victima": 2})
+    for i in range(10):
+        window.hit({f"user:relleno{i}": 2})
+    assert window.hit({"user:victima": 2}).counts["user:victima"] == 2
+    assert window.hit({"user:victima": 2}).allowed is False
+
+def test_desaloja_primero_las_llaves_vencidas(monkeypatch):
+    import app.core.rate_limit as rate_limit
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock["now"])
+    window = LocalSlidingWindow(window_seconds=60, max_keys=2)
+    window.hit({"user:vieja": 5})
+    clock["now"] += 120
+    window.hit({"user:a": 5})
+    window.hit({"user:b": 5})
+    assert "user:vieja" not in window._hits and len(window._hits) == 2
@@ -0,0 +1,50 @@
+from datetime import date
+from app.core.report_cache import cache_key
+
+PARAMS = dict(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), company_id=None, tenant_id=1)
+
+def test_clave_cambia_con_la_version_del_tenant():
+    """Subir la versión del tenant debe producir claves nuevas (invalidación sin borrar)."""
+    assert cache_key("payments", "1", **PARAMS) != cache_key("payments", "2", **PARAMS)
+    assert cache_key("payments", "1", **PARAMS).startswith("report_cache:1:v1:payments:")
+
+def test_clave_por_usuario_solo_para_contratado():
+    """Admin y gerente ven lo mismo; cada contratado ve solo lo suyo."""
+    admin = cache_key("payments", "1", user_id=10, role="admin", **PARAMS)
+    manager = cache_key("payments", "1", user_id=11, role="manager", **PARAMS)
+    assert admin == manager
+    assert cache_key("payments", "1", user_id=20, role="contratado", **PARAMS) != cache_key("payments", "1", user_id=21, role="contratado", **PARAMS)
+
+class FakeAsyncRedis:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+def test_no_guarda_lo_leido_en_la_replica_justo_despues_de_escribir(monkeypatch):
+    """Una réplica atrasada no debe dejar datos viejos bajo la versión nueva durante todo el TTL."""
+    import asyncio
+    from app.core import report_cache
+
+    async def loader():
+        return [{"total": 1}]
+
+    client = FakeAsyncRedis({"report_version:1": "2", "report_bumped:1": "1"})
+    monkeypatch.setattr(report_cache, "get_async_redis_client", lambda: client)
+    assert asyncio.run(report_cache.cached("payments", loader, from_replica=True, **PARAMS)) == [{"total": 1}]
+    assert not any(key.startswith("report_cache:") for key in client.data)
+
+    # Leído en el primario sí se guarda; y en la réplica también una vez pasada la ventana
+    asyncio.run(report_cache.cached("payments", loader, **PARAMS))
+    assert sum(key.startswith("report_cache:") for key in client.data) == 1
+    del client.data["report_bumped:1"]
+    client.data["report_version:1"] = "3"
+    asyncio.run(report_cache.cached("payments", loader, from_replica=True, **PARAMS))
+    assert sum(key.startswith("report_cache:") for key in client.data) == 2
@@ -0,0 +1,35 @@
+import pytest
+from datetime import date
+from sqlalchemy.dialects import postgresql
+from app.db.report_engine import compile_report
+
+START, END = date(2025, 1, 1), date(2025, 1, 31)
+
+def _sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+def test_solo_une_las_tablas_necesarias():
+    """Contar solicitudes por mes no necesita turnos, asignaciones, usuarios ni estados."""
+    sql = _sql(compile_report(["month"], ["request_count"], START, END, tenant_id=1))
+    assert "JOIN" not in sql
+    assert "daily_requests.tenant_id" in sql
+
+def test_estado_lee_solo_los_hechos_de_asignaciones():
+    """Empresa + estado + conteo están en shift_assignments: sin turnos ni solicitudes."""
+    sql = _sql(compile_report(["company", "status"], ["assignment_count"], START, END, tenant_id=1))
+    assert "FROM business.shift_assignments JOIN business.companies" in sql
+    assert "work_shifts" not in sql and "daily_requests" not in sql
+    assert "business.shift_assignments.tenant_id = " in sql
+
+def test_horario_del_turno_une_turnos_y_asignaciones():
+    sql = _sql(compile_report(["shift", "status"], ["discounted_amount"], START, END, aggregate=False))
+    assert "JOIN business.work_shifts" in sql and "JOIN business.shift_assignments" in sql
+    assert "auth.users" not in sql and "daily_request_status" not in sql
+
+def test_filtro_de_contratado_agrega_asignaciones():
+    sql = _sql(compile_report(["company"], ["request_count"], START, END, user_id=7, role="contratado"))
+    assert "business.shift_assignments.employee_id = " in sql
+
+def test_dimension_desconocida():
+    with pytest.raises(ValueError):
+        compile_report(["planeta"], ["request_count"], START, END)
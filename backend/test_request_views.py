@@ -0,0 +1,19 @@
+from app.schemas.request_schemas import daily_request_view_model, DailyRequestResponse
+
+def test_vista_solo_con_campos_pedidos():
+    model = daily_request_view_model(frozenset(), ("id", "request_date", "shift_count"))
+    assert list(model.model_fields) == ["id", "request_date", "shift_count"]
+
+def test_vista_completa_igual_al_modelo_original():
+    """Sin fields, los campos de la cabecera son los de DailyRequestResponse."""
+    model = daily_request_view_model(frozenset({"shifts", "assignments", "employee"}), None)
+    assert set(model.model_fields) == set(DailyRequestResponse.model_fields)
+    shift_model = model.model_fields["shifts"].annotation.__args__[0]
+    assignment_model = shift_model.model_fields["assignments"].annotation.__args__[0]
+    assert "employee" in assignment_model.model_fields
+
+def test_vista_sin_empleado():
+    model = daily_request_view_model(frozenset({"shifts", "assignments"}), None)
+    shift_model = model.model_fields["shifts"].annotation.__args__[0]
+    assignment_model = shift_model.model_fields["assignments"].annotation.__args__[0]
+    assert "employee" not in assignment_model.model_fields
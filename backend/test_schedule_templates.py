@@ -0,0 +1,31 @@
+import pytest
+from datetime import date, datetime, time
+from pydantic import ValidationError
+from app.db.schedule_templates_crud import template_dates, shift_times
+from app.schemas.schedule_schemas import ScheduleTemplateCreate
+
+def test_mascara_de_lunes_a_viernes_salta_el_fin_de_semana():
+    # 2025-01-06 es lunes
+    days = template_dates(31, date(2025, 1, 6), date(2025, 1, 19))
+    assert len(days) == 10
+    assert all(day.weekday() < 5 for day in days)
+
+def test_mascara_de_un_solo_dia():
+    sundays = template_dates(1 << 6, date(2025, 1, 1), date(2025, 1, 31))
+    assert sundays == [date(2025, 1, 5), date(2025, 1, 12), date(2025, 1, 19), date(2025, 1, 26)]
+
+def test_turno_nocturno_termina_al_dia_siguiente():
+    start, end = shift_times(date(2025, 1, 6), time(22, 0), time(6, 0))
+    assert start == datetime(2025, 1, 6, 22, 0)
+    assert end == datetime(2025, 1, 7, 6, 0)
+
+def test_turno_diurno_queda_en_el_mismo_dia():
+    start, end = shift_times(date(2025, 1, 6), time(8, 0), time(17, 0))
+    assert (start.date(), end.date()) == (date(2025, 1, 6), date(2025, 1, 6))
+
+def test_plantilla_rechaza_rango_invertido():
+    with pytest.raises(ValidationError):
+        ScheduleTemplateCreate(
+            name="Semana", company_id=1, start_date=date(2025, 2, 1), end_date=date(2025, 1, 1),
+            shifts=[{"start_time": "08:00", "end_time": "17:00", "payment_amount": 100}],
+        )
@@ -0,0 +1,34 @@
+import json
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from app.core import serialization
+from app.core.serialization import TrustedJSONResponse, dump_orm
+from app.schemas.request_schemas import DailyRequestResponse
+
+def _request():
+    created_at = datetime(2025, 1, 2, 8, 30, 15, 120000, tzinfo=timezone.utc)
+    employee = SimpleNamespace(id=7, first_name="Ana", last_name="Souza", email="ana@exemplo.com", role="contratado", cpf="123")
+    assignment = SimpleNamespace(id=3, shift_id=2, employee_id=7, status="PRESENTE", employee=employee, created_at=created_at)
+    shift = SimpleNamespace(
+        id=2, request_id=1, start_time=datetime(2025, 1, 2, 8, 0), end_time=datetime(2025, 1, 2, 17, 0),
+        payment_amount=120.0, quantity=2, has_discount=True, discount_percentage=None,
+        assignments=[assignment], created_at=created_at
+    )
+    return SimpleNamespace(
+        id=1, company_id=4, status_id=1, status="ABERTA", request_date=date(2025, 1, 2),
+        created_at=created_at, shifts=[shift]
+    )
+
+def _trusted_json():
+    return json.loads(TrustedJSONResponse(dump_orm(_request(), DailyRequestResponse)).body)
+
+def test_mismo_json_que_pydantic():
+    expected = json.loads(DailyRequestResponse.model_validate(_request()).model_dump_json())
+    assert _trusted_json() == expected
+    # Solo los campos del modelo (cpf del empleado no sale)
+    assert "cpf" not in _trusted_json()["shifts"][0]["assignments"][0]["employee"]
+
+def test_mismo_json_sin_orjson(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    expected = json.loads(DailyRequestResponse.model_validate(_request()).model_dump_json())
+    assert _trusted_json() == expected
@@ -0,0 +1,45 @@
+from datetime import date
+from app.core.config import settings
+from app.db import slow_queries
+from app.db.slow_queries import normalize_sql, parameter_shapes, _to_pyformat, _is_select
+
+def test_normaliza_valores_y_listas():
+    a = normalize_sql("SELECT *\n  FROM users WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND name = 'Ana' LIMIT 50")
+    b = normalize_sql("SELECT * FROM users WHERE id IN ($1, $2, $3) AND name = 'João' LIMIT 10")
+    assert a == b == "SELECT * FROM users WHERE id IN (?...) AND name = ? LIMIT ?"
+    # Los sufijos numéricos de los alias no son literales
+    assert normalize_sql("SELECT anon_1.id FROM t AS anon_1") == "SELECT anon_1.id FROM t AS anon_1"
+
+def test_forma_de_parametros_sin_valores():
+    assert parameter_shapes({"tenant_id_1": 3, "d": date(2025, 1, 1), "ids": [1, 2]}) == {
+        "tenant_id_1": "int", "d": "date", "ids": "list[2]"
+    }
+    assert parameter_shapes([{"a": 1}, {"a": 2}], executemany=True) == {"rows": 2, "row": {"a": "int"}}
+
+def test_asyncpg_a_psycopg():
+    statement, params = _to_pyformat("SELECT $1 WHERE x LIKE '%a' OR y = $1 OR z = $2", (5, "b"))
+    assert statement == "SELECT %(p1)s WHERE x LIKE '%%a' OR y = %(p1)s OR z = %(p2)s"
+    assert params == {"p1": 5, "p2": "b"}
+
+def test_select_con_locks_no_se_explica_con_analyze():
+    assert _is_select("SELECT * FROM t WHERE id = ?")
+    assert _is_select("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not _is_select("SELECT work_shifts.id FROM work_shifts WHERE id = ? FOR UPDATE OF work_shifts")
+    assert not _is_select("SELECT * FROM t FOR NO KEY UPDATE SKIP LOCKED")
+    assert not _is_select("SELECT * FROM t FOR SHARE")
+    assert not _is_select("SELECT pg_advisory_xact_lock(?)")
+    assert not _is_select("SELECT nextval(?)")
+    assert not _is_select("WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x")
+
+def test_top_por_tiempo_total(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_FILE", str(tmp_path / "slow.log"))
+    monkeypatch.setattr(slow_queries, "_should_explain", lambda fp: False)
+    slow_queries.reset()
+    for _ in range(3):
+        slow_queries.on_slow_query(None, "primary", "SELECT * FROM a WHERE id = %(id)s", {"id": 1}, False, 100)
+    slow_queries.on_slow_query(None, "primary", "SELECT * FROM b", {}, False, 250)
+
+    top = slow_queries.get_top()
+    assert [entry["sql"] for entry in top] == ["SELECT * FROM a WHERE id = ?", "SELECT * FROM b"]
+    assert top[0]["count"] == 3 and top[0]["total_ms"] == 300 and top[0]["routes"] == {"-": 3}
+    slow_queries.reset()
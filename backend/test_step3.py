@@ -37,4 +37,30 @@ def test_hashing_consistencia():
     
     # Pero ambos deben funcionar para validar la contraseña original
     assert verify_password(password, hash1) is True
-    assert verify_password(password, hash2) is True
\ No newline at end of file
+    assert verify_password(password, hash2) is True
+
+def test_lote_de_hashing_respeta_su_cupo(monkeypatch):
+    """run_many nunca tiene más de HASHING_BATCH_SLOTS operaciones en curso (el resto queda para los logins)."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.core import hashing_pool
+
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    def slow_square(x):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.01)
+        with lock:
+            in_flight["now"] -= 1
+        return x * x
+
+    executor = ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(hashing_pool, "_get_executor", lambda: executor)
+    monkeypatch.setattr(hashing_pool, "_batch_slots", threading.BoundedSemaphore(2))
+
+    assert hashing_pool.run_many(slow_square, [(i,) for i in range(20)]) == [i * i for i in range(20)]
+    assert in_flight["max"] <= 2
+    executor.shutdown()
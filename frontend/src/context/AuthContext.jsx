@@ -31,10 +31,13 @@ export const AuthProvider = ({ children }) => {
     recoverSession();
   }, []);
 
-  const login = async (accessToken, tenant_uuid) => {
+  const login = async (accessToken, tenant_uuid, refreshToken) => {
     // 2. Guardamos en DISCO (localStorage) para que sobreviva al F5
     localStorage.setItem('token', accessToken);
     localStorage.setItem('tenant_uuid', tenant_uuid);
+    if (refreshToken) {
+      localStorage.setItem('refresh_token', refreshToken);
+    }
     setIsAuthenticated(true);
 
     console.error(accessToken, tenant_uuid);
@@ -51,7 +54,13 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
+    // Revocamos la sesión en el backend (no bloqueamos el logout si falla)
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      api.post('/auth/logout', { refresh_token: refreshToken }).catch(() => {});
+    }
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     setUser(null);
     setIsAuthenticated(false);
   };
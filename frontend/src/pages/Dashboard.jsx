@@ -9,8 +9,7 @@ import useFilterParams from '../hooks/useFilterParams';
 
 export default function Dashboard() {
   const [companies, setCompanies] = useState([]);
-  const [stats, setStats] = useState([]);
-  const [attendanceStats, setAttendanceStats] = useState([]);
+  const [overview, setOverview] = useState(null);
   const [loading, setLoading] = useState(false);
 
   // Default dates: First day of current month to Last day of current month
@@ -58,13 +57,9 @@ export default function Dashboard() {
         ...(tenant_uuid && { tenant_uuid })
       };
 
-      const [dashboardRes, attendanceRes] = await Promise.all([
-        api.get('/daily-requests/stats/dashboard', { params }),
-        api.get('/daily-requests/stats/attendance', { params })
-      ]);
-
-      setStats(dashboardRes.data);
-      setAttendanceStats(attendanceRes.data);
+      // Una sola llamada: solicitudes, asistencia y totales
+      const response = await api.get('/daily-requests/stats/overview', { params });
+      setOverview(response.data);
 
     } catch (error) {
       console.error('Error fetching dashboard stats:', error);
@@ -74,20 +69,16 @@ export default function Dashboard() {
     }
   };
 
-  const processedAttendanceData = useMemo(() => {
-    if (attendanceStats.length === 0) return [];
+  const stats = overview ? overview.companies : [];
+  const totals = overview ? overview.totals : null;
 
-    const grouped = attendanceStats.reduce((acc, curr) => {
-      const company = curr.company_name;
-      if (!acc[company]) {
-        acc[company] = { company_name: company };
-      }
-      acc[company][curr.status] = curr.count;
-      return acc;
-    }, {});
+  const processedAttendanceData = useMemo(() => {
+    if (!overview) return [];
 
-    return Object.values(grouped).sort((a, b) => a.company_name.localeCompare(b.company_name));
-  }, [attendanceStats]);
+    return overview.companies
+      .filter((company) => company.assignment_count > 0)
+      .map((company) => ({ company_name: company.company_name, ...company.status_counts }));
+  }, [overview]);
 
   const handleSearch = (e) => {
     e.preventDefault();
@@ -115,6 +106,24 @@ export default function Dashboard() {
         loading={loading}
       />
 
+      {/* Totais do período */}
+      {totals && (
+        <div className="grid grid-cols-1 sm:grid-cols-3 gap-6">
+          <div className="bg-white p-6 rounded-xl border border-gray-200 shadow-sm">
+            <p className="text-sm text-gray-500">Solicitações</p>
+            <p className="text-2xl font-bold text-gray-900">{totals.request_count}</p>
+          </div>
+          <div className="bg-white p-6 rounded-xl border border-gray-200 shadow-sm">
+            <p className="text-sm text-gray-500">Atendimentos</p>
+            <p className="text-2xl font-bold text-gray-900">{totals.assignment_count}</p>
+          </div>
+          <div className="bg-white p-6 rounded-xl border border-gray-200 shadow-sm">
+            <p className="text-sm text-gray-500">Total a pagar</p>
+            <p className="text-2xl font-bold text-gray-900">R$ {totals.payout_total.toFixed(2)}</p>
+          </div>
+        </div>
+      )}
+
       <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
         {/* Gráfico de Barras - Solicitações por Empresa */}
         <div className="bg-white p-6 rounded-xl border border-gray-200 shadow-sm min-h-[400px]">
@@ -16,21 +16,67 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// --- Renovación del token con el refresh token ---
+// Si varias peticiones reciben 401 a la vez, todas esperan la MISMA renovación
+// (el refresh token es de un solo uso: pedirlo dos veces revocaría la sesión).
+let refreshPromise = null;
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    refreshPromise = (refreshToken
+      ? axios.post(`${api.defaults.baseURL}/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('Sin refresh token'))
+    )
+      .then((response) => {
+        localStorage.setItem('token', response.data.access_token);
+        localStorage.setItem('refresh_token', response.data.refresh_token);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
+const endSession = () => {
+  console.warn("Sesión expirada o inválida. Cerrando sesión...");
+
+  // Limpieza de basura
+  localStorage.removeItem('token');
+  localStorage.removeItem('refresh_token');
+
+  // Redirigimos al login
+  if (window.location.pathname !== '/') {
+    window.location.href = '/';
+  }
+};
+
+// Endpoints de la sesión en sí: un 401 aquí no se reintenta (el resto de /auth/, como signup, sí)
+const SESSION_ENDPOINTS = ['/auth/login', '/auth/refresh', '/auth/logout'];
+
 // --- Interceptor de Respuesta (Maneja errores 401) ---
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    // Si el backend dice "401 Unauthorized" (Credenciales inválidas)
-    if (error.response && error.response.status === 401) {
-      console.warn("Sesión expirada o inválida. Cerrando sesión...");
-
-      // Limpieza de basura
-      localStorage.removeItem('token');
+  async (error) => {
+    const originalRequest = error.config;
+    const isAuthCall = originalRequest && originalRequest.url && SESSION_ENDPOINTS.includes(originalRequest.url.split('?')[0]);
 
-      // Redirigimos al login
-      if (window.location.pathname !== '/') {
-        window.location.href = '/';
+    // Si el backend dice "401 Unauthorized", intentamos renovar el token una sola vez
+    if (error.response && error.response.status === 401 && !isAuthCall) {
+      if (!originalRequest._retry) {
+        originalRequest._retry = true;
+        try {
+          const newToken = await refreshAccessToken();
+          originalRequest.headers.Authorization = `Bearer ${newToken}`;
+          return api(originalRequest);
+        } catch (refreshError) {
+          endSession();
+          return Promise.reject(error);
+        }
       }
+      endSession();
     }
     return Promise.reject(error);
   }